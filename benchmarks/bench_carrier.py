@@ -0,0 +1,130 @@
+"""
+File: /benchmarks/bench_carrier.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: DaVinci carrier cost (normalize, embed, PNG encode) and PNG size, full resolution vs. downscaled,
+             and repeated protections with and without the carrier cache
+
+Usage:
+    python benchmarks/bench_carrier.py --megapixels 24 --certificate-size 600 --repeat 3 --protections 20
+"""
+
+import argparse
+import base64
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from cv2 import imwrite, resize, INTER_LINEAR
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from redaqt.modules.certs.image_processor import process_image
+from redaqt.modules.certs.carrier_cache import CarrierCache
+from redaqt.modules.certs.encoder_image import (load_media, build_certificate, prepare_carrier,
+                                                embed_certificate, read_certificate, encoder_image)
+from redaqt.modules.lib.b64_encoder_decoder import encode_dict_to_base64
+
+
+def write_photo(file_path: str, megapixels: float) -> None:
+    """ A photo-like JPEG: smooth colour gradients with sensor-like noise """
+    height = int((megapixels * 1e6 * 3 / 4) ** 0.5)
+    width = int(height * 4 / 3)
+    rng = np.random.default_rng(0)
+    coarse = rng.integers(0, 256, (6, 8, 3), dtype=np.uint8)
+    image = resize(coarse, (width, height), interpolation=INTER_LINEAR).astype(np.int16)
+    image += rng.integers(-8, 9, image.shape, dtype=np.int16)
+    imwrite(file_path, np.clip(image, 0, 255).astype(np.uint8))
+
+
+def carrier(file_path: str, certificate: str, downscale: bool):
+    """ The encoder_image stages plus the PNG encode of PDOBuilder; returns (stage times in ms, PNG bytes) """
+    times = {}
+    start = time.perf_counter()
+    success, image = load_media(file_path)
+    times["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if downscale:
+        image = prepare_carrier(image, len(certificate))
+    times["resize"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    success, image = process_image(image)
+    times["normalize"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    image = embed_certificate(image, certificate)
+    times["embed"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format="PNG")
+    times["png"] = time.perf_counter() - start
+
+    if not read_certificate(image):
+        raise RuntimeError("certificate does not round-trip")
+    return {stage: seconds * 1e3 for stage, seconds in times.items()}, buffer.tell(), image.shape
+
+
+def protections(file_path: str, certificate: str, count: int, new_cache) -> list:
+    """ encoder_image times in ms of count protections with the same carrier, new_cache() gives each one's cache """
+    times = []
+    for _ in range(count):
+        cache = new_cache()
+        start = time.perf_counter()
+        success, image = encoder_image(certificate, Path(file_path), carrier_cache=cache)
+        times.append((time.perf_counter() - start) * 1e3)
+        if not success:
+            raise RuntimeError("encoder_image failed")
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage:")[0].strip())
+    parser.add_argument("--megapixels", type=float, default=24.0, help="carrier photo size (4:3)")
+    parser.add_argument("--certificate-size", type=int, default=600, help="certificate JSON size in bytes")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (median is reported)")
+    parser.add_argument("--protections", type=int, default=20, help="protections with the same carrier")
+    args = parser.parse_args()
+
+    certificate = build_certificate(encode_dict_to_base64({"trace": "t" * args.certificate_size}))
+
+    with tempfile.TemporaryDirectory() as scratch:
+        file_path = os.path.join(scratch, "photo.jpg")
+        write_photo(file_path, args.megapixels)
+
+        print(f"{args.megapixels:.0f} MP photo, {len(certificate)} byte certificate, median of {args.repeat}")
+        for name, downscale in (("full resolution", False), ("downscaled", True)):
+            runs = [carrier(file_path, certificate, downscale) for _ in range(args.repeat)]
+            stages = {stage: statistics.median(run[0][stage] for run in runs) for stage in runs[0][0]}
+            height, width = runs[0][2][:2]
+            print(f"{name:<16} {width:>5} x {height:<5} "
+                  + "  ".join(f"{stage} {ms:8.1f} ms" for stage, ms in stages.items())
+                  + f"  total {sum(stages.values()):8.1f} ms  PNG {runs[0][1] / 1024:9.1f} KB")
+
+        payload = encode_dict_to_base64({"trace": "t" * args.certificate_size})
+        cache_dir = Path(scratch) / "carrier_cache"
+        shared = CarrierCache(None)
+        print(f"\n{args.protections} protections, encoder_image (the first one fills the caches)")
+        for name, new_cache in (("uncached", lambda: CarrierCache(None)),
+                                ("memory cache", lambda: shared),
+                                (".npy per run", lambda: CarrierCache(cache_dir))):
+            times = protections(file_path, payload, args.protections, new_cache)
+            print(f"{name:<16} first {times[0]:8.1f} ms  then median {statistics.median(times[1:] or times):8.2f} ms"
+                  f"  total {sum(times):9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+File: /benchmarks/bench_cbc_parallel.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Legacy AES-256-CBC file decryption throughput, serial vs. block-aligned ranges on a thread pool
+
+Usage:
+    python benchmarks/bench_cbc_parallel.py --size 1073741824 --workers 1 2 4 8 --repeat 3
+"""
+
+import argparse
+import base64
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from redaqt.modules.lib.encrypt_aes256cbc import encrypt_file_aes256cbc
+from redaqt.modules.lib.decrypt_aes256cbc import decrypt_file_aes256cbc, decrypt_file_aes256cbc_parallel
+
+CBC_KEY = "k" * 32
+CBC_IV = "i" * 16
+
+
+def measure(func, repeat: int) -> float:
+    """ Best time of repeat runs in seconds """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if not func():
+            raise RuntimeError("CBC decryption failed")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage:")[0].strip())
+    parser.add_argument("--size", type=int, default=256 * 1024 * 1024, help="plaintext size in bytes")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="thread pool sizes")
+    parser.add_argument("--range-size", type=int, default=8 * 1024 * 1024, help="ciphertext bytes per range")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        output_dir = Path(scratch)
+        file_path = output_dir / "plaintext.bin"
+        with open(file_path, "wb") as fout:
+            for _ in range(0, args.size, 8 * 1024 * 1024):
+                fout.write(os.urandom(min(8 * 1024 * 1024, args.size - fout.tell())))
+
+        success, encrypted_path, error_msg = encrypt_file_aes256cbc(base64.b64encode(CBC_IV.encode()).decode(),
+                                                                    base64.b64encode(CBC_KEY.encode()).decode(),
+                                                                    str(file_path))
+        if not success:
+            raise RuntimeError(error_msg)
+        enc_path = output_dir / "plaintext.bin.enc"
+        os.replace(encrypted_path, enc_path)
+
+        megabytes = args.size / (1024 * 1024)
+        print(f"{megabytes:.0f} MB ciphertext, best of {args.repeat}, {os.cpu_count()} CPUs")
+
+        serial = measure(lambda: decrypt_file_aes256cbc(CBC_IV, CBC_KEY, str(enc_path), output_dir,
+                                                        parallel=False), args.repeat)
+        print(f"{'serial':>10}  {megabytes / serial:>8.1f} MB/s")
+
+        for workers in args.workers:
+            elapsed = measure(lambda: decrypt_file_aes256cbc_parallel(CBC_IV, CBC_KEY, str(enc_path), output_dir,
+                                                                      args.range_size, workers), args.repeat)
+            print(f"{workers:>2} workers  {megabytes / elapsed:>8.1f} MB/s  ({serial / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+File: /benchmarks/bench_certificate_image.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: DaVinci certificate embed / extract time by certificate size, Python bit loops vs. NumPy bit packing
+
+Usage:
+    python benchmarks/bench_certificate_image.py --sizes 4 16 64 256 --megapixels 12 --repeat 5
+    python benchmarks/bench_certificate_image.py --legacy-max 0 --repeat 50
+"""
+
+import argparse
+import base64
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from redaqt.modules.certs.character_set import charSetTxtToBin, charSetBinToTxt, docTags
+from redaqt.modules.certs.image_processor import process_image
+from redaqt.modules.certs.encoder_image import build_certificate, embed_certificate, extract_certificate
+
+
+def legacy_embed_certificate(image, certificate):
+    """ The embed_certificate used before: list of bits, row slices deleted from its head, int64 scratch """
+    pixel_height, pixel_width, _ = image.shape
+    binary_character_array = []
+    for character in certificate:
+        binary_character_array.extend(charSetTxtToBin[character])
+
+    array_blue_channel_data = np.zeros((pixel_height, pixel_width, 1), dtype=int)
+    ptr_row = 0
+    while True:
+        if len(binary_character_array) >= pixel_width:
+            temp_list = binary_character_array[0:pixel_width]
+            del binary_character_array[0:pixel_width]
+            array_blue_channel_data[ptr_row, :pixel_width, 0] += temp_list
+        else:
+            binary_character_array = binary_character_array + ([0] * (pixel_width - len(binary_character_array)))
+            array_blue_channel_data[ptr_row, :pixel_width, 0] += binary_character_array
+            break
+        ptr_row += 1
+
+    image[:, :, 2] = image[:, :, 2] - (array_blue_channel_data[:, :, 0] ^ image[:, :, 2] % 2)
+    return image
+
+
+def legacy_extract_certificate(image) -> str:
+    """ The extract_certificate used before: every pixel to a '0'/'1' string, 8 at a time through the charset """
+    pixel_height, pixel_width, _ = image.shape
+    binary_bits = [str(int(image[row, col, 2] % 2)) for row in range(pixel_height) for col in range(pixel_width)]
+
+    certificate = ""
+    ptr = 0
+    while ptr + 8 <= len(binary_bits):
+        certificate += charSetBinToTxt.get(''.join(binary_bits[ptr:ptr + 8]), '')
+        ptr += 8
+        if certificate.endswith(docTags['close_data']):
+            break
+    return certificate
+
+
+def make_certificate(size: int) -> str:
+    """ A tagged certificate object of about size characters """
+    return build_certificate(base64.b64encode(os.urandom(size * 3 // 4)).decode()[:size])
+
+
+def time_calls(func, image: np.ndarray, repeat: int, *args) -> list:
+    """ Per-call times in milliseconds, each call on a fresh copy of the image (copy not timed) """
+    times = []
+    for _ in range(repeat):
+        target = image.copy()
+        start = time.perf_counter()
+        func(target, *args)
+        times.append((time.perf_counter() - start) * 1e3)
+    return times
+
+
+def report(name: str, times: list) -> None:
+    ordered = sorted(times)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{name:<32} mean {statistics.mean(times):10.2f} ms   p50 {statistics.median(times):10.2f} ms   "
+          f"p99 {p99:10.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage:")[0].strip())
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64, 256], help="certificate sizes in KB")
+    parser.add_argument("--megapixels", type=float, default=12.0, help="carrier image size (4:3)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement")
+    parser.add_argument("--legacy-max", type=int, default=64,
+                        help="largest certificate (KB) timed with the old loops")
+    parser.add_argument("--legacy-extract-repeat", type=int, default=1,
+                        help="runs of the old per-pixel extraction (several seconds each)")
+    args = parser.parse_args()
+
+    height = int((args.megapixels * 1e6 * 3 / 4) ** 0.5)
+    width = int(height * 4 / 3)
+    rng = np.random.default_rng(0)
+    success, image = process_image(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+
+    print(f"{width} x {height} carrier ({width * height / 1e6:.1f} MP), {args.repeat} runs")
+    for size_kb in args.sizes:
+        certificate = make_certificate(size_kb * 1024)
+        if len(certificate) * 8 > width * height:
+            print(f"{size_kb} KB certificate does not fit the carrier")
+            continue
+        if size_kb <= args.legacy_max:
+            report(f"embed {size_kb:>4} KB, list of bits", time_calls(legacy_embed_certificate, image,
+                                                                      args.repeat, certificate))
+        report(f"embed {size_kb:>4} KB, unpackbits", time_calls(embed_certificate, image, args.repeat, certificate))
+
+        carrier = embed_certificate(image.copy(), certificate)
+        if extract_certificate(carrier) != certificate:
+            raise RuntimeError("extracted certificate does not match")
+        if size_kb <= args.legacy_max and args.legacy_extract_repeat:
+            report(f"extract {size_kb:>4} KB, per pixel", time_calls(legacy_extract_certificate, carrier,
+                                                                   args.legacy_extract_repeat))
+        report(f"extract {size_kb:>4} KB, packbits", time_calls(extract_certificate, carrier, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
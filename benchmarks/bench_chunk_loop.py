@@ -0,0 +1,109 @@
+"""
+File: /benchmarks/bench_chunk_loop.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: File encryption throughput by chunk size, read()/update() loop vs. readinto()/update_into()
+
+Usage:
+    python benchmarks/bench_chunk_loop.py --size 268435456 --repeat 3
+"""
+
+import argparse
+import base64
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cryptography.hazmat.primitives.padding import PKCS7
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from redaqt.modules.lib.encrypt_aes256gcm import encrypt_file_aes256gcm
+from redaqt.modules.lib.encrypt_aes256cbc import encrypt_file_aes256cbc
+
+CHUNK_SIZES = (64 * 1024, 1024 * 1024, 8 * 1024 * 1024)
+KEY_STR = "K" * 44
+KEY = os.urandom(32)
+
+
+def allocating_gcm(file_path: str, chunk_size: int) -> str:
+    """ The loop encrypt_file_aes256gcm used before: a new bytes object per read and per update """
+    encryptor = Cipher(algorithms.AES(KEY), modes.GCM(os.urandom(12))).encryptor()
+    with open(file_path, "rb") as fin, tempfile.NamedTemporaryFile(delete=False) as fout:
+        while chunk := fin.read(chunk_size):
+            fout.write(encryptor.update(chunk))
+        fout.write(encryptor.finalize())
+        fout.write(encryptor.tag)
+    return fout.name
+
+
+def allocating_cbc(file_path: str, chunk_size: int) -> str:
+    """ The loop encrypt_file_aes256cbc used before: padder and encryptor both allocate per chunk """
+    encryptor = Cipher(algorithms.AES(KEY), modes.CBC(os.urandom(16))).encryptor()
+    padder = PKCS7(algorithms.AES.block_size).padder()
+    with open(file_path, "rb") as fin, tempfile.NamedTemporaryFile(delete=False) as fout:
+        while chunk := fin.read(chunk_size):
+            fout.write(encryptor.update(padder.update(chunk)))
+        fout.write(encryptor.update(padder.finalize()) + encryptor.finalize())
+    return fout.name
+
+
+def buffered_gcm(file_path: str, chunk_size: int) -> str:
+    success, encrypted_path, error_msg = encrypt_file_aes256gcm(os.urandom(12), KEY_STR, file_path,
+                                                                chunk_size=chunk_size)
+    if not success:
+        raise RuntimeError(error_msg)
+    return encrypted_path
+
+
+def buffered_cbc(file_path: str, chunk_size: int) -> str:
+    success, encrypted_path, error_msg = encrypt_file_aes256cbc(base64.b64encode(os.urandom(16)).decode(),
+                                                                base64.b64encode(KEY).decode(),
+                                                                file_path, chunk_size)
+    if not success:
+        raise RuntimeError(error_msg)
+    return encrypted_path
+
+
+def measure(func, file_path: str, chunk_size: int, repeat: int) -> float:
+    """ Best throughput of repeat runs in MB/s """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encrypted_path = func(file_path, chunk_size)
+        best = min(best, time.perf_counter() - start)
+        os.remove(encrypted_path)
+    return os.path.getsize(file_path) / (1024 * 1024) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage:")[0].strip())
+    parser.add_argument("--size", type=int, default=256 * 1024 * 1024, help="plaintext size in bytes")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        file_path = os.path.join(scratch, "plaintext.bin")
+        with open(file_path, "wb") as fout:
+            for _ in range(0, args.size, 8 * 1024 * 1024):
+                fout.write(os.urandom(min(8 * 1024 * 1024, args.size - fout.tell())))
+
+        print(f"{args.size / (1024 * 1024):.0f} MB plaintext, best of {args.repeat}")
+        print(f"{'chunk':>8}  {'GCM read/update':>16}  {'GCM readinto':>13}  {'CBC read/update':>16}  {'CBC readinto':>13}")
+        for chunk_size in CHUNK_SIZES:
+            results = [measure(func, file_path, chunk_size, args.repeat)
+                       for func in (allocating_gcm, buffered_gcm, allocating_cbc, buffered_cbc)]
+            print(f"{chunk_size // 1024:>6} K  {results[0]:>11.1f} MB/s  {results[1]:>8.1f} MB/s  "
+                  f"{results[2]:>11.1f} MB/s  {results[3]:>8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+File: /benchmarks/bench_cipher_pipeline.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: File encryption / decryption throughput, single-threaded loop vs. reader/cipher/writer pipeline
+
+Usage:
+    python benchmarks/bench_cipher_pipeline.py --size 1073741824 --repeat 3
+"""
+
+import argparse
+import base64
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from redaqt.modules.lib.encrypt_aes256gcm import encrypt_file_aes256gcm
+from redaqt.modules.lib.decrypt_aes256gcm import decrypt_file_aes256gcm
+from redaqt.modules.lib.encrypt_aes256cbc import encrypt_file_aes256cbc
+from redaqt.modules.lib.decrypt_aes256cbc import decrypt_file_aes256cbc
+
+KEY_STR = "K" * 44
+CBC_KEY = "k" * 32
+CBC_IV = "i" * 16
+
+
+def gcm_roundtrip(file_path: str, scratch: str, pipelined: bool):
+    """ Returns (encrypt seconds, decrypt seconds) """
+    start = time.perf_counter()
+    success, encrypted_path, error_msg = encrypt_file_aes256gcm(os.urandom(12), KEY_STR, file_path,
+                                                                pipelined=pipelined)
+    encrypted = time.perf_counter()
+    if not success:
+        raise RuntimeError(error_msg)
+
+    output_path = os.path.join(scratch, "gcm.out")
+    success, _, error_msg = decrypt_file_aes256gcm(KEY_STR, encrypted_path, output_path, pipelined=pipelined)
+    decrypted = time.perf_counter()
+    if not success:
+        raise RuntimeError(error_msg)
+
+    os.remove(encrypted_path)
+    os.remove(output_path)
+    return encrypted - start, decrypted - encrypted
+
+
+def cbc_roundtrip(file_path: str, scratch: str, pipelined: bool):
+    """ Returns (encrypt seconds, decrypt seconds) """
+    start = time.perf_counter()
+    success, encrypted_path, error_msg = encrypt_file_aes256cbc(base64.b64encode(CBC_IV.encode()).decode(),
+                                                                base64.b64encode(CBC_KEY.encode()).decode(),
+                                                                file_path, pipelined=pipelined)
+    encrypted = time.perf_counter()
+    if not success:
+        raise RuntimeError(error_msg)
+
+    output_dir = Path(scratch) / "cbc"
+    output_dir.mkdir(exist_ok=True)
+    enc_path = output_dir / (Path(file_path).name + ".enc")
+    os.replace(encrypted_path, enc_path)
+    if not decrypt_file_aes256cbc(CBC_IV, CBC_KEY, str(enc_path), output_dir, pipelined=pipelined):
+        raise RuntimeError("CBC decryption failed")
+    decrypted = time.perf_counter()
+
+    os.remove(enc_path)
+    os.remove(output_dir / Path(file_path).name)
+    return encrypted - start, decrypted - encrypted
+
+
+def measure(func, file_path: str, scratch: str, pipelined: bool, repeat: int):
+    """ Best encrypt and decrypt throughput of repeat runs in MB/s """
+    best_encrypt = best_decrypt = float("inf")
+    for _ in range(repeat):
+        encrypt_time, decrypt_time = func(file_path, scratch, pipelined)
+        best_encrypt = min(best_encrypt, encrypt_time)
+        best_decrypt = min(best_decrypt, decrypt_time)
+    megabytes = os.path.getsize(file_path) / (1024 * 1024)
+    return megabytes / best_encrypt, megabytes / best_decrypt
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage:")[0].strip())
+    parser.add_argument("--size", type=int, default=256 * 1024 * 1024, help="plaintext size in bytes")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    parser.add_argument("--dir", default=None, help="scratch directory (put it on the disk to measure)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as scratch:
+        file_path = os.path.join(scratch, "plaintext.bin")
+        with open(file_path, "wb") as fout:
+            for _ in range(0, args.size, 8 * 1024 * 1024):
+                fout.write(os.urandom(min(8 * 1024 * 1024, args.size - fout.tell())))
+
+        print(f"{args.size / (1024 * 1024):.0f} MB plaintext, best of {args.repeat}, {os.cpu_count()} CPUs")
+        print(f"{'mode':>4}  {'loop encrypt':>12}  {'loop decrypt':>12}  {'pipe encrypt':>12}  {'pipe decrypt':>12}")
+        for name, func in (("GCM", gcm_roundtrip), ("CBC", cbc_roundtrip)):
+            loop = measure(func, file_path, scratch, False, args.repeat)
+            pipeline = measure(func, file_path, scratch, True, args.repeat)
+            print(f"{name:>4}  {loop[0]:>7.1f} MB/s  {loop[1]:>7.1f} MB/s  "
+                  f"{pipeline[0]:>7.1f} MB/s  {pipeline[1]:>7.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
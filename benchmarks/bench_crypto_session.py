@@ -0,0 +1,119 @@
+"""
+File: /benchmarks/bench_crypto_session.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Per-document crypto overhead, one key derivation per call vs. one CryptoSession per document
+
+Usage:
+    python benchmarks/bench_crypto_session.py --documents 2000 --file-size 4096
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from redaqt.modules.lib.crypto_session import CryptoSession, derive_aes256_key_from_string
+from redaqt.modules.lib.encrypt_aes256gcm import encrypt_object_aes256gcm
+from redaqt.modules.lib.aes256gcm_segmented import encrypt_file_aes256gcm_segmented
+
+KEY_STR = "K" * 44
+IV_BYTES = os.urandom(12)
+AUDIT_DATA = {"id": "0" * 36, "user_alias": "benchmark", "datetime": "2026-10-17 10:00"}
+SMART_POLICY = {"id": "x" * 256, "certificate_fingerprint": "c" * 128, "pdo_fingerprint": "p" * 128,
+                "audit_fingerprint": "a" * 128}
+
+
+def protect_per_call(file_path: str) -> None:
+    """ The make_pdo sequence with a key string, every call derives the key and builds its context """
+    encrypt_object_aes256gcm(IV_BYTES, KEY_STR, AUDIT_DATA)
+    success, encrypted_path, _ = encrypt_file_aes256gcm_segmented(KEY_STR, file_path, max_workers=1)
+    encrypt_object_aes256gcm(IV_BYTES, KEY_STR, SMART_POLICY)
+    os.remove(encrypted_path)
+
+
+def protect_session(file_path: str) -> None:
+    """ The make_pdo sequence sharing one CryptoSession """
+    with CryptoSession(KEY_STR) as session:
+        encrypt_object_aes256gcm(IV_BYTES, session, AUDIT_DATA)
+        success, encrypted_path, _ = encrypt_file_aes256gcm_segmented(session, file_path, max_workers=1)
+        encrypt_object_aes256gcm(IV_BYTES, session, SMART_POLICY)
+    os.remove(encrypted_path)
+
+
+def objects_per_call() -> None:
+    """ Crypto work only: the two smart policy / audit objects, key derived per call """
+    encrypt_object_aes256gcm(IV_BYTES, KEY_STR, AUDIT_DATA)
+    encrypt_object_aes256gcm(IV_BYTES, KEY_STR, SMART_POLICY)
+
+
+def objects_session() -> None:
+    """ Crypto work only: the two objects sharing one session """
+    with CryptoSession(KEY_STR) as session:
+        encrypt_object_aes256gcm(IV_BYTES, session, AUDIT_DATA)
+        encrypt_object_aes256gcm(IV_BYTES, session, SMART_POLICY)
+
+
+def zero_per_byte() -> None:
+    """ The zeroing loop the lib functions used before CryptoSession (one bytearray per byte) """
+    key_bytes = bytearray(derive_aes256_key_from_string(KEY_STR))
+    for i in range(len(key_bytes)):
+        key_bytes = bytearray(key_bytes)
+        key_bytes[i] = 0
+
+
+def zero_slice() -> None:
+    """ CryptoSession.close(): one slice assignment """
+    key_bytes = bytearray(derive_aes256_key_from_string(KEY_STR))
+    key_bytes[:] = bytes(len(key_bytes))
+
+
+def time_calls(func, count: int, *args) -> list:
+    """ Per-call times in microseconds """
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        func(*args)
+        times.append((time.perf_counter() - start) * 1e6)
+    return times
+
+
+def report(name: str, times: list) -> None:
+    ordered = sorted(times)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{name:<32} mean {statistics.mean(times):9.1f} us   p50 {statistics.median(times):9.1f} us   "
+          f"p99 {p99:9.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage:")[0].strip())
+    parser.add_argument("--documents", type=int, default=2000, help="documents (iterations) per measurement")
+    parser.add_argument("--file-size", type=int, default=4096, help="size of the protected file in bytes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        file_path = os.path.join(scratch, "document.bin")
+        with open(file_path, "wb") as fout:
+            fout.write(os.urandom(args.file_size))
+
+        print(f"{args.documents} documents, {args.file_size} byte file")
+        report("zeroing, per byte (before)", time_calls(zero_per_byte, args.documents))
+        report("zeroing, slice (CryptoSession)", time_calls(zero_slice, args.documents))
+        report("objects, key per call", time_calls(objects_per_call, args.documents))
+        report("objects, CryptoSession", time_calls(objects_session, args.documents))
+        report("document, key per call", time_calls(protect_per_call, args.documents, file_path))
+        report("document, CryptoSession", time_calls(protect_session, args.documents, file_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+File: /benchmarks/bench_pdo_metadata.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Per-file cost of reading PDO metadata, trailer-scanning reader vs. full pypdf reader
+
+Usage:
+    python benchmarks/bench_pdo_metadata.py --count 10000 --payload-size 1048576
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from redaqt.modules.pdo.pdo_builder import PDOBuilder
+from redaqt.modules.pdo.access_pdo import get_pdo_metadata
+from redaqt.modules.pdo.pdo_metadata import read_pdo_metadata
+
+SAMPLE_METADATA = {
+    "/Producer": "pypdf",
+    "/Author": "RedaQt Benchmark",
+    "/Copyright": "Arcane Cyber, LLC",
+    "/Product": "RedaQt",
+    "/Product_Version": "2.1.0",
+    "/Encryption_Algorithm": "aes",
+    "/Encryption_Key_Length": "256",
+    "/Encryption_Mode": "gcm",
+    "/Hash_Algorithm": "sha512",
+    "/Payload_Format": "2",
+    "/Compression": "none",
+    "/MID": "m" * 32,
+    "/FID": "f" * 32,
+    "/IV": "i" * 16,
+    "/Signature": "s" * 128,
+    "/Smart_Policy": "p" * 1500,
+    "/DaVinci_Certificate": "",
+}
+
+
+def build_corpus(directory: Path, count: int, payload_size: int) -> list:
+    """ Build one PDO and copy it count times into directory """
+    payload = directory / "payload.bin"
+    payload.write_bytes(os.urandom(payload_size))
+
+    template = directory / "template.epf"
+    builder = PDOBuilder("Protected by RedaQt 2.1.0")
+    builder.set_metadata(SAMPLE_METADATA)
+    builder.set_attachment(str(payload))
+    success, error_msg = builder.build(str(template))
+    if not success:
+        raise RuntimeError(error_msg)
+
+    paths = []
+    for i in range(count):
+        path = directory / f"document_{i:05d}.txt.epf"
+        shutil.copyfile(template, path)
+        paths.append(path)
+    return paths
+
+
+def time_reader(name: str, reader, paths: list) -> list:
+    """ Read the metadata of every file, returning the per-file times in microseconds """
+    times = []
+    for path in paths:
+        start = time.perf_counter()
+        success, error_msg, metadata = reader(str(path))
+        times.append((time.perf_counter() - start) * 1e6)
+        if not success:
+            raise RuntimeError(f"{name}: {path}: {error_msg}")
+    return times
+
+
+def report(name: str, times: list) -> None:
+    ordered = sorted(times)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{name:<24} total {sum(times) / 1e6:8.3f} s   "
+          f"mean {statistics.mean(times):8.1f} us   p50 {statistics.median(times):8.1f} us   p99 {p99:8.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage:")[0].strip())
+    parser.add_argument("--count", type=int, default=10000, help="number of PDOs in the corpus")
+    parser.add_argument("--payload-size", type=int, default=1024 * 1024, help="attachment size in bytes")
+    parser.add_argument("--directory", type=Path, default=None, help="existing directory of .epf files to read")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.directory is not None:
+            paths = sorted(args.directory.rglob("*.epf"))
+        else:
+            paths = build_corpus(Path(scratch), args.count, args.payload_size)
+
+        # Both readers must agree before their timings mean anything
+        for path in paths[:100]:
+            if read_pdo_metadata(str(path)) != get_pdo_metadata(str(path)):
+                raise RuntimeError(f"Metadata mismatch: {path}")
+
+        print(f"{len(paths)} PDOs")
+        report("read_pdo_metadata", time_reader("read_pdo_metadata", read_pdo_metadata, paths))
+        report("get_pdo_metadata (pypdf)", time_reader("get_pdo_metadata", get_pdo_metadata, paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+File: /benchmarks/bench_suite.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Crypto and hashing throughput suite, MB/s, p50/p99 latency and peak RSS per function and size
+
+Every (function, size) case runs in its own child process so its peak RSS is not inflated by the cases
+before it.  Results are written as JSON; with --compare, cases whose throughput dropped by more than
+--threshold percent against an earlier run are flagged and the exit status is 1.
+
+Usage:
+    python benchmarks/bench_suite.py --sizes 1K 64K 1M 64M 1G 4G --output bench_suite.json
+    python benchmarks/bench_suite.py --compare bench_suite.json --output bench_new.json
+    python benchmarks/bench_suite.py --cases gcm_encrypt hash_file_sha512 --sizes 256M --in-process
+"""
+
+import argparse
+import base64
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:             # not available on Windows, peak RSS is then reported as null
+    resource = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from redaqt.modules.lib.crypto_session import derive_aes256_key_from_string
+from redaqt.modules.lib.encrypt_aes256gcm import encrypt_file_aes256gcm, encrypt_object_aes256gcm
+from redaqt.modules.lib.decrypt_aes256gcm import decrypt_file_aes256gcm
+from redaqt.modules.lib.encrypt_aes256cbc import encrypt_file_aes256cbc
+from redaqt.modules.lib.decrypt_aes256cbc import decrypt_file_aes256cbc
+from redaqt.modules.lib.hash_sha_library import hash_file_sha512
+
+KEY_STR = "K" * 44
+CBC_KEY = "k" * 32
+CBC_IV = "i" * 16
+
+DEFAULT_SIZES = ["1K", "64K", "1M", "16M", "256M"]
+SIZE_UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+BYTES_PER_CASE = 512 * 1024 * 1024      # auto iterations process about this much data per case
+MIN_ITERATIONS = 5
+MAX_ITERATIONS = 1000
+KEY_ITERATIONS = 10000
+OBJECT_MAX_SIZE = 64 * 1024 * 1024      # encrypt_object holds the whole object (and its base64) in memory
+WRITE_CHUNK = 8 * 1024 * 1024
+
+
+class Case:
+    """ One benchmarked function: setup builds its inputs once, run is timed, cleanup follows each run """
+
+    def __init__(self, scratch: Path, size: int):
+        self.scratch = scratch
+        self.size = size
+
+    def setup(self) -> None:
+        pass
+
+    def run(self) -> None:
+        raise NotImplementedError
+
+    def cleanup(self) -> None:
+        pass
+
+    def write_plaintext(self) -> Path:
+        file_path = self.scratch / "plaintext.bin"
+        with open(file_path, "wb") as fout:
+            for offset in range(0, self.size, WRITE_CHUNK):
+                fout.write(os.urandom(min(WRITE_CHUNK, self.size - offset)))
+        return file_path
+
+
+class GcmEncrypt(Case):
+    def setup(self) -> None:
+        self.file_path = self.write_plaintext()
+        self.output = None
+
+    def run(self) -> None:
+        success, self.output, error_msg = encrypt_file_aes256gcm(os.urandom(12), KEY_STR, self.file_path)
+        if not success:
+            raise RuntimeError(error_msg)
+
+    def cleanup(self) -> None:
+        os.remove(self.output)
+
+
+class GcmDecrypt(Case):
+    def setup(self) -> None:
+        success, self.encrypted, error_msg = encrypt_file_aes256gcm(os.urandom(12), KEY_STR,
+                                                                    self.write_plaintext())
+        if not success:
+            raise RuntimeError(error_msg)
+        self.output = self.scratch / "gcm.out"
+
+    def run(self) -> None:
+        success, _, error_msg = decrypt_file_aes256gcm(KEY_STR, self.encrypted, self.output)
+        if not success:
+            raise RuntimeError(error_msg)
+
+    def cleanup(self) -> None:
+        os.remove(self.output)
+
+
+class CbcEncrypt(Case):
+    def setup(self) -> None:
+        self.file_path = self.write_plaintext()
+        self.output = None
+
+    def run(self) -> None:
+        success, self.output, error_msg = encrypt_file_aes256cbc(base64.b64encode(CBC_IV.encode()).decode(),
+                                                                 base64.b64encode(CBC_KEY.encode()).decode(),
+                                                                 self.file_path)
+        if not success:
+            raise RuntimeError(error_msg)
+
+    def cleanup(self) -> None:
+        os.remove(self.output)
+
+
+class CbcDecrypt(Case):
+    def setup(self) -> None:
+        success, encrypted, error_msg = encrypt_file_aes256cbc(base64.b64encode(CBC_IV.encode()).decode(),
+                                                               base64.b64encode(CBC_KEY.encode()).decode(),
+                                                               self.write_plaintext())
+        if not success:
+            raise RuntimeError(error_msg)
+        self.encrypted = self.scratch / "plaintext.bin.enc"
+        os.replace(encrypted, self.encrypted)
+        self.output_dir = self.scratch / "cbc"
+        self.output_dir.mkdir()
+
+    def run(self) -> None:
+        if not decrypt_file_aes256cbc(CBC_IV, CBC_KEY, str(self.encrypted), self.output_dir):
+            raise RuntimeError("CBC decryption failed")
+
+    def cleanup(self) -> None:
+        os.remove(self.output_dir / "plaintext.bin")
+
+
+class EncryptObject(Case):
+    def setup(self) -> None:
+        self.data = "x" * self.size
+
+    def run(self) -> None:
+        success, _, error_msg = encrypt_object_aes256gcm(os.urandom(12), KEY_STR, self.data)
+        if not success:
+            raise RuntimeError(error_msg)
+
+
+class HashFile(Case):
+    def setup(self) -> None:
+        self.file_path = self.write_plaintext()
+
+    def run(self) -> None:
+        if hash_file_sha512(self.file_path) is None:
+            raise RuntimeError("Hashing failed")
+
+
+class DeriveKey(Case):
+    def run(self) -> None:
+        derive_aes256_key_from_string(KEY_STR)
+
+
+CASES = {
+    "gcm_encrypt": GcmEncrypt,
+    "gcm_decrypt": GcmDecrypt,
+    "cbc_encrypt": CbcEncrypt,
+    "cbc_decrypt": CbcDecrypt,
+    "encrypt_object": EncryptObject,
+    "hash_file_sha512": HashFile,
+    "derive_key": DeriveKey,
+}
+
+
+def parse_size(text: str) -> int:
+    """ '64K', '16M', '4G' or a plain byte count """
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in SIZE_UNITS:
+        return int(float(text[:-1]) * SIZE_UNITS[text[-1]])
+    return int(text)
+
+
+def format_size(size: int) -> str:
+    for unit, factor in sorted(SIZE_UNITS.items(), key=lambda item: -item[1]):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return str(size)
+
+
+def peak_rss_mb():
+    """ High-water resident set size of this process in MB (ru_maxrss is KB on Linux, bytes on macOS) """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_case(name: str, size: int, iterations: int) -> dict:
+    """ Time one case in this process and return its result record """
+    with tempfile.TemporaryDirectory() as scratch:
+        case = CASES[name](Path(scratch), size)
+        case.setup()
+        baseline_rss = peak_rss_mb()
+
+        times = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            case.run()
+            times.append(time.perf_counter() - start)
+            case.cleanup()
+
+    ordered = sorted(times)
+    p50 = percentile(ordered, 0.50)
+    return {
+        "case": name,
+        "size": size,
+        "iterations": iterations,
+        "mb_per_s": size / (1024 * 1024) / p50 if p50 > 0 else None,
+        "mean_ms": sum(times) / len(times) * 1e3,
+        "p50_ms": p50 * 1e3,
+        "p99_ms": percentile(ordered, 0.99) * 1e3,
+        "setup_rss_mb": baseline_rss,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_isolated(name: str, size: int, iterations: int) -> dict:
+    """ Run one case in a child process so that peak RSS belongs to this case alone """
+    command = [sys.executable, __file__, "--child", name, str(size), str(iterations)]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{name} {format_size(size)} failed:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def plan(case_names: list, sizes: list, iterations: int, object_max: int) -> list:
+    """ (case, size, iterations) for every case and size that applies """
+    runs = []
+    for name in case_names:
+        if name == "derive_key":
+            runs.append((name, len(KEY_STR), iterations or KEY_ITERATIONS))
+            continue
+        for size in sizes:
+            if name == "encrypt_object" and size > object_max:
+                continue
+            count = iterations or max(MIN_ITERATIONS, min(MAX_ITERATIONS, BYTES_PER_CASE // max(size, 1)))
+            runs.append((name, size, count))
+    return runs
+
+
+def compare(results: list, baseline_path: str, threshold: float) -> list:
+    """ Cases whose MB/s fell by more than threshold percent against the baseline run """
+    with open(baseline_path, "r", encoding="utf-8") as fin:
+        baseline = {(item["case"], item["size"]): item for item in json.load(fin)["results"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get((result["case"], result["size"]))
+        if not previous or not previous.get("mb_per_s") or not result.get("mb_per_s"):
+            continue
+        change = (result["mb_per_s"] - previous["mb_per_s"]) / previous["mb_per_s"] * 100
+        result["change_pct"] = change
+        if change < -threshold:
+            regressions.append(result)
+    return regressions
+
+
+def print_result(result: dict) -> None:
+    rss = result["peak_rss_mb"]
+    change = result.get("change_pct")
+    print(f"{result['case']:<18} {format_size(result['size']):>6} {result['iterations']:>6}x  "
+          f"{result['mb_per_s'] or 0:>10.1f} MB/s  p50 {result['p50_ms']:>10.3f} ms  "
+          f"p99 {result['p99_ms']:>10.3f} ms  rss {rss if rss is not None else float('nan'):>8.1f} MB"
+          + (f"  {change:+6.1f}%" if change is not None else ""))
+
+
+def main() -> None:
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        print(json.dumps(run_case(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.split("Usage:")[0].strip())
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES), help="cases to run")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="input sizes, e.g. 1K 64K 1M 1G 4G")
+    parser.add_argument("--iterations", type=int, default=0,
+                        help="runs per case (default: enough to process about 512 MB, at least 5)")
+    parser.add_argument("--object-max", default="64M", help="largest size used for encrypt_object")
+    parser.add_argument("--output", default="bench_suite.json", help="JSON results file")
+    parser.add_argument("--compare", default=None, help="earlier JSON results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    parser.add_argument("--in-process", action="store_true",
+                        help="run every case in this process (faster; peak RSS is then cumulative)")
+    args = parser.parse_args()
+
+    sizes = sorted(parse_size(size) for size in args.sizes)
+    runs = plan(args.cases, sizes, args.iterations, parse_size(args.object_max))
+
+    print(f"{len(runs)} cases, {os.cpu_count()} CPUs, Python {platform.python_version()}")
+    results = []
+    for name, size, iterations in runs:
+        result = run_case(name, size, iterations) if args.in_process else run_isolated(name, size, iterations)
+        results.append(result)
+
+    regressions = compare(results, args.compare, args.threshold) if args.compare else []
+    for result in results:
+        print_result(result)
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "isolated": not args.in_process,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as fout:
+        json.dump(report, fout, indent=2)
+    print(f"Results written to {args.output}")
+
+    if regressions:
+        print(f"{len(regressions)} regressions over {args.threshold:.0f}% against {args.compare}:")
+        for result in regressions:
+            print_result(result)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
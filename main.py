@@ -1,5 +1,6 @@
 import sys
 import json
+import multiprocessing
 import keyring
 from pathlib import Path
 from typing import Optional, Dict
@@ -250,4 +251,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Batch protection workers in frozen builds
     main()
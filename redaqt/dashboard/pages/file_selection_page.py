@@ -9,6 +9,7 @@ from PySide6.QtCore    import Qt
 from redaqt.dashboard.widgets.file_drop_zone     import FileDropZone
 from redaqt.dashboard.views.recent_cards_view    import RecentCardsView
 from redaqt.theme.context                        import ThemeContext
+from redaqt.modules.catalog.pdo_catalog          import PDOCatalog
 
 RECENTLY_OPENED_FILE = os.path.join("data", "recently_opened.json")
 
@@ -76,7 +77,18 @@ class FileSelectionPage(QWidget):
         self.refresh_recent_cards()
 
     def refresh_recent_cards(self):
-        """Reload recent files from JSON and update RecentCardsView."""
+        """Reload recent files from the catalog (or JSON) and update RecentCardsView."""
+        try:
+            with PDOCatalog() as catalog:
+                recent_data = catalog.recent()
+        except Exception as e:
+            print(f"[ERROR] Failed to read the protected document catalog: {e}")
+            recent_data = []
+
+        if recent_data:
+            self.cards_view.load_data(recent_data)
+            return
+
         try:
             if os.path.exists(RECENTLY_OPENED_FILE):
                 with open(RECENTLY_OPENED_FILE, "r") as f:
@@ -1,15 +1,37 @@
 # redaqt/dashboard/pages/folder_selection_page.py
 
 from pathlib import Path
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem, QFileDialog
+)
+from PySide6.QtCore import Qt, QThread, Signal
 
 from redaqt.theme.context import ThemeContext
+from redaqt.ui.button import RedaQtButton
+from redaqt.dashboard.views.recent_cards_view import RecentCardsView
+from redaqt.modules.catalog.pdo_catalog import PDOCatalog, ScanResult
+
+
+class CatalogScanThread(QThread):
+    """
+    Rescans the protected document catalog off the Qt main thread (with its own SQLite connection).
+    """
+    scanFinished = Signal(object)   # ScanResult
+
+    def run(self):
+        try:
+            with PDOCatalog() as catalog:
+                result = catalog.scan()
+        except Exception as e:
+            print(f"[ERROR] Failed to scan the protected document catalog: {e}")
+            result = ScanResult()
+        self.scanFinished.emit(result)
 
 
 class FolderSelectionPage(QWidget):
     """
-    Page for selecting folders: hosts any folder‐selection widgets.
+    Page for selecting folders: lists the folders of the protected document catalog and the
+    protected documents of the selected folder.
     """
     def __init__(self, theme_context: ThemeContext, assets_dir: Path, parent=None):
         super().__init__(parent)
@@ -18,16 +40,103 @@ class FolderSelectionPage(QWidget):
         self.theme  = theme_context.theme
         self.colors = theme_context.colors
         self.assets_dir = Path(assets_dir)
+        self.scan_thread = None
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(10)
 
-        # Placeholder label
-        self.placeholder = QLabel("Folder Selection Page", alignment=Qt.AlignCenter)
+        # Add folder / rescan buttons and scan status
+        btn_layout = QHBoxLayout()
+        self.add_btn = RedaQtButton("Add Folder")
+        self.add_btn.clicked.connect(self._on_add_folder)
+        btn_layout.addWidget(self.add_btn, alignment=Qt.AlignLeft)
+
+        self.rescan_btn = RedaQtButton("Rescan")
+        self.rescan_btn.clicked.connect(self.rescan)
+        btn_layout.addWidget(self.rescan_btn, alignment=Qt.AlignLeft)
+
+        self.placeholder = QLabel("", alignment=Qt.AlignLeft | Qt.AlignVCenter)
+        btn_layout.addWidget(self.placeholder, stretch=1)
+        layout.addLayout(btn_layout)
+
+        # Folders holding protected documents
+        self.folder_list = QListWidget(self)
+        self.folder_list.currentItemChanged.connect(self._on_folder_selected)
+        layout.addWidget(self.folder_list, stretch=1)
+
+        # Protected documents of the selected folder
+        self.cards_view = RecentCardsView(assets_dir=self.assets_dir, parent=self)
+        self.cards_view.load_data([])
+        layout.addWidget(self.cards_view)
+
+        self._apply_style()
+
+    def showEvent(self, event):
+        """Refresh the folder list from the catalog when this page becomes visible."""
+        super().showEvent(event)
+        self.refresh_folders()
+
+    def refresh_folders(self):
+        try:
+            with PDOCatalog() as catalog:
+                folders = catalog.folders()
+                count = catalog.count()
+        except Exception as e:
+            print(f"[ERROR] Failed to read the protected document catalog: {e}")
+            folders, count = [], 0
+
+        self.folder_list.clear()
+        for folder, documents in folders:
+            item = QListWidgetItem(f"{folder}  ({documents})")
+            item.setData(Qt.UserRole, folder)
+            self.folder_list.addItem(item)
+
+        if self.scan_thread is None:
+            self.placeholder.setText(f"{count} protected files in {len(folders)} folders")
+
+    def rescan(self):
+        if self.scan_thread is not None:
+            return
+
+        self.rescan_btn.setEnabled(False)
+        self.placeholder.setText("Scanning folders...")
+
+        self.scan_thread = CatalogScanThread(parent=self)
+        self.scan_thread.scanFinished.connect(self._on_scan_finished)
+        self.scan_thread.start()
+
+    def _on_scan_finished(self, result: ScanResult):
+        self.scan_thread.wait()
+        self.scan_thread.deleteLater()
+        self.scan_thread = None
+        self.rescan_btn.setEnabled(True)
+
+        self.refresh_folders()
+        self.placeholder.setText(f"Scanned {result.scanned} files: {result.added} added, "
+                                 f"{result.updated} updated, {result.removed} removed")
+
+    def _on_add_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Add Folder")
+        if not folder:
+            return
+
+        with PDOCatalog() as catalog:
+            catalog.add_root(folder)
+        self.rescan()
+
+    def _on_folder_selected(self, current: QListWidgetItem, previous: QListWidgetItem):
+        if current is None:
+            self.cards_view.load_data([])
+            return
+
+        with PDOCatalog() as catalog:
+            self.cards_view.load_data(catalog.documents_in_folder(current.data(Qt.UserRole)))
+
+    def _apply_style(self):
         fg = self.colors.get("foreground", "#000000")
         self.placeholder.setStyleSheet(f"color: {fg}; background: transparent;")
-        layout.addWidget(self.placeholder)
+        self.folder_list.setStyleSheet(f"color: {fg}; background: transparent; border: none;")
 
     def update_theme(self, ctx: ThemeContext):
         """Called when the app theme/colors change."""
@@ -35,6 +144,5 @@ class FolderSelectionPage(QWidget):
         self.theme = ctx.theme
         self.colors = ctx.colors
 
-        # Update placeholder styling
-        fg = self.colors.get("foreground", "#000000")
-        self.placeholder.setStyleSheet(f"color: {fg}; background: transparent;")
+        self._apply_style()
+        self.cards_view.update_theme(self.theme)
@@ -9,7 +9,7 @@ from tempfile import NamedTemporaryFile
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QApplication, QMessageBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread, Signal
 
 from redaqt.models.account import UserData
 from redaqt.dashboard.views.selected_files_view import SelectedFilesView
@@ -17,9 +17,12 @@ from redaqt.dashboard.views.smart_policy_view import SmartPolicyView
 from redaqt.dashboard.widgets.receipt_widget import ReceiptWidget
 from redaqt.ui.button import RedaQtButton
 from redaqt.theme.context import ThemeContext
-from redaqt.modules.api_request.call_for_encrypt import request_key
 from redaqt.modules.lib.random_string_generator import get_string_256
-from redaqt.modules.pdo import protected_document_maker
+from redaqt.modules.catalog.pdo_catalog import PDOCatalog
+from redaqt.modules.pdo.batch_protect import (BatchProtectionEngine,
+                                              BatchProgress,
+                                              ProtectionResult,
+                                              build_protection_jobs)
 from redaqt.models.smart_policy_block import (SmartPolicyBlock,
                                               PolicyItem,
                                               PolicyForm,
@@ -32,6 +35,28 @@ RECENTLY_OPENED_FILE = os.path.join("data", "recently_opened.json")
 MAX_RECENT_ITEMS = 21
 
 
+class BatchProtectionThread(QThread):
+    """
+    Runs a BatchProtectionEngine off the Qt main thread and streams each result back as a signal.
+    """
+    resultReady = Signal(object, int, int)   # ProtectionResult, completed, total
+
+    def __init__(self, jobs: list, parent=None):
+        super().__init__(parent)
+        self.jobs = jobs
+        self.engine = BatchProtectionEngine()
+        self.progress: Optional[BatchProgress] = None
+
+    def run(self):
+        self.progress = self.engine.run(
+            self.jobs,
+            on_result=lambda result, progress: self.resultReady.emit(result, progress.completed, progress.total)
+        )
+
+    def cancel(self):
+        self.engine.cancel()
+
+
 class ProtectionFlowPage(QWidget):
     def __init__(self, theme_context: ThemeContext, account_type: str, parent=None):
         super().__init__(parent)
@@ -42,6 +67,7 @@ class ProtectionFlowPage(QWidget):
         self.account_type = account_type
         self.current_paths: list[str] = []
         self.smart_policy_block: Optional[SmartPolicyBlock] = None
+        self.protection_thread: Optional[BatchProtectionThread] = None
 
         self.selected_user_alias: str | None = None  # Store alias returned from ContactsPopup
 
@@ -113,6 +139,13 @@ class ProtectionFlowPage(QWidget):
         self.placeholder.clear()
 
     def _on_cancel(self):
+        if self.protection_thread is not None:
+            # Stop the running batch; the page is reset once the thread finishes
+            self.protection_thread.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.placeholder.setText("Cancelling...")
+            return
+
         self.current_paths = []
         self.path_widget.hide()
         self.policy_widget.hide()
@@ -155,37 +188,47 @@ class ProtectionFlowPage(QWidget):
             "audit_fingerprint": None
         }
 
-        for full in self.current_paths:
-            dirpath, fname = os.path.split(full)
-            base, ext = os.path.splitext(fname)
-
-            recently_opened = {
-                "key": full,
-                "filename": base,
-                "filename_extension": ext.lstrip("."),
-                "file_path": dirpath + os.sep,
-                "date_protected": datetime.now().strftime("%Y-%m-%d %H:%M")
-            }
-
-            is_error, msg, incoming_encrypt = request_key(main_win.user_data)
-
-            if is_error:
-                #print(f"[DEBUG] Request key failed: {msg}")
-                self._show_error_message(msg)
-                return
-
-            is_success, error_message = protected_document_maker(
-                unencrypted_smart_policy_block,
-                incoming_encrypt,
-                recently_opened,
-                main_win.user_data
-            )
-
-            if is_success:
-                recently_opened["key"] = f"{full}.{main_win.user_data.product.extension}"
-                self._update_recently_opened_json(recently_opened)
-            else:
-                self._show_error_message(error_message)
+        settings_model = QApplication.instance().settings_model
+        jobs = build_protection_jobs(self.current_paths,
+                                     unencrypted_smart_policy_block,
+                                     main_win.user_data,
+                                     settings_model.certificate.location,
+                                     settings_model.certificate.add_certificate,
+                                     datetime.now().strftime("%Y-%m-%d %H:%M"),
+                                     settings_model.certificate.format)
+
+        # Protect the files on the batch engine; results stream back as they complete
+        self.protect_btn.setEnabled(False)
+        self.placeholder.setText(f"Protecting 0 of {len(jobs)} files")
+
+        self.protection_thread = BatchProtectionThread(jobs, parent=self)
+        self.protection_thread.resultReady.connect(self._on_protection_result)
+        self.protection_thread.finished.connect(self._on_protection_finished)
+        self.protection_thread.start()
+
+    def _on_protection_result(self, result: ProtectionResult, completed: int, total: int):
+        if self.cancel_btn.isEnabled():
+            self.placeholder.setText(f"Protecting {completed} of {total} files")
+
+        if result.success:
+            recently_opened = dict(result.file_data)
+            recently_opened["key"] = result.pdo_path
+            self._update_recently_opened_json(recently_opened)
+            self._record_in_catalog(result.pdo_path, result.file_data["date_protected"])
+
+    def _on_protection_finished(self):
+        progress = self.protection_thread.progress
+        self.protection_thread.deleteLater()
+        self.protection_thread = None
+
+        self.protect_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(True)
+
+        if progress is not None and progress.failures:
+            self._show_error_message("\n".join(
+                f"{failure.file_data['filename']}.{failure.file_data['filename_extension']}: {failure.error_msg}"
+                for failure in progress.failures
+            ))
 
         # Return to FileSelectionPage after processing
         self._on_cancel()  # Reset internal UI state
@@ -214,6 +257,13 @@ class ProtectionFlowPage(QWidget):
         except Exception(BaseException):
             pass    # No harm if the recently open file cannot be updated
 
+    def _record_in_catalog(self, pdo_path: str, date_protected: str):
+        try:
+            with PDOCatalog() as catalog:
+                catalog.record_document(pdo_path, date_protected)
+        except Exception as e:
+            print(f"[ERROR] Failed to add {pdo_path} to the protected document catalog: {e}")
+
     def _show_error_message(self, message: str):
         box = QMessageBox(self)
         box.setIcon(QMessageBox.Critical)
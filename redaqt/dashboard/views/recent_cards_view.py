@@ -7,12 +7,14 @@ from PySide6.QtWidgets import QWidget, QGridLayout, QScrollArea, QApplication
 from PySide6.QtCore    import Qt
 
 from redaqt.dashboard.widgets.card_recent import CardRecent
+from redaqt.modules.catalog.pdo_catalog import PDOCatalog
 
 
 class RecentCardsView(QScrollArea):
     """
     A scrollable grid of CardRecent widgets.
-    Reads from data/recently_opened.json and lays out up to 21 items in 3 columns.
+    Reads from the protected document catalog (falling back to data/recently_opened.json)
+    and lays out up to 21 items in 3 columns.
     """
 
     def __init__(self, *, assets_dir: Path, parent=None):
@@ -42,6 +44,17 @@ class RecentCardsView(QScrollArea):
     def _populate_recents(self):
         self.clear()
 
+        try:
+            with PDOCatalog() as catalog:
+                entries = catalog.recent()
+        except Exception as e:
+            print(f"[ERROR] Failed to read the protected document catalog: {e}")
+            entries = []
+
+        if entries:
+            self.load_data(entries)
+            return
+
         json_path = Path("data") / "recently_opened.json"
         if not json_path.exists():
             return
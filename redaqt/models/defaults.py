@@ -34,6 +34,7 @@ class RequestReceipt(BaseModel):
 class CertificateSettings(BaseModel):
     add_certificate: bool
     location: str
+    format: Literal["tagged", "binary"] = "tagged"     # DaVinci certificate payload embedded in the image
 
 
 class DefaultSettings(BaseModel):
@@ -38,9 +38,12 @@ TIMEOUT_SECONDS = 5.0
 DEFAULT_API = "https://api.redaqt.co/encrypt"
 
 
-def request_key(user_data) -> Tuple[bool, str, Optional[IncomingEncrypt]]:
+def request_key(user_data, add_certificate: Optional[bool] = None) -> Tuple[bool, str, Optional[IncomingEncrypt]]:
     """
     Send a key‐request JWT to the RedaQt encrypt endpoint and return JSON.
+
+    add_certificate defaults to the application's certificate settings; pass it explicitly when
+    no QApplication is running (e.g. in a batch protection worker process).
     """
     secret_key = user_data.api_key
     request_id = str(uuid4())
@@ -54,7 +57,8 @@ def request_key(user_data) -> Tuple[bool, str, Optional[IncomingEncrypt]]:
     }
     token = create_jwt(secret_key, jwt_payload)
 
-    add_cert = QApplication.instance().settings_model.certificate.add_certificate
+    if add_certificate is None:
+        add_certificate = QApplication.instance().settings_model.certificate.add_certificate
 
     # Create the request payload
     request_json = {
@@ -65,7 +69,7 @@ def request_key(user_data) -> Tuple[bool, str, Optional[IncomingEncrypt]]:
             'ef_object_data': None,
             'smart_policy': None,
             'file_specs': None,
-            'certificate': {'request': add_cert}
+            'certificate': {'request': add_certificate}
         }
     }
 
@@ -0,0 +1,11 @@
+"""
+File: /main/modules/catalog/__init__.py
+Author: Jonathan Carr
+Date: October 2026
+Description: protected document catalog init
+"""
+
+__all__ = ["PDOCatalog",
+           "ScanResult"]
+
+from .pdo_catalog import PDOCatalog, ScanResult
@@ -0,0 +1,300 @@
+"""
+File: /redaqt/modules/catalog/pdo_catalog.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Local SQLite catalog of protected documents (.epf) with incremental rescans
+"""
+
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from redaqt.modules.pdo.pdo_metadata import read_pdo_metadata
+
+CATALOG_DB_ENV = "PDO_CATALOG_DB"
+CATALOG_DB = Path(os.getenv(CATALOG_DB_ENV) or Path("data") / "pdo_catalog.db")
+PROTECTED_FILE_EXTENSION = ".epf"
+DATE_PROTECTED_FORMAT = "%Y-%m-%d %H:%M"
+MAX_RECENT_ITEMS = 21
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS documents (
+    path               TEXT PRIMARY KEY,
+    root               TEXT NOT NULL DEFAULT '',
+    folder             TEXT NOT NULL,
+    filename           TEXT NOT NULL,
+    filename_extension TEXT NOT NULL,
+    st_dev             INTEGER NOT NULL,
+    st_ino             INTEGER NOT NULL,
+    size               INTEGER NOT NULL,
+    mtime_ns           INTEGER NOT NULL,
+    mid                TEXT,
+    fid                TEXT,
+    product_version    TEXT,
+    date_protected     TEXT NOT NULL,
+    scan_id            INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS documents_date_protected ON documents (date_protected DESC, mtime_ns DESC);
+CREATE INDEX IF NOT EXISTS documents_folder ON documents (folder);
+CREATE INDEX IF NOT EXISTS documents_root_scan ON documents (root, scan_id);
+"""
+
+UPSERT_DOCUMENT = """
+INSERT INTO documents (path, root, folder, filename, filename_extension, st_dev, st_ino, size, mtime_ns,
+                       mid, fid, product_version, date_protected, scan_id)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (path) DO UPDATE SET
+    root = excluded.root, folder = excluded.folder, filename = excluded.filename,
+    filename_extension = excluded.filename_extension, st_dev = excluded.st_dev, st_ino = excluded.st_ino,
+    size = excluded.size, mtime_ns = excluded.mtime_ns, mid = excluded.mid, fid = excluded.fid,
+    product_version = excluded.product_version, date_protected = excluded.date_protected,
+    scan_id = excluded.scan_id
+"""
+
+RECENT_COLUMNS = "path, folder, filename, filename_extension, date_protected"
+
+
+@dataclass
+class ScanResult:
+    """ Totals of one catalog scan """
+    scanned: int = 0        # .epf files found under the roots
+    added: int = 0          # new files (metadata read)
+    updated: int = 0        # changed files (metadata re-read)
+    unchanged: int = 0      # files whose (st_dev, st_ino, st_size, st_mtime_ns) did not change
+    removed: int = 0        # catalog entries whose file no longer exists
+    failed: int = 0         # files whose metadata could not be read
+
+
+class PDOCatalog:
+    """
+    SQLite index of the protected documents found under a set of root folders.
+
+    A scan walks the roots with os.scandir and reads the metadata (MID, FID, product version and
+    protection date) only of files that are new or whose (st_dev, st_ino, st_size, st_mtime_ns)
+    changed since the previous scan.  Entries for files that disappeared are removed, including those
+    recorded by record_document outside every root (root '').  A root nested in another one is scanned
+    as part of the outer root, its files are walked once.
+
+    The database is data/pdo_catalog.db under the working directory, or the file named by $PDO_CATALOG_DB.
+
+    A connection belongs to the thread that opened the catalog; background scans open their own.
+
+    Usage:
+        with PDOCatalog() as catalog:
+            catalog.add_root("/home/user/Documents")
+            result = catalog.scan()
+            recent = catalog.recent()
+    """
+
+    def __init__(self, db_path: Path = CATALOG_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "PDOCatalog":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # --- roots ---
+    def add_root(self, root: str) -> None:
+        """ Add a folder to be scanned """
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO roots (path) VALUES (?)", (_normalize(root),))
+
+    def remove_root(self, root: str) -> None:
+        """ Stop scanning a folder and drop its entries """
+        root = _normalize(root)
+        with self.conn:
+            self.conn.execute("DELETE FROM roots WHERE path = ?", (root,))
+            self.conn.execute("DELETE FROM documents WHERE root = ?", (root,))
+
+    def roots(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT path FROM roots ORDER BY path")]
+
+    # --- indexing ---
+    def scan(self, roots: Optional[List[str]] = None) -> ScanResult:
+        """ Bring the catalog up to date with the files under the roots
+
+            Args:
+                roots: list -- folders to scan (defaults to every configured root)
+
+            Returns:
+                result: ScanResult -- counts of added, updated, unchanged and removed files
+        """
+        result = ScanResult()
+        scan_id = time.time_ns()
+        configured = self.roots()
+        roots = [_normalize(root) for root in (roots if roots is not None else configured)]
+
+        with self.conn:
+            for root, nested in _group_nested_roots(roots, configured).items():
+                # Files under a nested root belong to the outermost root, so each file is walked (and read) once
+                owners = [root] + nested
+                placeholders = ", ".join("?" * len(owners))
+                known = {
+                    path: (st_dev, st_ino, size, mtime_ns)
+                    for path, st_dev, st_ino, size, mtime_ns in self.conn.execute(
+                        f"SELECT path, st_dev, st_ino, size, mtime_ns FROM documents WHERE root IN ({placeholders})",
+                        owners)
+                }
+                unchanged: List[Tuple[int, str, str]] = []
+
+                for path, stat in _walk_protected_files(root):
+                    result.scanned += 1
+                    signature = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+                    if known.get(path) == signature:
+                        result.unchanged += 1
+                        unchanged.append((scan_id, root, path))
+                        continue
+
+                    if self._index_file(path, stat, root, scan_id) is None:
+                        result.failed += 1
+                    elif path in known:
+                        result.updated += 1
+                    else:
+                        result.added += 1
+
+                self.conn.executemany("UPDATE documents SET scan_id = ?, root = ? WHERE path = ?", unchanged)
+                result.removed += self.conn.execute(
+                    f"DELETE FROM documents WHERE root IN ({placeholders}) AND scan_id != ?",
+                    owners + [scan_id]).rowcount
+
+            result.removed += self._prune_unrooted()
+
+        return result
+
+    def _prune_unrooted(self) -> int:
+        """ Remove entries outside every root ('') whose file no longer exists; no walk covers them """
+        missing = [(path,) for (path,) in self.conn.execute("SELECT path FROM documents WHERE root = ''")
+                   if not os.path.isfile(path)]
+        self.conn.executemany("DELETE FROM documents WHERE path = ?", missing)
+        return len(missing)
+
+    def record_document(self, pdo_path: str, date_protected: Optional[str] = None) -> bool:
+        """ Add (or refresh) a single PDO, e.g. right after it has been protected
+
+            Returns:
+                success: bool -- False if the file could not be read
+        """
+        path = _normalize(pdo_path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+
+        root = min((r for r in self.roots() if _is_under(path, r)), key=len, default="")
+        with self.conn:
+            return self._index_file(path, stat, root, time.time_ns(), date_protected) is not None
+
+    def _index_file(self, path: str, stat: os.stat_result, root: str, scan_id: int,
+                    date_protected: Optional[str] = None) -> Optional[str]:
+        """ Read the metadata of a PDO and upsert its entry; returns None if it is not a readable PDO """
+        success, error_msg, metadata = read_pdo_metadata(path)
+        if not success:
+            return None
+
+        folder, name = os.path.split(path)
+        filename, filename_extension = os.path.splitext(name[:-len(PROTECTED_FILE_EXTENSION)])
+        date_protected = (date_protected or metadata.get("date_protected")
+                          or datetime.fromtimestamp(stat.st_mtime).strftime(DATE_PROTECTED_FORMAT))
+
+        self.conn.execute(UPSERT_DOCUMENT, (path, root, folder, filename, filename_extension.lstrip("."),
+                                            stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns,
+                                            metadata.get("mid"), metadata.get("fid"),
+                                            metadata.get("product_version"), date_protected, scan_id))
+        return path
+
+    # --- queries ---
+    def recent(self, limit: int = MAX_RECENT_ITEMS) -> List[dict]:
+        """ Most recently protected documents, as recently_opened.json entries """
+        rows = self.conn.execute(
+            f"SELECT {RECENT_COLUMNS} FROM documents ORDER BY date_protected DESC, mtime_ns DESC LIMIT ?",
+            (limit,))
+        return [_as_entry(row) for row in rows]
+
+    def folders(self) -> List[Tuple[str, int]]:
+        """ Every folder holding protected documents with its document count """
+        return list(self.conn.execute(
+            "SELECT folder, COUNT(*) FROM documents GROUP BY folder ORDER BY folder"))
+
+    def documents_in_folder(self, folder: str) -> List[dict]:
+        """ Protected documents of one folder, newest first """
+        rows = self.conn.execute(
+            f"SELECT {RECENT_COLUMNS} FROM documents WHERE folder = ? ORDER BY date_protected DESC, filename",
+            (_normalize(folder),))
+        return [_as_entry(row) for row in rows]
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+
+def _walk_protected_files(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """ Yield (path, stat) of every .epf file under root; unreadable folders are skipped """
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file() and entry.name.lower().endswith(PROTECTED_FILE_EXTENSION):
+                            # DirEntry.stat() has no st_ino/st_dev on Windows, os.stat() does
+                            stat = entry.stat() if os.name != "nt" else os.stat(entry.path)
+                            yield entry.path, stat
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def _as_entry(row: tuple) -> dict:
+    path, folder, filename, filename_extension, date_protected = row
+    return {
+        "key": path,
+        "filename": filename,
+        "filename_extension": filename_extension,
+        "file_path": folder + os.sep,
+        "date_protected": date_protected,
+    }
+
+
+def _normalize(path: str) -> str:
+    return os.path.abspath(os.path.expanduser(path))
+
+
+def _group_nested_roots(roots: List[str], configured: List[str]) -> Dict[str, List[str]]:
+    """ {outermost root: [configured roots nested in it]} for the roots to scan """
+    groups: Dict[str, List[str]] = {}
+    for root in roots:
+        outermost = min((r for r in configured + [root] if _is_under(root, r)), key=len)
+        groups.setdefault(outermost, [])
+    for root in configured:
+        for outermost, nested in groups.items():
+            if root != outermost and _is_under(root, outermost):
+                nested.append(root)
+    return groups
+
+
+def _is_under(path: str, root: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
@@ -9,8 +9,14 @@ Description: certs init
 
 __all__ = ["image_processor",
            "encoder_image",
-           "extract_certificate"
+           "extract_certificate",
+           "read_certificate",
+           "CERTIFICATE_FORMAT_TAGGED",
+           "CERTIFICATE_FORMAT_BINARY",
+           "CarrierCache"
            ]
 
 from .image_processor import process_image
-from .encoder_image import encoder_image, extract_certificate
+from .carrier_cache import CarrierCache
+from .encoder_image import (encoder_image, extract_certificate, read_certificate, CERTIFICATE_FORMAT_TAGGED,
+                            CERTIFICATE_FORMAT_BINARY)
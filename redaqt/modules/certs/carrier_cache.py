@@ -0,0 +1,169 @@
+"""
+File: /redaqt/modules/certs/carrier_cache.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Cache of decoded, resized and normalized DaVinci carrier images (memory, optional .npy files)
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+CARRIER_CACHE_ENTRIES = 8
+CARRIER_FILE_EXTENSION = ".npy"
+
+SourceKey = Tuple[str, int, int]        # absolute path, st_size, st_mtime_ns of the carrier image file
+Size = Tuple[int, int]                  # (width, height)
+
+
+def carrier_source_key(image_path: Union[str, Path]) -> Optional[SourceKey]:
+    """ (absolute path, size, mtime) of the carrier image file, None if it cannot be read """
+    path = os.path.abspath(str(image_path))
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return path, stat.st_size, stat.st_mtime_ns
+
+
+class CarrierCache:
+    """
+    Normalized carrier arrays of unchanged image files.
+
+    Entries are keyed on the image file (path, size, mtime) and the carrier resolution, and are kept
+    read-only in a small in-memory LRU.  With a cache_dir (none by default) they are also saved as .npy
+    files that later runs (and other processes) memory-map instead of decoding and normalizing the image
+    again.  An entry for an older version of a file is removed when the new one is stored.  Callers copy
+    the array before writing certificate bits into it.
+
+    Usage:
+        cache = CarrierCache()
+        carrier = cache.get(source, (width, height))
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = CARRIER_CACHE_ENTRIES):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_entries = max_entries
+        self._carriers: "OrderedDict[Tuple[SourceKey, Size], np.ndarray]" = OrderedDict()
+        self._sources: Dict[SourceKey, Size] = {}
+        self._lock = threading.Lock()
+
+    def source_size(self, source: SourceKey) -> Optional[Size]:
+        """ (width, height) of the image file as decoded, None if it has not been cached """
+        with self._lock:
+            size = self._sources.get(source)
+        if size is not None or self.cache_dir is None:
+            return size
+
+        prefix = self._file_prefix(source)
+        try:
+            names = [name for name in os.listdir(self.cache_dir)
+                     if name.startswith(prefix) and name.endswith(CARRIER_FILE_EXTENSION)]
+        except OSError:
+            return None
+        for name in names:
+            size = _parse_size(name[len(prefix):].split("_")[0])
+            if size is not None:
+                with self._lock:
+                    self._sources[source] = size
+                return size
+        return None
+
+    def get(self, source: SourceKey, size: Size) -> Optional[np.ndarray]:
+        """ Read-only normalized carrier of the given resolution, None on a miss """
+        key = (source, size)
+        with self._lock:
+            carrier = self._carriers.get(key)
+            if carrier is not None:
+                self._carriers.move_to_end(key)
+                return carrier
+            source_size = self._sources.get(source)
+
+        if self.cache_dir is None or source_size is None:
+            return None
+        try:
+            carrier = np.load(self.cache_dir / self._file_name(source, source_size, size), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+        self._remember(key, carrier)
+        return carrier
+
+    def put(self, source: SourceKey, source_size: Size, size: Size, carrier: np.ndarray) -> None:
+        """ Store a normalized carrier (copied, the caller keeps ownership of its array) """
+        stored = carrier.copy()
+        stored.flags.writeable = False
+        with self._lock:
+            self._sources[source] = source_size
+        self._remember((source, size), stored)
+
+        if self.cache_dir is not None:
+            self._save(source, source_size, size, stored)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._carriers.clear()
+            self._sources.clear()
+
+    def _remember(self, key: Tuple[SourceKey, Size], carrier: np.ndarray) -> None:
+        with self._lock:
+            self._carriers[key] = carrier
+            self._carriers.move_to_end(key)
+            while len(self._carriers) > self.max_entries:
+                self._carriers.popitem(last=False)
+
+    def _save(self, source: SourceKey, source_size: Size, size: Size, carrier: np.ndarray) -> None:
+        """ Write the .npy atomically and drop the files of older versions of the image; best effort """
+        tmp_name = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as tmp_file:
+                tmp_name = tmp_file.name
+                np.save(tmp_file, carrier)
+            os.replace(tmp_name, self.cache_dir / self._file_name(source, source_size, size))
+            tmp_name = None
+
+            path_digest = _path_digest(source[0])
+            current = self._file_prefix(source)
+            for name in os.listdir(self.cache_dir):
+                if name.startswith(path_digest + "_") and not name.startswith(current):
+                    os.remove(self.cache_dir / name)
+        except OSError:
+            pass
+        finally:
+            if tmp_name is not None:
+                try:
+                    os.remove(tmp_name)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _file_prefix(source: SourceKey) -> str:
+        path, file_size, mtime_ns = source
+        return f"{_path_digest(path)}_{file_size}_{mtime_ns}_"
+
+    def _file_name(self, source: SourceKey, source_size: Size, size: Size) -> str:
+        return (f"{self._file_prefix(source)}{source_size[0]}x{source_size[1]}_{size[0]}x{size[1]}"
+                f"{CARRIER_FILE_EXTENSION}")
+
+
+def _path_digest(path: str) -> str:
+    return hashlib.sha256(path.encode("utf-8")).hexdigest()[:16]
+
+
+def _parse_size(text: str) -> Optional[Size]:
+    width, _, height = text.partition("x")
+    if not (width.isdigit() and height.isdigit()):
+        return None
+    return int(width), int(height)
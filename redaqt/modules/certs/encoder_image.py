@@ -10,27 +10,63 @@ Date: August 2025
 Description: Function encodes the certificate request into the image
 """
 
+import json
+import math
+import os
+import struct
+import zlib
 from typing import Optional, Tuple
 from pathlib import Path
 from cv2 import imread, IMREAD_UNCHANGED
 import numpy as np
-from cv2 import Mat, cvtColor, COLOR_BGR2RGB
+from cv2 import Mat, cvtColor, COLOR_BGR2RGB, resize, INTER_AREA
 from numpy import ndarray
 
 
 from redaqt.modules.certs.character_set import *
 from redaqt.modules.lib.hash_sha_library import *
+from redaqt.modules.lib.b64_encoder_decoder import decode_base64_into_dict
 from redaqt.modules.certs.image_processor import process_image
+from redaqt.modules.certs.carrier_cache import CarrierCache, carrier_source_key
 
 DEFAULT_IMAGE = 'assets\icon_cert_default.jpg'
+LENGTH_PREFIX_SIZE = 64     # bytes read to find <DATA><LENG>n</LENG>
 
-def encoder_image(certificate: str, image_path: Path) -> Tuple[bool, Optional[any]]:
+CERTIFICATE_FORMAT_TAGGED = "tagged"    # <DATA>..</DATA> text around base64 JSON, one ASCII character per byte
+CERTIFICATE_FORMAT_BINARY = "binary"    # magic, version, length, zlib-compressed canonical JSON, CRC32
+
+# Binary payload: header (magic, version, body length), body, CRC32 of header + body; big-endian
+BINARY_MAGIC = b"\xd5DVC"               # first byte outside the certificate alphabet, never starts a tagged one
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct(">4sBI")
+BINARY_CRC = struct.Struct(">I")
+
+# Carrier capacity: certificate bits per pixel (blue LSB), share of the pixels is_cert_size_too_big lets the
+# certificate use, extra room kept on top, and the smallest side kept for display (200 pt box, 2 px per pt)
+CARRIER_BITS_PER_PIXEL = 1
+CARRIER_USABLE_FRACTION = 0.8
+CARRIER_CAPACITY_MARGIN = 1.1
+CARRIER_MIN_SIDE = 400
+
+CARRIER_CACHE_DIR_ENV = "CARRIER_CACHE_DIR"    # folder for the shared cache's .npy files, unset to keep it in memory
+_shared_carrier_cache: Optional[CarrierCache] = None
+
+# Bytes that decode to a certificate character (charSetBinToTxt), the others are dropped on extraction
+_CERTIFICATE_ALPHABET = np.zeros(256, dtype=bool)
+_CERTIFICATE_ALPHABET[[ord(character) for character in charSetTxtToBin]] = True
+
+
+def encoder_image(certificate, image_path: Path,
+                  certificate_format: str = CERTIFICATE_FORMAT_TAGGED,
+                  carrier_cache: Optional[CarrierCache] = None) -> Tuple[bool, Optional[any]]:
     """
     Processes an image and embeds a certificate, returning the image array.
 
     Args:
-        certificate: str -- certificate data
+        certificate: str | dict -- certificate data (base64 string for the tagged format, dict for binary)
         image_path: Path -- media file location
+        certificate_format: str -- CERTIFICATE_FORMAT_TAGGED or CERTIFICATE_FORMAT_BINARY
+        carrier_cache: CarrierCache -- cache of normalized carriers (defaults to the shared one)
 
     Returns:
         Tuple[bool, Optional[np.ndarray]]
@@ -38,21 +74,18 @@ def encoder_image(certificate: str, image_path: Path) -> Tuple[bool, Optional[an
             image: array -- image array
     """
 
-    # ─── Load media ─────────────────────────────────────────────
-    success, image = load_media(image_path)
-    if not success or image is None:
-        #print(f"[DEBUG encoder_image.py] Could not load media file - not a valid image")
-        return False, None
+    # ─── Build certificate object ───────────────────────────────
+    if certificate_format == CERTIFICATE_FORMAT_BINARY:
+        certificate_object = build_certificate_binary(certificate)
+    else:
+        certificate_object = build_certificate(certificate)
 
-    # ─── Process image ──────────────────────────────────────────
-    success, image = process_image(image)
+    # ─── Load, downscale and normalize the carrier (cached) ─────
+    success, image = load_carrier(image_path, len(certificate_object), carrier_cache)
     if not success or image is None:
-        #print(f"[DEBUG encoder_image.py] Error processing image and normalizing blue channel")
+        #print(f"[DEBUG encoder_image.py] Could not load media file - not a valid image")
         return False, None
 
-    # ─── Build certificate object ───────────────────────────────
-    certificate_object = build_certificate(certificate)
-
     # ─── Check if image can hold cert ───────────────────────────
     success = is_cert_size_too_big(image, certificate_object)
     if not success:
@@ -65,6 +98,56 @@ def encoder_image(certificate: str, image_path: Path) -> Tuple[bool, Optional[an
     return True, image
 
 
+def load_carrier(image_path: Union[str, Path], payload_size: int,
+                 carrier_cache: Optional[CarrierCache] = None) -> Tuple[bool, Optional[ndarray]]:
+    """ Loaded, downscaled and normalized carrier image, ready for the certificate bits
+
+    The result of load_media, prepare_carrier and process_image only depends on the image file and the
+    carrier resolution, so it is taken from the carrier cache while the file keeps its path, size and
+    mtime.  The caller gets its own copy to embed into.
+
+    Args:
+        image_path: Path -- media file location
+        payload_size: int -- certificate object size in bytes (characters)
+        carrier_cache: CarrierCache -- cache to use, None for the shared one
+
+    Returns:
+        success: bool -- False if the image could not be loaded or processed
+        image: array -- writable normalized image array
+    """
+    cache = carrier_cache if carrier_cache is not None else shared_carrier_cache()
+    source = carrier_source_key(image_path)
+
+    if source is not None:
+        source_size = cache.source_size(source)
+        if source_size is not None:
+            carrier = cache.get(source, carrier_size(*source_size, payload_size))
+            if carrier is not None:
+                return True, np.array(carrier)
+
+    success, image = load_media(image_path)
+    if not success or image is None:
+        return False, None
+    source_size = (image.shape[1], image.shape[0])
+
+    image = prepare_carrier(image, payload_size)
+    success, image = process_image(image)
+    if not success or image is None:
+        return False, None
+
+    if source is not None:
+        cache.put(source, source_size, (image.shape[1], image.shape[0]), image)
+    return True, image
+
+
+def shared_carrier_cache() -> CarrierCache:
+    """ Process-wide carrier cache, in memory unless CARRIER_CACHE_DIR names a folder for the .npy files """
+    global _shared_carrier_cache
+    if _shared_carrier_cache is None:
+        _shared_carrier_cache = CarrierCache(os.getenv(CARRIER_CACHE_DIR_ENV) or None)
+    return _shared_carrier_cache
+
+
 def load_media(filename: Union[str, Path]) -> Tuple[bool, Optional[Union[Mat, ndarray]]]:
     """
     Load an image from the given filename. If the image cannot be loaded,
@@ -93,12 +176,56 @@ def load_media(filename: Union[str, Path]) -> Tuple[bool, Optional[Union[Mat, nd
     return True, image
 
 
+def carrier_size(width: int, height: int, payload_size: int,
+                 bits_per_pixel: int = CARRIER_BITS_PER_PIXEL,
+                 margin: float = CARRIER_CAPACITY_MARGIN,
+                 min_side: int = CARRIER_MIN_SIDE) -> Tuple[int, int]:
+    """ Smallest (width, height) with the same aspect ratio that holds the certificate, never larger than the image
+
+    Args:
+        width: int -- image width in pixels
+        height: int -- image height in pixels
+        payload_size: int -- certificate object size in bytes (characters)
+        bits_per_pixel: int -- certificate bits stored per pixel
+        margin: float -- capacity kept on top of what is_cert_size_too_big requires
+        min_side: int -- smallest side kept for display quality
+
+    Returns:
+        size: tuple -- (width, height) of the carrier
+    """
+    required_pixels = payload_size * lenBin / bits_per_pixel / CARRIER_USABLE_FRACTION * margin
+    scale = max(math.sqrt(required_pixels / (width * height)), min_side / min(width, height))
+    if scale >= 1:
+        return width, height
+    return min(width, math.ceil(width * scale)), min(height, math.ceil(height * scale))
+
+
+def prepare_carrier(image, payload_size: int, **kwargs):
+    """ Resize the carrier image once, before normalization, to the resolution the certificate needs
+
+    Normalizing, embedding and PNG-encoding a full resolution photo costs time and PDO size for
+    pixels that are only drawn into a 200 x 200 pt box.  See carrier_size for the keyword arguments.
+
+    Args:
+        image: array -- loaded image array
+        payload_size: int -- certificate object size in bytes (characters)
+
+    Returns:
+        image: array -- resized image array (the same array if no downscaling is needed)
+    """
+    pixel_height, pixel_width = image.shape[:2]
+    width, height = carrier_size(pixel_width, pixel_height, payload_size, **kwargs)
+    if (width, height) == (pixel_width, pixel_height):
+        return image
+    return resize(image, (width, height), interpolation=INTER_AREA)
+
+
 def is_cert_size_too_big(image, certificate) -> bool:
     """ define the pixel array size that will be containing the character information, validate it fits within image size
 
     Args:
         image: array -- shape of the image
-        certificate: str -- fully assembled certificate
+        certificate: str | bytes -- fully assembled certificate (tagged text or binary payload)
 
     Returns:
         success: bool -- True if cert is too big for image
@@ -143,81 +270,207 @@ def build_certificate(certificate) -> str:
     return certificate_object
 
 
-def embed_certificate(image, certificate):
-    """ Embed the certificate into the image array
+def build_certificate_binary(certificate: dict) -> bytes:
+    """ Build the binary certificate payload
+
+    The certificate is serialized as canonical JSON (sorted keys, no whitespace) and zlib-compressed,
+    framed by a header (magic, version, body length) and followed by the CRC32 of header and body.
 
     Args:
-        image: array -- dictionary
-        certificate: str -- ASCII text certificate
+        certificate: dict -- certificate data object
 
     Returns:
-        image: array -- modified image array
+        payload: bytes -- binary certificate payload
     """
+    canonical = json.dumps(certificate, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    body = zlib.compress(canonical.encode('utf-8'), 9)
+    framed = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(body)) + body
+    return framed + BINARY_CRC.pack(zlib.crc32(framed))
 
-    pixel_height, pixel_width, _ = image.shape
-    binary_character_array = []
 
-    # Put all binary values into a one-dimensional list
-    ptr_certificate: int = 0
+def parse_certificate_binary(payload: bytes) -> Optional[dict]:
+    """ Decode a binary certificate payload, None if it is malformed or fails its CRC
 
-    while ptr_certificate < len(certificate):
-        binary_character_array.extend(charSetTxtToBin[certificate[ptr_certificate]])
-        ptr_certificate += 1
+    Args:
+        payload: bytes -- header, body and CRC32 (trailing bytes are ignored)
 
-    # create a zero pixel array
-    array_blue_channel_data = np.zeros((pixel_height, pixel_width, 1), dtype=int)
+    Returns:
+        certificate: dict -- certificate data object
+    """
+    if len(payload) < BINARY_HEADER.size + BINARY_CRC.size:
+        return None
 
-    ptr_row: int = 0
+    magic, version, length = BINARY_HEADER.unpack_from(payload)
+    end = BINARY_HEADER.size + length
+    if magic != BINARY_MAGIC or version != BINARY_VERSION or len(payload) < end + BINARY_CRC.size:
+        return None
+    if BINARY_CRC.unpack_from(payload, end)[0] != zlib.crc32(payload[:end]):
+        return None
 
-    while True:
+    try:
+        certificate = json.loads(zlib.decompress(payload[BINARY_HEADER.size:end]).decode('utf-8'))
+    except (zlib.error, UnicodeDecodeError, ValueError):
+        return None
+    return certificate if isinstance(certificate, dict) else None
 
-        if len(binary_character_array) >= pixel_width:
-            temp_list = binary_character_array[0:pixel_width]
-            del binary_character_array[0:pixel_width]
-            array_blue_channel_data[ptr_row, :pixel_width, 0] += temp_list
 
-        else:
-            binary_character_array = binary_character_array + ([0] * (pixel_width - len(binary_character_array)))
-            array_blue_channel_data[ptr_row, :pixel_width, 0] += binary_character_array
-            break
+def embed_certificate(image, certificate):
+    """ Embed the certificate into the image array
+
+    The certificate bytes are unpacked into one bit per pixel (most significant bit first, the order of
+    charSetTxtToBin) and written into the least significant bit of the blue channel, row by row from the
+    top-left pixel.  Only the pixels holding certificate bits are touched; the image is modified in place.
+
+    Args:
+        image: array -- normalized image array (H x W x 3, uint8)
+        certificate: str | bytes -- ASCII text certificate or binary certificate payload
+
+    Returns:
+        image: array -- modified image array
+    """
 
-        ptr_row += 1
+    pixel_height, pixel_width, _ = image.shape
+    bits = certificate_to_bits(certificate)
+    if bits.size > pixel_height * pixel_width:
+        raise ValueError("Image is too small to embed certificate")
+
+    blue = image[:, :, 2]
+    full_rows, remainder = divmod(bits.size, pixel_width)
 
-    image[:, :, 2] = image[:, :, 2] - (array_blue_channel_data[:, :, 0] ^ image[:, :, 2] % 2)
+    # Blue = Blue - (bit ^ Blue%2): a normalized (even) blue value becomes odd for a 1 bit
+    rows = blue[:full_rows]
+    rows -= bits[:full_rows * pixel_width].reshape(full_rows, pixel_width) ^ (rows & 1)
+    if remainder:
+        tail = blue[full_rows, :remainder]
+        tail -= bits[full_rows * pixel_width:] ^ (tail & 1)
 
     return image
 
 
+def certificate_to_bits(certificate) -> ndarray:
+    """ One uint8 (0 or 1) per certificate bit, most significant bit of each character first
+
+    Args:
+        certificate: str | bytes -- ASCII text certificate or binary certificate payload
+
+    Returns:
+        bits: array -- flat uint8 array of 8 * len(certificate) bits
+    """
+    if isinstance(certificate, str):
+        certificate = certificate.encode('ascii')
+    return np.unpackbits(np.frombuffer(certificate, dtype=np.uint8))
+
+
 def extract_certificate(image) -> str:
     """
     Extract the embedded certificate string from the image array.
 
+    Only the leading pixels are read: enough for the <DATA><LENG>n</LENG> prefix written by
+    build_certificate, then exactly the certificate it announces.  Images without a readable length
+    prefix are decoded up to the first </DATA> as before.  A binary certificate payload is detected by
+    its magic and returned as its canonical JSON (use read_certificate to get the dict of either format).
+
     Args:
         image: array -- image with certificate data embedded in blue channel
 
     Returns:
-        certificate: str -- extracted ASCII certificate string
+        certificate: str -- extracted ASCII certificate string, or the JSON of a binary payload
     """
     pixel_height, pixel_width, _ = image.shape
+    capacity = pixel_height * pixel_width // lenBin
+
+    prefix = extract_certificate_bytes(image, min(LENGTH_PREFIX_SIZE, capacity))
+    if prefix.startswith(BINARY_MAGIC):
+        certificate = _read_binary_certificate(image, prefix, capacity)
+        return json.dumps(certificate, sort_keys=True, separators=(',', ':')) if certificate else ""
 
-    # Extract the binary bits from the blue channel LSB
-    binary_bits = [
-        str(int(image[row, col, 2] % 2))
-        for row in range(pixel_height)
-        for col in range(pixel_width)
-    ]
-
-    # Convert list of bits to characters using charSetBinToTxt
-    certificate = ""
-    ptr = 0
-    while ptr + 8 <= len(binary_bits):
-        bits_str = ''.join(binary_bits[ptr:ptr + 8])
-        char = charSetBinToTxt.get(bits_str, '')  # fallback to '' if unknown
-        certificate += char
-        ptr += 8
-
-        # Optional: early termination
+    total = certificate_length_from_prefix(prefix)
+    if total is not None and total <= capacity:
+        certificate = _to_certificate_text(extract_certificate_bytes(image, total))
         if certificate.endswith(docTags['close_data']):
-            break
+            return certificate
+
+    # No (or a damaged) length prefix: decode the whole plane up to the first </DATA>
+    certificate = _to_certificate_text(extract_certificate_bytes(image, capacity))
+    end = certificate.find(docTags['close_data'])
+    return certificate if end < 0 else certificate[:end + len(docTags['close_data'])]
+
+
+def read_certificate(image) -> dict:
+    """
+    Extract and decode the embedded certificate, whichever format it was embedded in.
+
+    A binary payload is decoded from its compressed JSON (after its CRC32 is checked); a tagged
+    certificate from the base64 between <CERT> and </CERT>.
+
+    Args:
+        image: array -- image with certificate data embedded in blue channel
+
+    Returns:
+        certificate: dict -- certificate data object, empty if none could be decoded
+    """
+    pixel_height, pixel_width, _ = image.shape
+    capacity = pixel_height * pixel_width // lenBin
+
+    prefix = extract_certificate_bytes(image, min(LENGTH_PREFIX_SIZE, capacity))
+    if prefix.startswith(BINARY_MAGIC):
+        return _read_binary_certificate(image, prefix, capacity) or {}
+
+    certificate = extract_certificate(image)
+    start = certificate.find(docTags['open_certificate'])
+    end = certificate.find(docTags['close_certificate'])
+    if start < 0 or end < start:
+        return {}
+    return decode_base64_into_dict(certificate[start + len(docTags['open_certificate']):end].strip())
+
+
+def _read_binary_certificate(image, prefix: bytes, capacity: int) -> Optional[dict]:
+    """ Decode the binary payload whose header starts prefix """
+    if len(prefix) < BINARY_HEADER.size:
+        return None
+    total = BINARY_HEADER.size + BINARY_HEADER.unpack_from(prefix)[2] + BINARY_CRC.size
+    if total > capacity:
+        return None
+    return parse_certificate_binary(extract_certificate_bytes(image, total))
+
+
+def extract_certificate_bytes(image, count: int) -> bytes:
+    """ The first count bytes stored in the blue channel LSB plane (np.packbits of the leading pixels)
+
+    Args:
+        image: array -- image with certificate data embedded in blue channel
+        count: int -- number of bytes to read
+
+    Returns:
+        data: bytes -- raw embedded bytes
+    """
+    pixel_width = image.shape[1]
+    bit_count = count * lenBin
+    rows = -(-bit_count // pixel_width)
+    bits = image[:rows, :, 2].reshape(-1)[:bit_count] & 1
+    return np.packbits(bits).tobytes()
+
+
+def certificate_length_from_prefix(prefix: bytes) -> Optional[int]:
+    """ Total characters of a certificate object from its <DATA><LENG>n</LENG> prefix, None if absent
+
+    build_certificate stores in <LENG> the length of the header and body, which sit between </LENG>
+    and the closing </DATA>.
+    """
+    opening = (docTags['open_data'] + docTags['open_length']).encode('ascii')
+    closing = docTags['close_length'].encode('ascii')
+    if not prefix.startswith(opening):
+        return None
+
+    end = prefix.find(closing, len(opening))
+    digits = prefix[len(opening):end]
+    if end < 0 or not digits.isdigit():
+        return None
+    return end + len(closing) + int(digits) + len(docTags['close_data'])
+
+
+def _to_certificate_text(data: bytes) -> str:
+    """ Decode embedded bytes through the certificate alphabet, dropping bytes outside of it """
+    values = np.frombuffer(data, dtype=np.uint8)
+    return values[_CERTIFICATE_ALPHABET[values]].tobytes().decode('ascii')
 
-    return certificate
\ No newline at end of file
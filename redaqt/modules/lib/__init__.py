@@ -21,14 +21,29 @@ __all__ = ["encode_dict_to_base64",
            "encrypt_object_aes256gcm",
            "encrypt_file_aes256gcm",
            "decrypt_object_aes256gcm",
-           "decrypt_file_aes256gcm"]
+           "decrypt_file_aes256gcm",
+           "decrypt_stream_aes256gcm",
+           "encrypt_file_aes256gcm_segmented",
+           "decrypt_file_aes256gcm_segmented",
+           "decrypt_stream_aes256gcm_segmented",
+           "decrypt_range_aes256gcm_segmented",
+           "SegmentedPayloadReader",
+           "select_compression",
+           "CryptoSession",
+           "FingerprintCache"]
 
 
+from .crypto_session import CryptoSession
 from .b64_encoder_decoder import encode_dict_to_base64, decode_base64_into_dict
 from .hash_sha_library import hash_sha256, hash_sha512, hash_file_sha512
+from .fingerprint_cache import FingerprintCache
 from .random_string_generator import get_string_256, get_string_512, generate_random_string
 from .generate_iv import generate_iv, decode_iv
 from .encrypt_aes256gcm import encrypt_object_aes256gcm, encrypt_file_aes256gcm
-from .decrypt_aes256gcm import decrypt_object_aes256gcm, decrypt_file_aes256gcm
+from .decrypt_aes256gcm import decrypt_object_aes256gcm, decrypt_file_aes256gcm, decrypt_stream_aes256gcm
+from .aes256gcm_segmented import (encrypt_file_aes256gcm_segmented, decrypt_file_aes256gcm_segmented,
+                                  decrypt_stream_aes256gcm_segmented,
+                                  decrypt_range_aes256gcm_segmented, SegmentedPayloadReader)
+from .compression import select_compression
 from .generate_jwt import create_jwt
 from .file_check import validate_file_exists, append_filename_for_no_overwrite
\ No newline at end of file
@@ -0,0 +1,600 @@
+"""
+File: /redaqt/modules/lib/aes256gcm_segmented.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Segmented AES256GCM payload format (version 2), encrypted and decrypted on a thread pool
+"""
+
+import io
+import os
+import math
+import secrets
+import struct
+import tempfile
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+from cryptography.exceptions import InvalidTag
+
+from redaqt.modules.lib.crypto_session import CryptoSession, use_session
+from redaqt.modules.lib.compression import COMPRESSION_NONE, compress_block, decompress_block
+
+"""
+Payload format versions, recorded in the PDO /Info dictionary as /Payload_Format
+
+    1 -- [12-byte IV][ciphertext][16-byte tag], one GCM stream (encrypt_file_aes256gcm)
+    2 -- [16-byte header][segment 0]...[segment n-1]
+
+Version 2 header:
+    magic (4 bytes, b"RQSG") | version (1 byte) | segment size (4 bytes, big-endian) | nonce prefix (7 bytes)
+
+Each segment holds up to `segment size` bytes of plaintext encrypted with its own nonce and followed by
+its own 16-byte tag (STREAM construction):
+    nonce = nonce prefix (7 bytes) | segment index (4 bytes, big-endian) | final flag (1 byte)
+
+The header is authenticated as associated data of every segment.  Only the last segment is encrypted
+with the final flag set, so dropping whole segments from the end is detected as an authentication failure.
+
+Header version 2 records are all `segment size` + 16 bytes (the last one may be shorter).  With compression
+(/Compression other than none) the header carries version 3: each segment of plaintext is compressed on
+its own before it is encrypted, so records vary in size and are followed by an index:
+    [record size of segment 0 .. n-1 (4 bytes each, big-endian)][plaintext size (8 bytes)][segment count (4 bytes)]
+
+The index locates any segment without reading the ones before it.  It is not encrypted: a modified index
+frames records wrongly (their tags fail) or announces sizes the segments do not decompress to.  A payload
+whose header version does not match its /Compression (2 with, 3 without) is invalid.
+"""
+
+PAYLOAD_FORMAT_LEGACY = "1"
+PAYLOAD_FORMAT_SEGMENTED = "2"
+
+SEGMENT_MAGIC = b"RQSG"
+SEGMENT_VERSION = 2
+SEGMENT_VERSION_COMPRESSED = 3
+SEGMENT_HEADER = struct.Struct(">4sBI7s")
+SEGMENT_HEADER_SIZE = SEGMENT_HEADER.size
+SEGMENT_SIZE = 1024 * 1024
+NONCE_PREFIX_SIZE = 7
+TAG_SIZE = 16
+MAX_SEGMENTS = 2 ** 32
+SEGMENT_INDEX_ENTRY = struct.Struct(">I")
+SEGMENT_INDEX_TRAILER = struct.Struct(">QI")
+
+TEMP_FILE_EXTENSION = '.tmp'
+TEMP_PRECEEDING_CHARACTER = '~'
+TEMP_FOLDER = Path(tempfile.gettempdir())
+
+ERROR_FILE_NOT_FOUND = "File does not exist"
+ERROR_OS_ACCESS_DENIED = "OS error writing file to system"
+ERROR_UNEXPECTED = "Unexpected error was encountered"
+ERROR_UNEXPECTED_ENCRYPTION = "Encryption module had an unexpected error"
+ERROR_INVALID_PAYLOAD = "Encrypted payload is not a valid segmented payload"
+ERROR_AUTHENTICATION = "Decryption failed: authentication tag mismatch"
+ERROR_INVALID_RANGE = "Requested range is outside of the plaintext"
+
+SEGMENT_CACHE_SIZE = 4
+
+
+@dataclass
+class SegmentLayout:
+    """ Where the encrypted records of a segmented payload are (offsets from the start of the payload) """
+    header: bytes
+    version: int
+    segment_size: int
+    segment_count: int
+    plaintext_size: int
+    records_end: int
+    record_offsets: Optional[List[int]] = None     # version 3: segment_count + 1 offsets from the index
+
+    @property
+    def compressed(self) -> bool:
+        """ Every segment is compressed on its own (version 3) """
+        return self.version == SEGMENT_VERSION_COMPRESSED
+
+    def matches(self, compression: str) -> bool:
+        """ The header version is the one written for this /Compression """
+        return self.compressed == (compression != COMPRESSION_NONE)
+
+    def record(self, index: int) -> Tuple[int, int]:
+        """ (offset, size) of the encrypted record of a segment, tag included """
+        if self.record_offsets is not None:
+            return self.record_offsets[index], self.record_offsets[index + 1] - self.record_offsets[index]
+
+        record_size = self.segment_size + TAG_SIZE
+        offset = SEGMENT_HEADER_SIZE + index * record_size
+        return offset, min(record_size, self.records_end - offset)
+
+    def plaintext_length(self, index: int) -> int:
+        """ Plaintext bytes held by a segment """
+        if index < self.segment_count - 1:
+            return self.segment_size
+        return self.plaintext_size - (self.segment_count - 1) * self.segment_size
+
+
+def encrypt_file_aes256gcm_segmented(
+        key_str: Union[str, CryptoSession],
+        file_to_encrypt: Optional[Any],
+        hasher: Optional[Any] = None,
+        segment_size: int = SEGMENT_SIZE,
+        max_workers: Optional[int] = None,
+        compression: str = COMPRESSION_NONE
+        ) -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    Encrypt a file into the segmented AES-256-GCM payload format, writing out to a temporary file.
+    Segments are encrypted in parallel on a thread pool and written in order.  With compression set,
+    every segment is compressed on its own (on the pool too) and the payload ends with the segment index,
+    so compressed payloads stay readable at random (header version 3).
+
+    Args:
+        key_str:         44-character input string (converted to 32-byte AES key), or a CryptoSession
+        file_to_encrypt: Path to the plaintext file
+        hasher:          Optional hashlib object fed every byte written to the temporary file
+        segment_size:    Plaintext bytes per segment
+        max_workers:     Thread pool size (defaults to the CPU count)
+        compression:     Compression algorithm applied before encryption (see compression.py)
+
+    Returns:
+        Tuple of (success, output file path or None, error message or None)
+    """
+    tmp_file = None
+
+    with use_session(key_str) as session:
+        try:
+            in_path = Path(file_to_encrypt)
+            if not in_path.is_file():
+                return False, None, ERROR_FILE_NOT_FOUND
+
+            if not 0 < segment_size < 2 ** 32:
+                return False, None, ERROR_UNEXPECTED_ENCRYPTION
+
+            compressed = compression != COMPRESSION_NONE
+            header = SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION_COMPRESSED if compressed else SEGMENT_VERSION,
+                                         segment_size, secrets.token_bytes(NONCE_PREFIX_SIZE))
+            aesgcm = session.aesgcm()
+
+            # Output file: TEMP_FOLDER/~filename.ext.<unique>.tmp, never shared by two files with the same name
+            try:
+                tmp_file = NamedTemporaryFile(dir=TEMP_FOLDER, prefix=TEMP_PRECEEDING_CHARACTER + in_path.name + ".",
+                                              suffix=TEMP_FILE_EXTENSION, delete=False)
+            except Exception:
+                return False, None, ERROR_OS_ACCESS_DENIED
+
+            def encrypt_segment(index: int, plaintext: bytes, is_last: bool) -> bytes:
+                if compressed:
+                    plaintext = compress_block(plaintext, compression)
+                return aesgcm.encrypt(segment_nonce(header, index, is_last), plaintext, header)
+
+            workers = max_workers or os.cpu_count() or 1
+            with in_path.open("rb") as fin, tmp_file as fout, ThreadPoolExecutor(workers) as pool:
+                write = fout.write
+                if hasher is not None:
+                    def write(data: bytes) -> None:
+                        fout.write(data)
+                        hasher.update(data)
+
+                write(header)
+                record_sizes = []
+                segments = _read_plaintext_segments(fin, segment_size)
+                for segment in _ordered_map(pool, encrypt_segment, segments, 2 * workers):
+                    write(segment)
+                    record_sizes.append(len(segment))
+
+                if compressed:
+                    write(_pack_segment_index(record_sizes, fin.tell()))
+
+            return True, tmp_file.name, None
+
+        except Exception:
+            if tmp_file is not None:
+                try:
+                    Path(tmp_file.name).unlink()
+                except Exception:
+                    pass
+            return False, None, ERROR_OS_ACCESS_DENIED
+
+
+def decrypt_file_aes256gcm_segmented(
+        key_str: Union[str, CryptoSession],
+        encrypted_file_path: str,
+        output_file_path: Path,
+        max_workers: Optional[int] = None,
+        compression: str = COMPRESSION_NONE
+        ) -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    Decrypt a segmented AES-256-GCM payload.  Segments are authenticated and decrypted in parallel on a
+    thread pool.  The plaintext is written to a temporary file next to output_file_path that is renamed
+    into place only once every segment has been authenticated (and decompressed, if compressed).
+
+    Args:
+        key_str:             44-character base64-like key string
+        encrypted_file_path: Path to the encrypted input file
+        output_file_path:    Destination path for the decrypted file
+        max_workers:         Thread pool size (defaults to the CPU count)
+        compression:         Compression algorithm the payload was encrypted with
+
+    Returns:
+        Tuple: (success: bool, decrypted_file_path: str | None, error_msg: str | None)
+    """
+    try:
+        enc_path = Path(encrypted_file_path)
+        if not enc_path.is_file():
+            return False, None, ERROR_FILE_NOT_FOUND
+
+        with enc_path.open("rb") as fin:
+            return decrypt_stream_aes256gcm_segmented(key_str, fin, 0, os.fstat(fin.fileno()).st_size,
+                                                      output_file_path, max_workers, compression)
+
+    except Exception:
+        return False, None, ERROR_UNEXPECTED
+
+
+def decrypt_stream_aes256gcm_segmented(
+        key_str: Union[str, CryptoSession],
+        fin,
+        payload_offset: int,
+        payload_size: int,
+        output_file_path: Path,
+        max_workers: Optional[int] = None,
+        compression: str = COMPRESSION_NONE
+        ) -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    Decrypt a segmented payload stored at payload_offset of an open binary file, for example the
+    embedded-file stream of a PDO, without copying it out first (see decrypt_file_aes256gcm_segmented).
+
+    Args:
+        key_str:          44-character base64-like key string, or a CryptoSession
+        fin:              Seekable binary file object holding the payload
+        payload_offset:   File offset of the payload header
+        payload_size:     Payload size in bytes (header included)
+        output_file_path: Destination path for the decrypted file
+        max_workers:      Thread pool size (defaults to the CPU count)
+        compression:      Compression algorithm the payload was encrypted with
+
+    Returns:
+        Tuple: (success: bool, decrypted_file_path: str | None, error_msg: str | None)
+    """
+    tmp_file = None
+
+    with use_session(key_str) as session:
+        try:
+            out_path = Path(output_file_path)
+            aesgcm = session.aesgcm()
+
+            fin.seek(payload_offset)
+            layout = read_segment_layout(fin, payload_size)
+            if layout is None or not layout.matches(compression):
+                return False, None, ERROR_INVALID_PAYLOAD
+
+            def decrypt_segment(index: int, ciphertext: bytes, is_last: bool) -> bytes:
+                plaintext = aesgcm.decrypt(segment_nonce(layout.header, index, is_last), ciphertext, layout.header)
+                if layout.compressed:
+                    plaintext = decompress_block(plaintext, compression, layout.plaintext_length(index))
+                return plaintext
+
+            workers = max_workers or os.cpu_count() or 1
+            tmp_file = NamedTemporaryFile(dir=out_path.parent, prefix=out_path.name,
+                                          suffix=TEMP_FILE_EXTENSION, delete=False)
+            with tmp_file as fout, ThreadPoolExecutor(workers) as pool:
+                fin.seek(payload_offset + SEGMENT_HEADER_SIZE)
+                segments = _read_ciphertext_segments(fin, layout)
+                for plaintext in _ordered_map(pool, decrypt_segment, segments, 2 * workers):
+                    fout.write(plaintext)
+
+            os.replace(tmp_file.name, out_path)
+            return True, str(out_path), None
+
+        except InvalidTag:
+            _discard(tmp_file)
+            return False, None, ERROR_AUTHENTICATION
+
+        except ValueError:
+            _discard(tmp_file)
+            return False, None, ERROR_INVALID_PAYLOAD
+
+        except Exception:
+            _discard(tmp_file)
+            return False, None, ERROR_UNEXPECTED
+
+
+def decrypt_range_aes256gcm_segmented(
+        key_str: Union[str, CryptoSession],
+        encrypted_file_path: str,
+        offset: int,
+        length: int,
+        compression: str = COMPRESSION_NONE
+        ) -> Tuple[bool, Optional[bytes], Optional[str]]:
+    """
+    Decrypt `length` plaintext bytes starting at plaintext `offset` of a segmented payload.
+    Only the segments covering the range are read, authenticated and decrypted.
+
+    Args:
+        key_str:             44-character base64-like key string
+        encrypted_file_path: Path to the encrypted input file
+        offset:              First plaintext byte of the range
+        length:              Number of plaintext bytes (fewer are returned at the end of the plaintext)
+        compression:         Compression algorithm the payload was encrypted with
+
+    Returns:
+        Tuple: (success: bool, plaintext: bytes | None, error_msg: str | None)
+    """
+    enc_path = Path(encrypted_file_path)
+    if not enc_path.is_file():
+        return False, None, ERROR_FILE_NOT_FOUND
+
+    if offset < 0 or length < 0:
+        return False, None, ERROR_INVALID_RANGE
+
+    try:
+        with enc_path.open("rb") as fin, SegmentedPayloadReader(key_str, fin, compression=compression) as reader:
+            reader.seek(offset)
+            return True, reader.read(length), None
+
+    except InvalidTag:
+        return False, None, ERROR_AUTHENTICATION
+
+    except ValueError:
+        return False, None, ERROR_INVALID_PAYLOAD
+
+    except Exception:
+        return False, None, ERROR_UNEXPECTED
+
+
+class SegmentedPayloadReader(io.RawIOBase):
+    """
+    Seekable, read-only view of the plaintext of a segmented payload.
+
+    Reads decrypt only the segments covering the requested bytes; every segment is authenticated
+    before any of its plaintext is returned (InvalidTag is raised otherwise).  The payload can be
+    embedded in a larger file (e.g. the attachment stream of a PDO) by giving its offset and size.
+    The last few decrypted segments are cached so that small sequential reads stay cheap.
+    The file object is only closed with the reader if close_fileobj is set.
+
+    Compressed payloads (header version 3) need the compression algorithm from the PDO metadata; a
+    header version that does not match it raises ValueError.
+
+    Usage:
+        with SegmentedPayloadReader(key_str, fin, payload_offset, payload_size) as reader:
+            reader.seek(offset)
+            data = reader.read(length)
+    """
+
+    def __init__(self, key_str: Union[str, CryptoSession], fileobj, payload_offset: int = 0, payload_size: Optional[int] = None,
+                 close_fileobj: bool = False, compression: str = COMPRESSION_NONE):
+        super().__init__()
+        self._fileobj = fileobj
+        self._close_fileobj = close_fileobj
+        self._payload_offset = payload_offset
+
+        if payload_size is None:
+            payload_size = os.fstat(fileobj.fileno()).st_size - payload_offset
+
+        fileobj.seek(payload_offset)
+        layout = read_segment_layout(fileobj, payload_size)
+        if layout is None or not layout.matches(compression):
+            raise ValueError(ERROR_INVALID_PAYLOAD)
+
+        self._layout = layout
+        self._compression = compression
+        self._segment_size = layout.segment_size
+        self._size = layout.plaintext_size
+        self._position = 0
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+
+        with use_session(key_str) as session:
+            self._aesgcm = session.aesgcm()
+
+    @property
+    def size(self) -> int:
+        """ Plaintext size in bytes """
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+
+        if position < 0:
+            raise ValueError(ERROR_INVALID_RANGE)
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        bytes_read = 0
+
+        while bytes_read < len(view) and self._position < self._size:
+            index, start = divmod(self._position, self._segment_size)
+            plaintext = self._read_segment(index)
+            count = min(len(view) - bytes_read, len(plaintext) - start)
+            view[bytes_read:bytes_read + count] = plaintext[start:start + count]
+            bytes_read += count
+            self._position += count
+
+        return bytes_read
+
+    def close(self) -> None:
+        """ Drop the cipher context and cached plaintext (and close the file object if it is owned) """
+        self._aesgcm = None
+        self._cache.clear()
+        if self._close_fileobj and not self.closed:
+            self._fileobj.close()
+        super().close()
+
+    def _read_segment(self, index: int) -> bytes:
+        """ Authenticate and decrypt one segment, serving it from the cache when possible """
+        if index in self._cache:
+            self._cache.move_to_end(index)
+            return self._cache[index]
+
+        layout = self._layout
+        record_offset, record_size = layout.record(index)
+        self._fileobj.seek(self._payload_offset + record_offset)
+        ciphertext = self._fileobj.read(record_size)
+
+        is_last = index == layout.segment_count - 1
+        plaintext = self._aesgcm.decrypt(segment_nonce(layout.header, index, is_last), ciphertext, layout.header)
+        if layout.compressed:
+            plaintext = decompress_block(plaintext, self._compression, layout.plaintext_length(index))
+
+        self._cache[index] = plaintext
+        if len(self._cache) > SEGMENT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return plaintext
+
+
+def payload_attachment_name(file_to_encrypt) -> str:
+    """ Name the payload of file_to_encrypt is embedded under in a PDO (~filename.ext.tmp) """
+    return TEMP_PRECEEDING_CHARACTER + Path(file_to_encrypt).name + TEMP_FILE_EXTENSION
+
+
+def is_segmented_payload(encrypted_file_path: str) -> bool:
+    """ Return True if the file starts with a version 2 segmented payload header """
+    try:
+        with open(encrypted_file_path, "rb") as fin:
+            magic, version, _, _ = SEGMENT_HEADER.unpack(fin.read(SEGMENT_HEADER_SIZE))
+        return magic == SEGMENT_MAGIC and version in (SEGMENT_VERSION, SEGMENT_VERSION_COMPRESSED)
+    except (OSError, struct.error):
+        return False
+
+
+def read_segment_layout(fin, payload_size: int) -> Optional[SegmentLayout]:
+    """ Read and validate the header (and the index of a compressed payload) of a segmented payload
+
+        Args:
+            fin: seekable binary file object positioned at the start of the payload
+            payload_size: int -- total payload size in bytes (header included)
+
+        Returns:
+            layout: SegmentLayout -- header, segment sizes and record positions, None if the payload is invalid
+    """
+    payload_offset = fin.tell()
+    header = fin.read(SEGMENT_HEADER_SIZE)
+    if len(header) != SEGMENT_HEADER_SIZE:
+        return None
+
+    magic, version, segment_size, _ = SEGMENT_HEADER.unpack(header)
+    if magic != SEGMENT_MAGIC or segment_size == 0:
+        return None
+
+    if version == SEGMENT_VERSION:
+        body_size = payload_size - SEGMENT_HEADER_SIZE
+        segment_count = max(1, math.ceil(body_size / (segment_size + TAG_SIZE)))
+        last_segment_size = body_size - (segment_count - 1) * (segment_size + TAG_SIZE)
+        if last_segment_size < TAG_SIZE or segment_count > MAX_SEGMENTS:
+            return None
+        return SegmentLayout(header, version, segment_size, segment_count,
+                             plaintext_size=body_size - segment_count * TAG_SIZE, records_end=payload_size)
+
+    if version != SEGMENT_VERSION_COMPRESSED:
+        return None
+
+    index_end = payload_size - SEGMENT_INDEX_TRAILER.size
+    if index_end < SEGMENT_HEADER_SIZE:
+        return None
+    fin.seek(payload_offset + index_end)
+    trailer = fin.read(SEGMENT_INDEX_TRAILER.size)
+    if len(trailer) != SEGMENT_INDEX_TRAILER.size:
+        return None
+
+    plaintext_size, segment_count = SEGMENT_INDEX_TRAILER.unpack(trailer)
+    records_end = index_end - segment_count * SEGMENT_INDEX_ENTRY.size
+    if not 0 < segment_count <= MAX_SEGMENTS or records_end < SEGMENT_HEADER_SIZE:
+        return None
+    # Only the last segment may be short, and only a single segment may be empty
+    full_segments = (segment_count - 1) * segment_size
+    if not full_segments <= plaintext_size <= full_segments + segment_size:
+        return None
+    if plaintext_size == full_segments and segment_count > 1:
+        return None
+
+    fin.seek(payload_offset + records_end)
+    index = fin.read(segment_count * SEGMENT_INDEX_ENTRY.size)
+    if len(index) != segment_count * SEGMENT_INDEX_ENTRY.size:
+        return None
+    record_sizes = struct.unpack(f">{segment_count}I", index)
+    record_offsets = list(accumulate(record_sizes, initial=SEGMENT_HEADER_SIZE))
+    if min(record_sizes) < TAG_SIZE or record_offsets[-1] != records_end:
+        return None
+
+    return SegmentLayout(header, version, segment_size, segment_count, plaintext_size, records_end, record_offsets)
+
+
+def segment_nonce(header: bytes, index: int, is_last: bool) -> bytes:
+    """ Derive the 12-byte nonce of a segment from the header nonce prefix, segment index and final flag """
+    return header[-NONCE_PREFIX_SIZE:] + struct.pack(">IB", index, 1 if is_last else 0)
+
+
+def _read_plaintext_segments(fin, segment_size: int) -> Iterator[Tuple[int, bytes, bool]]:
+    """ Yield (index, plaintext, is_last); reads one segment ahead to flag the last one """
+    index = 0
+    current = fin.read(segment_size)
+    while True:
+        following = fin.read(segment_size) if len(current) == segment_size else b""
+        is_last = not following
+        yield index, current, is_last
+        if is_last:
+            return
+        if index + 1 >= MAX_SEGMENTS:
+            raise ValueError("Too many segments")
+        current = following
+        index += 1
+
+
+def _read_ciphertext_segments(fin, layout: SegmentLayout) -> Iterator[Tuple[int, bytes, bool]]:
+    """ Yield (index, ciphertext + tag, is_last) for every segment, fin positioned at the first record;
+        never reads past the records """
+    for index in range(layout.segment_count):
+        yield index, fin.read(layout.record(index)[1]), index == layout.segment_count - 1
+
+
+def _pack_segment_index(record_sizes: List[int], plaintext_size: int) -> bytes:
+    """ Index written after the records of a compressed payload (see the format description) """
+    return (struct.pack(f">{len(record_sizes)}I", *record_sizes)
+            + SEGMENT_INDEX_TRAILER.pack(plaintext_size, len(record_sizes)))
+
+
+def _ordered_map(pool: ThreadPoolExecutor, func, items: Iterator[tuple], window: int) -> Iterator[bytes]:
+    """ Run func over items on the pool, yielding results in order with at most `window` in flight """
+    pending = deque()
+
+    for item in items:
+        pending.append(pool.submit(func, *item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def _discard(tmp_file) -> None:
+    """ Remove a partially written temporary file """
+    if tmp_file is None:
+        return
+    try:
+        Path(tmp_file.name).unlink()
+    except Exception:
+        pass
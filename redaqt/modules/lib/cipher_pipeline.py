@@ -0,0 +1,195 @@
+"""
+File: /redaqt/modules/lib/cipher_pipeline.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Reader / cipher / writer pipeline over a bounded ring of reusable buffers
+"""
+
+import os
+import queue
+import threading
+from typing import Callable, List, Optional
+
+PIPELINE_CHUNK_SIZE = 1024 * 1024
+PIPELINE_BUFFERS = 4
+BLOCK_SIZE = 16
+PIPELINE_MIN_CHUNKS = 4            # smaller inputs are not worth starting the reader and writer threads
+
+
+def stream_cipher(fin, write: Callable, update_into: Callable,
+                  length: Optional[int] = None,
+                  chunk_size: int = PIPELINE_CHUNK_SIZE,
+                  pipelined: Optional[bool] = None) -> int:
+    """ Stream fin through a cipher context into write, with the pipeline when it pays off
+
+        Args:
+            fin: binary file object positioned at the first byte to process
+            write: callable -- receives every output chunk (a memoryview, valid only during the call)
+            update_into: callable -- cipher context update_into(data, buffer) -> bytes written
+            length: int -- number of bytes to process, None to read up to the end of fin
+            chunk_size: int -- bytes per buffer
+            pipelined: bool -- force (True) or disable (False) the reader/writer threads, None to decide
+                               from the input size and the number of CPUs
+
+        Returns:
+            processed: int -- number of input bytes passed through the cipher
+    """
+    if pipelined is None and (os.cpu_count() or 1) < 2:
+        pipelined = False           # with one CPU the threads only add hand-off overhead
+
+    if pipelined is None:
+        size = length
+        if size is None:
+            try:
+                size = os.fstat(fin.fileno()).st_size - fin.tell()
+            except (AttributeError, OSError, ValueError):
+                size = 0
+        pipelined = size >= PIPELINE_MIN_CHUNKS * chunk_size
+
+    if pipelined:
+        return run_cipher_pipeline(fin, write, update_into, length, chunk_size)
+    return run_cipher_loop(fin, write, update_into, length, chunk_size)
+
+
+def run_cipher_loop(fin, write: Callable, update_into: Callable,
+                    length: Optional[int] = None,
+                    chunk_size: int = PIPELINE_CHUNK_SIZE) -> int:
+    """ Single-threaded version of run_cipher_pipeline (one input and one output buffer) """
+    in_view = memoryview(bytearray(chunk_size))
+    out_buffer = bytearray(chunk_size + BLOCK_SIZE - 1)
+    out_view = memoryview(out_buffer)
+
+    processed = 0
+    remaining = length
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        bytes_read = fin.readinto(in_view[:size])
+        if not bytes_read:
+            if remaining:
+                raise EOFError("Input ended before the expected length")
+            break
+        bytes_out = update_into(in_view[:bytes_read], out_buffer)
+        write(out_view[:bytes_out])
+        processed += bytes_read
+        if remaining is not None:
+            remaining -= bytes_read
+
+    return processed
+
+
+def run_cipher_pipeline(fin, write: Callable, update_into: Callable,
+                        length: Optional[int] = None,
+                        chunk_size: int = PIPELINE_CHUNK_SIZE,
+                        buffers: int = PIPELINE_BUFFERS) -> int:
+    """ Stream fin through a cipher context into write, overlapping disk reads and writes with the cipher
+
+        A reader thread fills a ring of `buffers` input buffers with readinto, the calling thread runs
+        update_into from an input buffer into an output buffer, and a writer thread drains the output
+        buffers.  Buffers go back to their ring as soon as a stage is done with them, so at most
+        2 * buffers * chunk_size bytes are ever allocated and nothing is allocated per chunk.  The caller
+        finalizes the cipher context afterwards (all output has been written by then).
+
+        Args:
+            fin: binary file object positioned at the first byte to process
+            write: callable -- receives every output chunk (a memoryview, valid only during the call)
+            update_into: callable -- cipher context update_into(data, buffer) -> bytes written
+            length: int -- number of bytes to process, None to read up to the end of fin
+            chunk_size: int -- bytes per buffer
+            buffers: int -- buffers per ring
+
+        Returns:
+            processed: int -- number of input bytes passed through the cipher
+
+        Raises:
+            EOFError -- fin ended before length bytes were read
+            any exception raised by fin, write or update_into
+    """
+    in_views = [memoryview(bytearray(chunk_size)) for _ in range(buffers)]
+    out_buffers = [bytearray(chunk_size + BLOCK_SIZE - 1) for _ in range(buffers)]
+    out_views = [memoryview(buffer) for buffer in out_buffers]
+
+    free_in: "queue.Queue[Optional[int]]" = queue.Queue()
+    free_out: "queue.Queue[int]" = queue.Queue()
+    for index in range(buffers):
+        free_in.put(index)
+        free_out.put(index)
+    filled: "queue.Queue[Optional[tuple]]" = queue.Queue()
+    ciphered: "queue.Queue[Optional[tuple]]" = queue.Queue()
+
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    def reader() -> None:
+        remaining = length
+        try:
+            while True:
+                index = free_in.get()
+                if index is None or stop.is_set():
+                    return
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                bytes_read = fin.readinto(in_views[index][:size]) if size else 0
+                if not bytes_read:
+                    if remaining:
+                        raise EOFError("Input ended before the expected length")
+                    return
+                if remaining is not None:
+                    remaining -= bytes_read
+                filled.put((index, bytes_read))
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            filled.put(None)
+
+    def writer() -> None:
+        while True:
+            item = ciphered.get()
+            if item is None:
+                return
+            index, bytes_out = item
+            if not stop.is_set():
+                try:
+                    write(out_views[index][:bytes_out])
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+            # Keep recycling after a failure so the cipher stage never waits on a dead writer
+            free_out.put(index)
+
+    reader_thread = threading.Thread(target=reader, name="cipher-pipeline-reader", daemon=True)
+    writer_thread = threading.Thread(target=writer, name="cipher-pipeline-writer", daemon=True)
+    reader_thread.start()
+    writer_thread.start()
+
+    processed = 0
+    try:
+        while not stop.is_set():
+            item = filled.get()
+            if item is None:
+                break
+            index, bytes_read = item
+            out_index = free_out.get()
+            bytes_out = update_into(in_views[index][:bytes_read], out_buffers[out_index])
+            free_in.put(index)
+            processed += bytes_read
+            ciphered.put((out_index, bytes_out))
+
+    except BaseException as e:
+        errors.append(e)
+        stop.set()
+
+    finally:
+        # The writer drains what has been ciphered (unless stopped), then the reader is released
+        ciphered.put(None)
+        writer_thread.join()
+        stop.set()
+        free_in.put(None)           # wakes the reader if it is waiting for a buffer
+        reader_thread.join()
+
+    if errors:
+        raise errors[0]
+    return processed
@@ -0,0 +1,131 @@
+"""
+File: /redaqt/modules/lib/compression.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Optional pre-encryption compression stage (zlib / lzma) with entropy sniffing
+"""
+
+import lzma
+import zlib
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+"""
+Compression algorithms, recorded in the PDO /Info dictionary as /Compression
+
+    none -- plaintext is encrypted as is (also assumed when /Compression is absent)
+    zlib -- plaintext is compressed with zlib before encryption
+    lzma -- plaintext is compressed into .xz before encryption
+
+Segmented payloads (aes256gcm_segmented.py) compress every segment on its own (compress_block), so a
+segment can still be decrypted and decompressed without the ones before it.
+
+Files that are already compressed (JPEG, MP4, ZIP, Office documents, ...) look like random data, so the
+first blocks of the file are sampled and compression is skipped when their byte entropy is too high.
+"""
+
+COMPRESSION_NONE = "none"
+COMPRESSION_ZLIB = "zlib"
+COMPRESSION_LZMA = "lzma"
+COMPRESSION_ALGORITHMS = (COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_LZMA)
+
+ZLIB_LEVEL = 6
+LZMA_PRESET = 6
+
+ENTROPY_SAMPLE_SIZE = 64 * 1024
+ENTROPY_SAMPLE_BLOCKS = 4
+ENTROPY_THRESHOLD = 7.5     # bits per byte; random / already compressed data is close to 8.0
+MIN_COMPRESSIBLE_SIZE = 512
+
+ERROR_COMPRESSION = "Unsupported compression algorithm"
+ERROR_DECOMPRESSION = "Compressed data is incomplete or corrupt"
+
+
+def sample_entropy(file_path: str,
+                   block_size: int = ENTROPY_SAMPLE_SIZE,
+                   blocks: int = ENTROPY_SAMPLE_BLOCKS) -> float:
+    """ Shannon entropy (bits per byte) of the first blocks of a file
+
+        Args:
+            file_path: str -- file to sample
+            block_size: int -- bytes per sampled block
+            blocks: int -- number of blocks sampled from the start of the file
+
+        Returns:
+            entropy: float -- 0.0 (constant data) to 8.0 (random data)
+    """
+    with open(file_path, "rb") as fin:
+        sample = fin.read(block_size * blocks)
+
+    if not sample:
+        return 0.0
+
+    counts = np.bincount(np.frombuffer(sample, dtype=np.uint8), minlength=256)
+    probabilities = counts[counts > 0] / len(sample)
+    return float(-(probabilities * np.log2(probabilities)).sum())
+
+
+def select_compression(file_path: str, algorithm: str = COMPRESSION_ZLIB) -> str:
+    """ Return algorithm if the file is worth compressing, else COMPRESSION_NONE
+
+        Args:
+            file_path: str -- file that is about to be encrypted
+            algorithm: str -- preferred compression algorithm
+
+        Returns:
+            algorithm: str -- algorithm to use for this file
+    """
+    if algorithm not in COMPRESSION_ALGORITHMS:
+        raise ValueError(ERROR_COMPRESSION)
+
+    if algorithm == COMPRESSION_NONE or Path(file_path).stat().st_size < MIN_COMPRESSIBLE_SIZE:
+        return COMPRESSION_NONE
+
+    if sample_entropy(file_path) >= ENTROPY_THRESHOLD:
+        return COMPRESSION_NONE
+
+    return algorithm
+
+
+def _decompressor(algorithm: str) -> Any:
+    if algorithm == COMPRESSION_ZLIB:
+        return zlib.decompressobj()
+    if algorithm == COMPRESSION_LZMA:
+        return lzma.LZMADecompressor()
+    raise ValueError(ERROR_COMPRESSION)
+
+
+def compress_block(data: bytes, algorithm: str) -> bytes:
+    """ Compress a block on its own (a complete zlib / .xz stream), see decompress_block """
+    if algorithm == COMPRESSION_ZLIB:
+        return zlib.compress(data, ZLIB_LEVEL)
+    if algorithm == COMPRESSION_LZMA:
+        return lzma.compress(data, preset=LZMA_PRESET)
+    raise ValueError(ERROR_COMPRESSION)
+
+
+def decompress_block(data: bytes, algorithm: str, size: int) -> bytes:
+    """ Decompress a block written by compress_block that must hold exactly size bytes
+
+        Never produces more than size + 1 bytes, whatever the compressed data claims.
+
+        Raises:
+            ValueError -- the block is corrupt, incomplete or does not decompress to size bytes
+    """
+    decompressor = _decompressor(algorithm)
+    try:
+        plaintext = decompressor.decompress(data, size + 1)
+    except (zlib.error, lzma.LZMAError):
+        raise ValueError(ERROR_DECOMPRESSION)
+
+    if len(plaintext) != size or not decompressor.eof or getattr(decompressor, "unused_data", b""):
+        raise ValueError(ERROR_DECOMPRESSION)
+    return plaintext
+
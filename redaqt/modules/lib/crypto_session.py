@@ -0,0 +1,166 @@
+"""
+File: /redaqt/modules/lib/crypto_session.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Per-document crypto session, derives the AES-256 key once and builds the AEAD contexts from it
+"""
+
+import base64
+import hashlib
+import json
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple, Union
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+ENCODING = "utf-8"
+KEY_SIZE = 32
+IV_SIZE = 12
+TAG_SIZE = 16
+
+ERROR_SESSION_CLOSED = "Crypto session is closed"
+
+
+class CryptoSession:
+    """
+    Crypto key of one document.
+
+    The key string is hashed to the AES-256 key once; every object and file encrypted or decrypted
+    for the document reuses it (and a single AESGCM context, built on first use).  The key is kept in
+    one bytearray that is handed to cryptography as is, never copied into new bytes objects.
+
+    Zeroing is best-effort: close() overwrites that bytearray and drops the AESGCM context, but the
+    key string, the digest it was hashed to, and the copies cryptography / OpenSSL keep inside the
+    AESGCM and cipher contexts live on (immutable, not zeroed) until they are garbage collected.
+    The lib functions that take a key string also accept a session, so a document's calls share one
+    derivation:
+
+    Usage:
+        with CryptoSession(crypto_key) as session:
+            success, smart_policy, error_msg = encrypt_object_aes256gcm(iv_bytes, session, smart_policy_block)
+            success, path, error_msg = encrypt_file_aes256gcm_segmented(session, file_path)
+    """
+
+    def __init__(self, key_str: str):
+        self._key = bytearray(derive_aes256_key_from_string(key_str))
+        self._aesgcm: Optional[AESGCM] = None
+
+    def __enter__(self) -> "CryptoSession":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """ Zero the session's key buffer and drop the AESGCM context (best-effort, see the class docstring) """
+        self._key[:] = bytes(len(self._key))
+        self._key = bytearray()
+        self._aesgcm = None
+
+    @property
+    def closed(self) -> bool:
+        return len(self._key) != KEY_SIZE
+
+    def aesgcm(self) -> AESGCM:
+        """ One-shot AEAD context (thread safe, shared by the segment workers) """
+        if self._aesgcm is None:
+            self._aesgcm = AESGCM(self._checked_key())
+        return self._aesgcm
+
+    def gcm_encryptor(self, iv_bytes: bytes):
+        """ Streaming AES-256-GCM encryption context """
+        return Cipher(algorithms.AES(self._checked_key()), modes.GCM(iv_bytes), backend=default_backend()).encryptor()
+
+    def gcm_decryptor(self, iv_bytes: bytes, tag: bytes):
+        """ Streaming AES-256-GCM decryption context, finalize() verifies the tag """
+        return Cipher(algorithms.AES(self._checked_key()), modes.GCM(iv_bytes, tag),
+                      backend=default_backend()).decryptor()
+
+    def encrypt_object(self, iv_bytes: bytes, data_to_encrypt) -> Tuple[bool, Optional[str], Optional[str]]:
+        """ Encrypt a dict or str, see encrypt_object_aes256gcm
+
+            Returns:
+                success: bool -- False (an error was encountered) or True (no error encountered)
+                ciphertext_b64: str -- Base64-encoded IV + ciphertext + tag
+                error_msg: str -- error message
+        """
+        if not isinstance(data_to_encrypt, (dict, str)):
+            return False, None, f"Unsupported data type"
+
+        if isinstance(data_to_encrypt, dict):
+            try:
+                data_str = json.dumps(data_to_encrypt, separators=(',', ':'))
+            except Exception:
+                return False, None, f"Data encoding error"
+        else:
+            data_str = data_to_encrypt
+
+        if self.closed:
+            return False, None, f"Invalid AES key"
+
+        if len(iv_bytes) != IV_SIZE:
+            return False, None, f"Invalid IV"
+
+        try:
+            iv_bytes = bytes(iv_bytes)
+            ciphertext = self.aesgcm().encrypt(iv_bytes, data_str.encode(ENCODING), None)
+            return True, base64.b64encode(iv_bytes + ciphertext).decode(ENCODING), None
+
+        except Exception:
+            return False, None, f"Encryption failure"
+
+    def decrypt_object(self, encrypted_b64: str) -> Tuple[bool, Optional[str], Optional[str]]:
+        """ Decrypt a base64-encoded IV + ciphertext + tag, see decrypt_object_aes256gcm
+
+            Returns:
+                success: bool -- False (an error was encountered) or True (no error encountered)
+                plaintext: str -- decrypted string
+                error_msg: str -- error message
+        """
+        try:
+            encrypted_bytes = base64.b64decode(encrypted_b64)
+            if len(encrypted_bytes) < IV_SIZE + TAG_SIZE:
+                return False, None, None  # not enough bytes to contain IV and tag
+
+            plaintext_bytes = self.aesgcm().decrypt(encrypted_bytes[:IV_SIZE], encrypted_bytes[IV_SIZE:], None)
+            return True, plaintext_bytes.decode(ENCODING), None
+
+        except Exception:
+            return False, None, "Decryption failure"
+
+    def _checked_key(self) -> bytearray:
+        """ The key buffer itself (cryptography accepts bytes-like keys), not a copy """
+        if self.closed:
+            raise ValueError(ERROR_SESSION_CLOSED)
+        return self._key
+
+
+@contextmanager
+def use_session(key: Union[str, CryptoSession]) -> Iterator[CryptoSession]:
+    """ Reuse the caller's session, or open (and close) one for a single call given a key string """
+    if isinstance(key, CryptoSession):
+        yield key
+        return
+
+    with CryptoSession(key) as session:
+        yield session
+
+
+def derive_aes256_key_from_string(input_key: str) -> bytes:
+    """
+    Derive a 32-byte AES-256 key from an arbitrary-length string using SHA-256.
+
+    Args:
+        input_key: str -- original 44-character string
+
+    Returns:
+        bytes -- 32-byte AES key
+    """
+    return hashlib.sha256(input_key.encode('utf-8')).digest()
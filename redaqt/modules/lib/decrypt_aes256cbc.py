@@ -11,12 +11,21 @@ Description: Decryption functions for AES256CBC
 """
 
 import base64
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.padding import PKCS7
 
+from redaqt.modules.lib.cipher_pipeline import stream_cipher
+
 ENCODING = 'utf-8'
+BLOCK_SIZE = 16
+DECRYPT_CHUNK_SIZE = 1024 * 1024
+PARALLEL_RANGE_SIZE = 8 * 1024 * 1024     # ciphertext bytes per range, a multiple of BLOCK_SIZE
+PARALLEL_MIN_RANGES = 2                   # smaller files are decrypted serially
 
 
 def decrypt_object_aes256cbc(init_vector: str, key: str,
@@ -67,7 +76,9 @@ def decrypt_object_aes256cbc(init_vector: str, key: str,
     return True, decrypted_data.decode(ENCODING)
 
 
-def decrypt_file_aes256cbc(init_vector: str, key: str, file_to_decrypt: str, decrypt_to_directory: str):
+def decrypt_file_aes256cbc(init_vector: str, key: str, file_to_decrypt: str, decrypt_to_directory: str,
+                           chunk_size: int = DECRYPT_CHUNK_SIZE, pipelined: Optional[bool] = None,
+                           parallel: Optional[bool] = None):
     """ Decrypts a file encrypted with AES (CBC mode) <name.enc>
 
     Args:
@@ -75,13 +86,25 @@ def decrypt_file_aes256cbc(init_vector: str, key: str, file_to_decrypt: str, dec
         key: str -- 32-byte string representing the AES256 key
         file_to_decrypt: str -- location and filename to be decrypted
         decrypt_to_directory: str -- location and filename for the decrypted file to be saved too
+        chunk_size: int -- number of ciphertext bytes decrypted at a time (read into a reusable buffer)
+        pipelined: bool -- read and write on their own threads (see cipher_pipeline), None to decide by size
+        parallel: bool -- decrypt block-aligned ranges on all CPUs (see decrypt_file_aes256cbc_parallel),
+                          None to decide from the file size and the number of CPUs
 
     Returns:
         success: bool -- success flag (True: no error, False: error encountered)
 
     """
 
-    chunk_size: int = 64 * 1024
+    if parallel is None:
+        try:
+            parallel = ((os.cpu_count() or 1) > 1 and
+                        os.path.getsize(file_to_decrypt) >= PARALLEL_MIN_RANGES * PARALLEL_RANGE_SIZE)
+        except OSError:
+            parallel = False
+
+    if parallel:
+        return decrypt_file_aes256cbc_parallel(init_vector, key, file_to_decrypt, decrypt_to_directory)
 
     crypto_key = key[0:32].encode(ENCODING)
     iv = init_vector.encode(ENCODING)
@@ -93,65 +116,139 @@ def decrypt_file_aes256cbc(init_vector: str, key: str, file_to_decrypt: str, dec
     decrypt_to_filepath = decrypt_to_directory / decrypt_to_filename
 
     try:
-        with open(file_to_decrypt, "rb") as fin, open(decrypt_to_filepath, "wb") as fout:
-            # Initialize PKCS7 unpadder
+        with open(file_to_decrypt, "rb", buffering=0) as fin, open(decrypt_to_filepath, "wb") as fout:
+            ciphertext_size = os.fstat(fin.fileno()).st_size
+            if ciphertext_size == 0 or ciphertext_size % BLOCK_SIZE:
+                return False
+
+            # Every block but the last goes through the pipeline, the last one carries the PKCS7 padding
+            stream_cipher(fin, fout.write, decryptor.update_into, length=ciphertext_size - BLOCK_SIZE,
+                          chunk_size=chunk_size, pipelined=pipelined)
+
+            decrypted_final = decryptor.update(fin.read(BLOCK_SIZE)) + decryptor.finalize()
+
+            # Unpad the final block
             unpadding = PKCS7(128).unpadder()
+            fout.write(unpadding.update(decrypted_final) + unpadding.finalize())
+
+    except FileNotFoundError as e:
+        #handle_error(e, decrypt_to_filepath, 62, "File not found")
+        return False
+
+    except PermissionError as e:
+        #handle_error(e, decrypt_to_filepath, 62, "Permission denied")
+        return False
 
-            while True:
-                # Read encrypted bytes in chunks
-                encrypted_bytes = fin.read(chunk_size)
-                if not encrypted_bytes:
-                    break
+    except Exception as e:
+        #handle_error(e, decrypt_to_filepath, 64, "Unexpected error")
+        return False
 
-                decrypted_bytes = decryptor.update(encrypted_bytes)  # Decrypt the current chunk
-                unpadded_bytes = unpadding.update(decrypted_bytes)  # Pass decrypted bytes through unpadder
+    return True
+
+
+def decrypt_file_aes256cbc_parallel(init_vector: str, key: str, file_to_decrypt: str, decrypt_to_directory: str,
+                                    range_size: int = PARALLEL_RANGE_SIZE, max_workers: Optional[int] = None):
+    """ Decrypts a file encrypted with AES (CBC mode) <name.enc> on a thread pool
+
+    CBC decryption of a block only needs the ciphertext block before it, so the ciphertext is split into
+    block-aligned ranges that are decrypted independently, each with the last ciphertext block of the
+    previous range as its IV.  Every range is written at its own offset of the output file and only the
+    final range is unpadded.  The output is removed if any range fails.
+
+    Args:
+        init_vector: str -- initialization vector
+        key: str -- 32-byte string representing the AES256 key
+        file_to_decrypt: str -- location and filename to be decrypted
+        decrypt_to_directory: str -- location and filename for the decrypted file to be saved too
+        range_size: int -- ciphertext bytes per range (rounded down to a multiple of the block size)
+        max_workers: int -- thread pool size (defaults to the CPU count)
 
-                try:
-                    fout.write(unpadded_bytes)
+    Returns:
+        success: bool -- success flag (True: no error, False: error encountered)
 
-                except FileNotFoundError as e:
-                    #handle_error(e, decrypt_to_filepath, 62, "File not found")
-                    return False
+    """
 
-                except PermissionError as e:
-                    #handle_error(e, decrypt_to_filepath, 62, "Permission denied")
-                    return False
+    crypto_key = key[0:32].encode(ENCODING)
+    iv = init_vector.encode(ENCODING)
+    range_size = max(BLOCK_SIZE, range_size - range_size % BLOCK_SIZE)
 
-                except Exception as e:
-                    #handle_error(e, decrypt_to_filepath, 64, "Unexpected error")
-                    return False
+    decrypt_to_filename = Path(file_to_decrypt).name  # Set the filename for the decrypted file
+    decrypt_to_filename = Path(decrypt_to_filename).with_suffix('')  # Remove the [.enc] extension
+    decrypt_to_filepath = decrypt_to_directory / decrypt_to_filename
 
-            decrypted_final = decryptor.finalize()  # Finalize decryption and padding
+    buffers = threading.local()
+
+    def decrypt_range(offset: int, length: int, is_last: bool) -> int:
+        # Each worker thread reuses one input and one output buffer across its ranges
+        if getattr(buffers, "size", 0) < length:
+            buffers.size = length
+            buffers.ciphertext = bytearray(length)
+            buffers.plaintext = bytearray(length + BLOCK_SIZE - 1)
+        ciphertext = memoryview(buffers.ciphertext)[:length]
+
+        with open(file_to_decrypt, "rb", buffering=0) as fin:
+            if offset:
+                fin.seek(offset - BLOCK_SIZE)
+                range_iv = fin.read(BLOCK_SIZE)
+            else:
+                range_iv = iv
+            if fin.readinto(ciphertext) != length:
+                raise EOFError("Input ended before the expected length")
+
+        decryptor = Cipher(algorithms.AES(crypto_key), modes.CBC(range_iv)).decryptor()
+        plaintext = memoryview(buffers.plaintext)[:decryptor.update_into(ciphertext, buffers.plaintext)]
+        decryptor.finalize()
+
+        if is_last:
+            # Unpad the final range
+            unpadding = PKCS7(128).unpadder()
+            plaintext = unpadding.update(plaintext) + unpadding.finalize()
 
-            # Finalize unpadding for any remaining bytes
-            unpadded_final = unpadding.update(decrypted_final) + unpadding.finalize()
+        with open(decrypt_to_filepath, "r+b") as fout:
+            fout.seek(offset)
+            fout.write(plaintext)
+        return len(plaintext)
 
-            try:
-                fout.write(unpadded_final)  # Write the final unpadded chunk
+    created = False
+    try:
+        ciphertext_size = os.path.getsize(file_to_decrypt)
+        if ciphertext_size == 0 or ciphertext_size % BLOCK_SIZE:
+            return False
 
-            except FileNotFoundError as e:
-                #handle_error(e, decrypt_to_filepath, 62, "File not found")
-                return False
+        with open(decrypt_to_filepath, "wb"):
+            created = True
 
-            except PermissionError as e:
-                #handle_error(e, decrypt_to_filepath, 62, "Permission denied")
-                return False
+        ranges = [(offset, min(range_size, ciphertext_size - offset), offset + range_size >= ciphertext_size)
+                  for offset in range(0, ciphertext_size, range_size)]
 
-            except Exception as e:
-                #handle_error(e, decrypt_to_filepath, 64, "Unexpected error")
-                return False
+        workers = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(min(workers, len(ranges))) as pool:
+            written = list(pool.map(decrypt_range, *zip(*ranges)))
 
+        # The padding is gone from the final range, trim the file to the plaintext size
+        last_offset, _, _ = ranges[-1]
+        os.truncate(decrypt_to_filepath, last_offset + written[-1])
 
     except FileNotFoundError as e:
         #handle_error(e, decrypt_to_filepath, 62, "File not found")
-        return False
+        return _discard_output(decrypt_to_filepath, created)
 
     except PermissionError as e:
         #handle_error(e, decrypt_to_filepath, 62, "Permission denied")
-        return False
+        return _discard_output(decrypt_to_filepath, created)
 
     except Exception as e:
         #handle_error(e, decrypt_to_filepath, 64, "Unexpected error")
-        return False
+        return _discard_output(decrypt_to_filepath, created)
+
+    return True
+
 
-    return True
\ No newline at end of file
+def _discard_output(file_path: Path, created: bool) -> bool:
+    """ Remove a partially written output file, returns False for the caller to pass on """
+    if created:
+        try:
+            Path(file_path).unlink()
+        except Exception:
+            pass
+    return False
@@ -12,14 +12,14 @@ Description: Decryption functions for AES256GCM
 
 from tempfile import NamedTemporaryFile
 from pathlib import Path
-import hashlib
-import base64
+import os
 import tempfile
 
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 from cryptography.exceptions import InvalidTag
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
+
+from redaqt.modules.lib.crypto_session import CryptoSession, use_session, derive_aes256_key_from_string
+from redaqt.modules.lib.cipher_pipeline import stream_cipher
 
 ENCODING = "utf-8"
 TEMP_FOLDER = Path(tempfile.gettempdir())
@@ -31,14 +31,20 @@ ERROR_UNEXPECTED = "Unexpected error was encountered"
 ERROR_UNEXPECTED_ENCRYPTION = "Encryption module had an unexpected error"
 
 TEMP_FOLDER = Path(tempfile.gettempdir())
+TEMP_FILE_EXTENSION = '.tmp'
+
+IV_SIZE = 12
+TAG_SIZE = 16
+BLOCK_SIZE = 16
+DECRYPT_CHUNK_SIZE = 1024 * 1024
 
-def decrypt_object_aes256gcm(key_str: str, encrypted_b64: str) -> Tuple[bool, Optional[str], Optional[str]]:
+def decrypt_object_aes256gcm(key_str: Union[str, CryptoSession], encrypted_b64: str) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Decrypts base64-encoded AES-256-GCM encrypted string.
     Expects input format: IV (12 bytes) + ciphertext + tag (16 bytes)
 
     Args:
-        key_str: 44-character original key (hashed to 32 bytes)
+        key_str: 44-character original key (hashed to 32 bytes), or the document's CryptoSession
         encrypted_b64: base64-encoded blob of iv + ciphertext + tag
 
     Returns:
@@ -46,124 +52,128 @@ def decrypt_object_aes256gcm(key_str: str, encrypted_b64: str) -> Tuple[bool, Op
         ciphertext_b64: str -- Base64-encoded ciphertext string
         error_msg: str -- error message
     """
-    result: Tuple[bool, Optional[str], Optional[str]] = (False, None, None)
-
-    try:
-        encrypted_bytes = base64.b64decode(encrypted_b64)
-        if len(encrypted_bytes) < 12 + 16:
-            return result  # not enough bytes to contain IV and tag
-
-        # Split: IV (12 bytes) | Ciphertext | Tag (16 bytes)
-        iv = encrypted_bytes[:12]
-        tag = encrypted_bytes[-16:]
-        ciphertext = encrypted_bytes[12:-16]
-
-        key_bytes = bytearray(derive_aes256_key_from_string(key_str))
-        iv_bytes = bytearray(iv)
-
-        cipher = Cipher(
-            algorithms.AES(bytes(key_bytes)),
-            modes.GCM(bytes(iv_bytes), tag),
-            backend=default_backend()
-        )
-        decryptor = cipher.decryptor()
-        plaintext_bytes = decryptor.update(ciphertext) + decryptor.finalize()
-
-        plaintext_str = plaintext_bytes.decode("utf-8")
-        result = (True, plaintext_str, None)
-
-    except Exception:
-        result = (False, None, "Decryption failure")
-
-    finally:
-        # Zero out key and IV from memory
-        for i in range(len(key_bytes)):
-            key_bytes[i] = 0
-        for i in range(len(iv_bytes)):
-            iv_bytes[i] = 0
-
-    return result
-
+    with use_session(key_str) as session:
+        return session.decrypt_object(encrypted_b64)
 
 
 def decrypt_file_aes256gcm(
-    key_str: str,
+    key_str: Union[str, CryptoSession],
     encrypted_file_path: str,
-    output_file_path: Path
+    output_file_path: Path,
+    chunk_size: int = DECRYPT_CHUNK_SIZE,
+    pipelined: Optional[bool] = None
 ) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Decrypts a file encrypted with AES-256-GCM. Assumes the file format:
     [12-byte IV][ciphertext][16-byte tag]
 
+    The ciphertext is streamed through the decryptor in chunk_size blocks with a reusable output buffer,
+    so memory use does not depend on the file size.  The plaintext is written to a temporary file that is
+    renamed to output_file_path only once the tag has been verified.
+
     Args:
-        key_str:             44-character base64-like key string
+        key_str:             44-character base64-like key string, or a CryptoSession
         encrypted_file_path: Path to the encrypted input file
         output_file_path:    Optional destination path for the decrypted file
+        chunk_size:          Number of ciphertext bytes decrypted at a time
+        pipelined:           Read and write on their own threads (see cipher_pipeline), None to decide by size
 
     Returns:
         Tuple: (success: bool, decrypted_file_path: str | None, error_msg: str | None)
     """
-    key_bytes = bytearray(derive_aes256_key_from_string(key_str))
-    iv_bytes = None
-
     try:
         enc_path = Path(encrypted_file_path)
         if not enc_path.is_file():
             return False, None, ERROR_FILE_NOT_FOUND
 
-        file_bytes = enc_path.read_bytes()
-        file_size = len(file_bytes)
+        with enc_path.open("rb") as fin:
+            return decrypt_stream_aes256gcm(key_str, fin, 0, os.fstat(fin.fileno()).st_size,
+                                            output_file_path, chunk_size, pipelined)
+
+    except Exception:
+        return False, None, ERROR_UNEXPECTED
+
 
-        if file_size < 12 + 16:
-            return False, None, ERROR_UNEXPECTED_ENCRYPTION
+def decrypt_stream_aes256gcm(
+    key_str: Union[str, CryptoSession],
+    fin,
+    payload_offset: int,
+    payload_size: int,
+    output_file_path: Path,
+    chunk_size: int = DECRYPT_CHUNK_SIZE,
+    pipelined: Optional[bool] = None
+) -> Tuple[bool, Optional[str], Optional[str]]:
+    """
+    Decrypts an AES-256-GCM payload stored at payload_offset of an open binary file, for example the
+    embedded-file stream of a PDO, without copying it out first (see decrypt_file_aes256gcm).
 
-        # Extract [IV][ciphertext][tag]
-        iv_bytes = bytearray(file_bytes[:12])
-        tag = file_bytes[-16:]
-        ciphertext = file_bytes[12:-16]
+    Args:
+        key_str:          44-character base64-like key string, or a CryptoSession
+        fin:              Seekable binary file object holding the payload
+        payload_offset:   File offset of the payload ([12-byte IV])
+        payload_size:     Payload size in bytes (IV and tag included)
+        output_file_path: Optional destination path for the decrypted file
+        chunk_size:       Number of ciphertext bytes decrypted at a time
+        pipelined:        Read and write on their own threads (see cipher_pipeline), None to decide by size
 
-        cipher = Cipher(
-            algorithms.AES(bytes(key_bytes)),
-            modes.GCM(bytes(iv_bytes), tag),
-            backend=default_backend()
-        )
-        decryptor = cipher.decryptor()
+    Returns:
+        Tuple: (success: bool, decrypted_file_path: str | None, error_msg: str | None)
+    """
+    iv_bytes = bytearray()
+    tmp_file = None
 
-        # Determine output path
-        if output_file_path:
-            out_path = Path(output_file_path)
-        else:
-            tmp_file = NamedTemporaryFile(dir=TEMP_FOLDER, delete=False)
-            out_path = Path(tmp_file.name)
+    with use_session(key_str) as session:
+        try:
+            if payload_size < IV_SIZE + TAG_SIZE:
+                return False, None, ERROR_UNEXPECTED_ENCRYPTION
 
-        with out_path.open("wb") as fout:
-            fout.write(decryptor.update(ciphertext) + decryptor.finalize())
+            # Read [IV] and the trailing [tag] first, then stream the [ciphertext] in between
+            fin.seek(payload_offset)
+            iv_bytes[:] = fin.read(IV_SIZE)
+            fin.seek(payload_offset + payload_size - TAG_SIZE)
+            tag = fin.read(TAG_SIZE)
+            fin.seek(payload_offset + IV_SIZE)
 
-        return True, str(out_path), None
+            decryptor = session.gcm_decryptor(bytes(iv_bytes), tag)
 
-    except InvalidTag:
-        return False, None, "Decryption failed: authentication tag mismatch"
+            # Write next to the destination so the final rename stays on the same filesystem
+            out_dir = Path(output_file_path).parent if output_file_path else TEMP_FOLDER
+            prefix = Path(output_file_path).name if output_file_path else None
+            tmp_file = NamedTemporaryFile(dir=out_dir, prefix=prefix, suffix=TEMP_FILE_EXTENSION, delete=False)
 
-    except Exception:
-        return False, None, ERROR_UNEXPECTED
+            with tmp_file as fout:
+                # Reusable buffers; reading the payload and writing the plaintext overlap the cipher
+                stream_cipher(fin, fout.write, decryptor.update_into, length=payload_size - IV_SIZE - TAG_SIZE,
+                              chunk_size=chunk_size, pipelined=pipelined)
 
-    finally:
-        # Zero out sensitive memory
-        for i in range(len(key_bytes)):
-            key_bytes[i] = 0
-        if iv_bytes:
-            for i in range(len(iv_bytes)):
-                iv_bytes[i] = 0
+                # Raises InvalidTag before the plaintext is moved into place
+                fout.write(decryptor.finalize())
 
+            if not output_file_path:
+                return True, tmp_file.name, None
 
-def derive_aes256_key_from_string(input_key: str) -> bytes:
-    """
-    Derive a 32-byte AES-256 key from an arbitrary-length string using SHA-256.
+            out_path = Path(output_file_path)
+            os.replace(tmp_file.name, out_path)
+            return True, str(out_path), None
 
-    Args:
-        input_key: str -- original 44-character string
+        except InvalidTag:
+            _discard(tmp_file)
+            return False, None, "Decryption failed: authentication tag mismatch"
 
-    Returns:
-        bytes -- 32-byte AES key
-    """
-    return hashlib.sha256(input_key.encode('utf-8')).digest()
\ No newline at end of file
+        except Exception:
+            _discard(tmp_file)
+            return False, None, ERROR_UNEXPECTED
+
+        finally:
+            # Zero out the IV (the session zeroes the key)
+            iv_bytes[:] = bytes(len(iv_bytes))
+
+
+def _discard(tmp_file) -> None:
+    """ Remove a partially written (unverified) plaintext file """
+    if tmp_file is None:
+        return
+    try:
+        Path(tmp_file.name).unlink()
+    except Exception:
+        pass
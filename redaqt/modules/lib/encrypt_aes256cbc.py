@@ -20,11 +20,16 @@ from typing import Any, Dict, Optional, Tuple, Union
 from cryptography.hazmat.primitives.padding import PKCS7
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
+from redaqt.modules.lib.cipher_pipeline import stream_cipher
+
 ENCODING = "utf-8"
 TEMP_FILE_EXTENSION = '.tmp'
 TEMP_PRECEEDING_CHARACTER = '~'
 TEMP_FOLDER = Path(tempfile.gettempdir())
 
+BLOCK_SIZE = 16
+ENCRYPT_CHUNK_SIZE = 1024 * 1024
+
 
 def encrypt_object_aes256cbc(
     iv_b64: str,
@@ -96,6 +101,8 @@ def encrypt_file_aes256cbc(
     iv_b64: str,
     key_b64: str,
     file_to_encrypt: str,
+    chunk_size: int = ENCRYPT_CHUNK_SIZE,
+    pipelined: Optional[bool] = None,
 ) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Encrypt a file chunk-by-chunk with AES-256-CBC, writing out `<file>.enc`.
@@ -104,6 +111,8 @@ def encrypt_file_aes256cbc(
         iv_b64:          Base64-encoded 16-byte IV
         key_b64:         Base64-encoded 32-byte AES key
         file_to_encrypt: Path to the plaintext file
+        chunk_size:      Number of plaintext bytes encrypted at a time (read into a reusable buffer)
+        pipelined:       Read and write on their own threads (see cipher_pipeline), None to decide by file size
 
     Returns:
         success: bool -- False (an error was encountered) or True (no error encountered)
@@ -128,35 +137,31 @@ def encrypt_file_aes256cbc(
     except Exception:
         return False, None, f"Invalid key"
 
-    # Prepare cipher & padder
+    if chunk_size <= 0:
+        return False, None, f"Invalid chunk size"
+
+    # Prepare cipher (the encryptor carries partial blocks between chunks, PKCS7 padding is added at the end)
     cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
     encryptor = cipher.encryptor()
-    padder = PKCS7(algorithms.AES.block_size).padder()
 
     try:
         in_path = Path(file_to_encrypt)
         if not in_path.is_file():
             return False, None, f"{file_to_encrypt} does not exist"
 
-        # Create the temp output path: TEMP_FOLDER/~filename.ext.tmp
-        temp_filename = (
-                TEMP_PRECEEDING_CHARACTER + in_path.name + TEMP_FILE_EXTENSION
-        )
-        out_path = TEMP_FOLDER / temp_filename
-
-        # Write encrypted content to temporary file in TEMP_FOLDER
-        tmp_file = NamedTemporaryFile(dir=TEMP_FOLDER, delete=False)
-
-        with in_path.open("rb") as fin, tmp_file as fout:
-            while chunk := fin.read(64 * 1024):
-                fout.write(encryptor.update(padder.update(chunk)))
+        # Write encrypted content to a unique temporary file: TEMP_FOLDER/~filename.ext.<unique>.tmp
+        # (two files with the same name, e.g. protected in parallel, never share an output path)
+        tmp_file = NamedTemporaryFile(dir=TEMP_FOLDER, prefix=TEMP_PRECEEDING_CHARACTER + in_path.name + ".",
+                                      suffix=TEMP_FILE_EXTENSION, delete=False)
 
-            fout.write(
-                encryptor.update(padder.finalize()) + encryptor.finalize()
-            )
+        with in_path.open("rb", buffering=0) as fin, tmp_file as fout:
+            # Reusable buffers (no bytes objects allocated per chunk); reads and writes overlap the cipher
+            total = stream_cipher(fin, fout.write, encryptor.update_into,
+                                  chunk_size=chunk_size, pipelined=pipelined)
 
-        # Atomically move final file into target filename
-        Path(tmp_file.name).replace(out_path)
+            # PKCS7: 1 to 16 bytes, each holding the pad length
+            pad_length = BLOCK_SIZE - total % BLOCK_SIZE
+            fout.write(encryptor.update(bytes([pad_length]) * pad_length) + encryptor.finalize())
 
     except Exception:
         if 'tmp_file' in locals() and tmp_file is not None:
@@ -169,4 +174,4 @@ def encrypt_file_aes256cbc(
         # Clear sensitive data
     del key, iv
 
-    return True, str(out_path), None
+    return True, tmp_file.name, None
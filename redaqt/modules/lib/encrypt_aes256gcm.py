@@ -10,16 +10,13 @@ Date: July 2025
 Description: Encryption functions
 """
 
-import base64
-import json
 import tempfile
-import hashlib
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Any, Optional, Tuple
+from typing import Any, Optional, Tuple, Union
 
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from redaqt.modules.lib.crypto_session import CryptoSession, use_session, derive_aes256_key_from_string
+from redaqt.modules.lib.cipher_pipeline import stream_cipher
 
 ENCODING = "utf-8"
 TEMP_FILE_EXTENSION = '.tmp'
@@ -32,9 +29,11 @@ ERROR_OS_ACCESS_DENIED = f"OS error writing file to system"
 ERROR_UNEXPECTED = "Unexpected error was encountered"
 ERROR_UNEXPECTED_ENCRYPTION = "Encryption module had an unexpected error"
 
+ENCRYPT_CHUNK_SIZE = 1024 * 1024
+
 
 def encrypt_object_aes256gcm(iv_bytes: bytes,
-                             key_str: str,
+                             key_str: Union[str, CryptoSession],
                              data_to_encrypt: Optional[dict]
                              ) -> Tuple[bool, Optional[str], Optional[str]]:
     """
@@ -43,7 +42,7 @@ def encrypt_object_aes256gcm(iv_bytes: bytes,
 
     Args:
         iv_bytes: 12-byte nonce (IV)
-        key_str: 32-byte AES256 key as string
+        key_str: 32-byte AES256 key as string, or the document's CryptoSession
         data_to_encrypt: dict or str
 
     Returns:
@@ -52,81 +51,46 @@ def encrypt_object_aes256gcm(iv_bytes: bytes,
         error_msg: str -- error message
     """
 
-    if not isinstance(data_to_encrypt, (dict, str)):
-        return False, None, f"Unsupported data type"
-
-    if isinstance(data_to_encrypt, dict):
-        try:
-            data_str = json.dumps(data_to_encrypt, separators=(',', ':'))
-        except Exception:
-            return False, None, f"Data encoding error"
-    else:
-        data_str = data_to_encrypt
-
-    # Derive and wrap in bytearray so it can be zeroed out
-    key_bytes = bytearray(derive_aes256_key_from_string(key_str))
-    iv_bytes = bytearray(iv_bytes)  # So we can zero it later
-
-    if len(key_bytes) != 32:
-        return False, None, f"Invalid AES key"
-
-    if len(iv_bytes) != 12:
-        return False, None, f"Invalid IV"
-
-    result: Tuple[bool, Optional[str], Optional[str]] = (False, None, f"Encryption failure")
-
-    try:
-        cipher = Cipher(
-            algorithms.AES(bytes(key_bytes)),
-            modes.GCM(iv_bytes),
-            backend=default_backend()
-        )
-        encryptor = cipher.encryptor()
-        ciphertext = encryptor.update(data_str.encode(ENCODING)) + encryptor.finalize()
-
-        encrypted_bytes = iv_bytes + ciphertext + encryptor.tag
-        encoded = base64.b64encode(encrypted_bytes).decode("utf-8")
-        result = (True, encoded, None)
-
-    except Exception:
-        return result
-
-    finally:
-        # Securely zero out key and IV
-        if isinstance(key_bytes, (bytes, bytearray)):
-            for i in range(len(key_bytes)):
-                key_bytes = bytearray(key_bytes)
-                key_bytes[i] = 0
-        if isinstance(iv_bytes, (bytes, bytearray)):
-            for i in range(len(iv_bytes)):
-                iv_bytes = bytearray(iv_bytes)
-                iv_bytes[i] = 0
-
-    return result
+    with use_session(key_str) as session:
+        return session.encrypt_object(iv_bytes, data_to_encrypt)
 
 
 def encrypt_file_aes256gcm(
         iv_bytes: bytes,
-        key_str: str,
-        file_to_encrypt: Optional[Any]
+        key_str: Union[str, CryptoSession],
+        file_to_encrypt: Optional[Any],
+        hasher: Optional[Any] = None,
+        chunk_size: int = ENCRYPT_CHUNK_SIZE,
+        pipelined: Optional[bool] = None
         ) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Encrypt a file chunk-by-chunk with AES-256-GCM, writing out to a temporary file.
 
     Args:
         iv_bytes:        Byte-encoded 12-byte IV (nonce)
-        key_str:         44-character input string (converted to 32-byte AES key)
+        key_str:         44-character input string (converted to 32-byte AES key), or a CryptoSession
         file_to_encrypt: Path to the plaintext file
+        hasher:          Optional hashlib object fed every byte written to the temporary file
+        chunk_size:      Number of plaintext bytes encrypted at a time (read into a reusable buffer)
+        pipelined:       Read and write on their own threads (see cipher_pipeline), None to decide by file size
 
     Returns:
         Tuple of (success, output file path or None, error message or None)
     """
-    tmp_file = None
-
-    # Derive and wrap in bytearray so it can be zeroed out
-    key_bytes = bytearray(derive_aes256_key_from_string(key_str))
     iv_bytes = bytearray(iv_bytes)  # So we can zero it later
 
+    with use_session(key_str) as session:
+        try:
+            return _encrypt_file(iv_bytes, session, file_to_encrypt, hasher, chunk_size, pipelined)
+        finally:
+            iv_bytes[:] = bytes(len(iv_bytes))
+
+
+def _encrypt_file(iv_bytes: bytearray, session: CryptoSession, file_to_encrypt, hasher, chunk_size: int,
+                  pipelined: Optional[bool]) -> Tuple[bool, Optional[str], Optional[str]]:
+    """ encrypt_file_aes256gcm with the key already derived """
+    tmp_file = None
+
     try:
         # Check input file
         in_path = Path(file_to_encrypt)
@@ -138,38 +102,38 @@ def encrypt_file_aes256gcm(
             return False, None, ERROR_UNEXPECTED_ENCRYPTION
 
         # Validate AES key
-        if len(key_bytes) != 32:
+        if session.closed:
             return False, None, ERROR_UNEXPECTED_ENCRYPTION
 
-        # Output file path
-        temp_filename = TEMP_PRECEEDING_CHARACTER + in_path.name + TEMP_FILE_EXTENSION
-        out_path = TEMP_FOLDER / temp_filename
+        if chunk_size <= 0:
+            return False, None, ERROR_UNEXPECTED_ENCRYPTION
 
-        # Create temp file securely
+        # Create temp file securely: TEMP_FOLDER/~filename.ext.<unique>.tmp, never shared by two files with the same name
         try:
-            tmp_file = NamedTemporaryFile(dir=TEMP_FOLDER, delete=False)
+            tmp_file = NamedTemporaryFile(dir=TEMP_FOLDER, prefix=TEMP_PRECEEDING_CHARACTER + in_path.name + ".",
+                                          suffix=TEMP_FILE_EXTENSION, delete=False)
         except Exception:
             return False, None, ERROR_OS_ACCESS_DENIED
 
         # Set up cipher
-        cipher = Cipher(
-            algorithms.AES(key_bytes),
-            modes.GCM(iv_bytes),
-            backend=default_backend()
-        )
-        encryptor = cipher.encryptor()
+        encryptor = session.gcm_encryptor(bytes(iv_bytes))
 
         # Encrypt and write
-        with in_path.open("rb") as fin, tmp_file as fout:
-            fout.write(iv_bytes)  # Prepend nonce (IV)
-            while chunk := fin.read(64 * 1024):
-                fout.write(encryptor.update(chunk))
-            fout.write(encryptor.finalize())
-            fout.write(encryptor.tag)  # Append GCM tag
+        with in_path.open("rb", buffering=0) as fin, tmp_file as fout:
+            write = fout.write
+            if hasher is not None:
+                def write(data: bytes) -> None:
+                    fout.write(data)
+                    hasher.update(data)
+
+            write(bytes(iv_bytes))  # Prepend nonce (IV)
+
+            # Reusable buffers (no bytes objects allocated per chunk); reads and writes overlap the cipher
+            stream_cipher(fin, write, encryptor.update_into, chunk_size=chunk_size, pipelined=pipelined)
+            write(encryptor.finalize())
+            write(encryptor.tag)  # Append GCM tag
 
-        # Move to final location
-        Path(tmp_file.name).replace(out_path)
-        return True, str(out_path), None
+        return True, tmp_file.name, None
 
     except Exception:
         if tmp_file is not None:
@@ -179,26 +143,3 @@ def encrypt_file_aes256gcm(
                 pass
         return False, None, ERROR_OS_ACCESS_DENIED
 
-    finally:
-        # Securely zero out key and IV
-        if isinstance(key_bytes, (bytes, bytearray)):
-            for i in range(len(key_bytes)):
-                key_bytes = bytearray(key_bytes)
-                key_bytes[i] = 0
-        if isinstance(iv_bytes, (bytes, bytearray)):
-            for i in range(len(iv_bytes)):
-                iv_bytes = bytearray(iv_bytes)
-                iv_bytes[i] = 0
-
-
-def derive_aes256_key_from_string(input_key: str) -> bytes:
-    """
-    Derive a 32-byte AES-256 key from an arbitrary-length string using SHA-256.
-
-    Args:
-        input_key: str -- original 44-character string
-
-    Returns:
-        bytes -- 32-byte AES key
-    """
-    return hashlib.sha256(input_key.encode('utf-8')).digest()
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""
+File: /redaqt/modules/lib/fingerprint_cache.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: SHA-512 fingerprint cache keyed by file identity (SQLite under data/ plus an in-process LRU)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from stat import S_ISREG
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from redaqt.modules.lib.hash_sha_library import hash_file_sha512
+
+FINGERPRINT_DB = Path("data") / "fingerprints.db"
+LRU_SIZE = 4096
+HASH_CHUNK_SIZE = 1024 * 1024
+LOOKUP_BATCH = 200                  # identities per query (4 parameters each, below SQLite's 999 limit)
+
+KIND_FILE = "file"                  # hash_file_sha512 of the whole file
+KIND_PDO_PAYLOAD = "pdo_payload"    # SHA-512 of the encrypted attachment of a PDO (see verify_pdo)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    st_dev    INTEGER NOT NULL,
+    st_ino    INTEGER NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    kind      TEXT NOT NULL,
+    digest    TEXT NOT NULL,
+    path      TEXT NOT NULL,
+    last_used INTEGER NOT NULL,
+    hashed_at INTEGER NOT NULL,
+    PRIMARY KEY (st_dev, st_ino, size, mtime_ns, kind)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fingerprints_last_used ON fingerprints (last_used);
+"""
+
+UPSERT_FINGERPRINT = """
+INSERT INTO fingerprints (st_dev, st_ino, size, mtime_ns, kind, digest, path, last_used, hashed_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (st_dev, st_ino, size, mtime_ns, kind) DO UPDATE SET
+    digest = excluded.digest, path = excluded.path, last_used = excluded.last_used, hashed_at = excluded.hashed_at
+"""
+
+Identity = Tuple[int, int, int, int]
+
+
+class FingerprintCache:
+    """
+    SHA-512 fingerprints of unchanged files, without reading them again.
+
+    A fingerprint is stored under the file's (st_dev, st_ino, st_size, st_mtime_ns) and a kind (the whole
+    file, or e.g. the encrypted payload of a PDO); any write to the file changes its size or mtime and
+    therefore misses the cache.  Lookups go to an in-process LRU first and then to SQLite; bulk lookups
+    query SQLite in batches.  A fingerprint is only stored if the file did not change while it was hashed.
+
+    The identity only changes when the file is written through the file system: media corruption (bit rot)
+    keeps size and mtime, so a cached fingerprint says what the file held when it was hashed, not what it
+    holds now.  Use it to skip hashing files that were not modified, not to detect corruption; with max_age
+    a fingerprint older than that is a miss and the file is hashed again.
+
+    The cache is shared by threads (one connection behind a lock, hashing happens outside of it).
+
+    Usage:
+        with FingerprintCache() as cache:
+            digest = cache.fingerprint(file_path)
+            digests = cache.fingerprint_many(file_paths)
+    """
+
+    def __init__(self, db_path: Optional[Path] = FINGERPRINT_DB, lru_size: int = LRU_SIZE,
+                 max_age: Optional[float] = None):
+        self.lru_size = lru_size
+        self.max_age = max_age              # seconds a fingerprint is trusted after hashing, None for no limit
+        self._lru: "OrderedDict[Tuple[Identity, str], Tuple[str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.conn = None
+        if db_path is not None:             # None keeps the cache in memory only
+            db_path = Path(db_path)
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "FingerprintCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    # --- lookups ---
+    def lookup(self, file_path: Union[str, Path], kind: str = KIND_FILE) -> Optional[str]:
+        """ Stored fingerprint of the file as it is now, None on a miss (the file is never read) """
+        identity = _identity(file_path)
+        if identity is None:
+            return None
+        return self._lookup_identities([identity], kind).get(identity)
+
+    def lookup_many(self, file_paths: Iterable[Union[str, Path]], kind: str = KIND_FILE) -> Dict[str, str]:
+        """ Stored fingerprints of many files, {path: digest} for the hits only """
+        identities = {}
+        for file_path in file_paths:
+            identity = _identity(file_path)
+            if identity is not None:
+                identities[str(file_path)] = identity
+
+        found = self._lookup_identities(list(set(identities.values())), kind)
+        return {path: found[identity] for path, identity in identities.items() if identity in found}
+
+    # --- lookup or compute ---
+    def fingerprint(self, file_path: Union[str, Path], kind: str = KIND_FILE,
+                    compute: Optional[Callable[[], Optional[str]]] = None) -> Optional[str]:
+        """ Fingerprint of the file, hashed (and stored) only on a miss
+
+            Args:
+                file_path: str -- file to fingerprint
+                kind: str -- what the fingerprint covers (KIND_FILE, KIND_PDO_PAYLOAD, ...)
+                compute: callable -- returns the digest on a miss (defaults to hash_file_sha512 of the file)
+
+            Returns:
+                digest: str -- SHA-512 hex digest, None if the file could not be read
+        """
+        identity = _identity(file_path)
+        if identity is None:
+            return None
+
+        digest = self._lookup_identities([identity], kind).get(identity)
+        if digest is not None:
+            return digest
+
+        digest = compute() if compute is not None else hash_file_sha512(file_path, HASH_CHUNK_SIZE)
+        if digest is not None and _identity(file_path) == identity:
+            self._store([(identity, kind, digest, str(file_path))])
+        return digest
+
+    def fingerprint_many(self, file_paths: Iterable[Union[str, Path]],
+                         kind: str = KIND_FILE) -> Dict[str, Optional[str]]:
+        """ hash_file_sha512 of many files, {path: digest}; only the misses are read """
+        file_paths = [str(file_path) for file_path in file_paths]
+        digests: Dict[str, Optional[str]] = dict.fromkeys(file_paths)
+        digests.update(self.lookup_many(file_paths, kind))
+
+        computed = []
+        for file_path in file_paths:
+            if digests[file_path] is not None:
+                continue
+            identity = _identity(file_path)
+            digest = hash_file_sha512(file_path, HASH_CHUNK_SIZE) if identity is not None else None
+            digests[file_path] = digest
+            if digest is not None and _identity(file_path) == identity:
+                computed.append((identity, kind, digest, file_path))
+
+        self._store(computed)
+        return digests
+
+    # --- maintenance ---
+    def prune(self, max_entries: int) -> int:
+        """ Keep the max_entries most recently used fingerprints; returns the number removed """
+        with self._lock:
+            if self.conn is None:
+                return 0
+            with self.conn:
+                return self.conn.execute(
+                    "DELETE FROM fingerprints WHERE (st_dev, st_ino, size, mtime_ns, kind) IN ("
+                    "SELECT st_dev, st_ino, size, mtime_ns, kind FROM fingerprints "
+                    "ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (max_entries,)).rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            if self.conn is not None:
+                with self.conn:
+                    self.conn.execute("DELETE FROM fingerprints")
+
+    def _lookup_identities(self, identities: List[Identity], kind: str) -> Dict[Identity, str]:
+        found: Dict[Identity, str] = {}
+        now = time.time_ns()
+        oldest = now - int(self.max_age * 1e9) if self.max_age is not None else 0
+        with self._lock:
+            missing = []
+            for identity in identities:
+                entry = self._lru.get((identity, kind))
+                if entry is None or entry[1] < oldest:
+                    missing.append(identity)
+                else:
+                    self._lru.move_to_end((identity, kind))
+                    found[identity] = entry[0]
+
+            if not missing or self.conn is None:
+                return found
+
+            hits = []
+            for start in range(0, len(missing), LOOKUP_BATCH):
+                batch = missing[start:start + LOOKUP_BATCH]
+                values = ", ".join(["(?, ?, ?, ?)"] * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT st_dev, st_ino, size, mtime_ns, digest, hashed_at FROM fingerprints "
+                    f"WHERE kind = ? AND hashed_at >= ? AND (st_dev, st_ino, size, mtime_ns) IN (VALUES {values})",
+                    [kind, oldest] + [value for identity in batch for value in identity])
+                for st_dev, st_ino, size, mtime_ns, digest, hashed_at in rows:
+                    identity = (st_dev, st_ino, size, mtime_ns)
+                    found[identity] = digest
+                    self._remember(identity, kind, digest, hashed_at)
+                    hits.append((now, st_dev, st_ino, size, mtime_ns, kind))
+
+            if hits:
+                with self.conn:
+                    self.conn.executemany(
+                        "UPDATE fingerprints SET last_used = ? "
+                        "WHERE st_dev = ? AND st_ino = ? AND size = ? AND mtime_ns = ? AND kind = ?", hits)
+        return found
+
+    def _store(self, entries: List[Tuple[Identity, str, str, str]]) -> None:
+        """ Store (identity, kind, digest, path) entries in the LRU and in one SQLite transaction """
+        if not entries:
+            return
+        now = time.time_ns()
+        with self._lock:
+            for identity, kind, digest, file_path in entries:
+                self._remember(identity, kind, digest, now)
+            if self.conn is not None:
+                with self.conn:
+                    self.conn.executemany(UPSERT_FINGERPRINT, [
+                        (*identity, kind, digest, os.path.abspath(file_path), now, now)
+                        for identity, kind, digest, file_path in entries])
+
+    def _remember(self, identity: Identity, kind: str, digest: str, hashed_at: int) -> None:
+        """ Add to the LRU (caller holds the lock) """
+        self._lru[(identity, kind)] = (digest, hashed_at)
+        self._lru.move_to_end((identity, kind))
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+
+def _identity(file_path: Union[str, Path]) -> Optional[Identity]:
+    """ (st_dev, st_ino, st_size, st_mtime_ns) of a regular file, None if it cannot be read """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    if not S_ISREG(stat.st_mode):
+        return None
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
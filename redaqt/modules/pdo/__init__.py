@@ -7,8 +7,27 @@ Description: pdo generator init
 
 __all__ = ["protected_document_maker",
            "access_document",
-           "extract_attachments_from_pdo"]
+           "open_document_reader",
+           "extract_attachments_from_pdo",
+           "locate_attachment_streams",
+           "PDOBuilder",
+           "ProtectedDocument",
+           "open_protected_document",
+           "read_pdo_metadata",
+           "BatchProtectionEngine",
+           "ProtectionJob",
+           "ProtectionResult",
+           "BatchAccessEngine",
+           "AccessResult",
+           "verify_pdo",
+           "verify_archive"]
 
+from .pdo_builder import PDOBuilder
+from .protected_document import ProtectedDocument, open_protected_document
+from .pdo_metadata import read_pdo_metadata
 from .make_pdo import protected_document_maker
-from .access_pdo import access_document
-from .extract_pd_attachment import extract_attachments_from_pdo
+from .access_pdo import access_document, open_document_reader
+from .extract_pd_attachment import extract_attachments_from_pdo, locate_attachment_streams
+from .batch_protect import BatchProtectionEngine, ProtectionJob, ProtectionResult
+from .batch_access import BatchAccessEngine, AccessResult
+from .verify_pdo import verify_pdo, verify_archive
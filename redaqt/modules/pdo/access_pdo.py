@@ -10,19 +10,25 @@ Date: July 2025
 Description: Access the PDO
 """
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
-from PIL import Image
+from typing import List, Optional, Tuple
 
 import numpy as np
-from pypdf import PdfReader
 
 from redaqt.modules.lib.file_check import validate_file_exists, append_filename_for_no_overwrite
 from redaqt.modules.api_request.call_for_decrypt import request_key
-from redaqt.modules.pdo.extract_pd_attachment import extract_attachments_from_pdo
-from redaqt.modules.lib.decrypt_aes256gcm import decrypt_file_aes256gcm
+from redaqt.modules.pdo.protected_document import ProtectedDocument, open_protected_document
+from redaqt.modules.pdo.extract_pd_attachment import AttachmentStream
+from redaqt.modules.lib.crypto_session import CryptoSession
+from redaqt.modules.lib.decrypt_aes256gcm import decrypt_stream_aes256gcm
+from redaqt.modules.lib.aes256gcm_segmented import (decrypt_stream_aes256gcm_segmented,
+                                                    SegmentedPayloadReader,
+                                                    PAYLOAD_FORMAT_LEGACY,
+                                                    PAYLOAD_FORMAT_SEGMENTED)
+from redaqt.modules.lib.compression import COMPRESSION_NONE
 from redaqt.modules.lib.b64_encoder_decoder import  decode_base64_into_dict
-from redaqt.modules.certs.encoder_image import extract_certificate
+from redaqt.modules.certs.encoder_image import read_certificate
 
 ERROR_FILE_NOT_FOUND = "File does not exist"
 ERROR_PERMISSION = "Permission denied"
@@ -30,6 +36,9 @@ ERROR_OS_ACCESS_DENIED = f"OS error writing file to system"
 ERROR_UNEXPECTED = "Unexpected error was encountered"
 ERROR_PROTECTED_DOCUMENT = f"Could not read data from protected document"
 ERROR_NO_CRYPTO_KEY = "No Crypto key was returned by the service"
+ERROR_PAYLOAD_FORMAT = "Protected document uses an unsupported payload format"
+ERROR_NO_RANDOM_ACCESS = "Protected document does not support random access (payload format 2 required)"
+ERROR_NO_ATTACHMENT = "File does not contain protected file information"
 
 
 def access_document(user_data, file_path: str) -> \
@@ -49,189 +58,259 @@ def access_document(user_data, file_path: str) -> \
             save_to_filename: Path -- path to the decrypted file
     """
 
-    davinci_certificate: dict = {}
-
     # Validate the PDO file exists, else return an error and error message
     success, error_msg = validate_file_exists(file_path)
     if not success:
         return False, error_msg, None, None, None
 
-    # Extract the metadata from the PDO to process request
-    success, error_msg, metadata = get_pdo_metadata(file_path)
+    # Parse the PDO once, every step below shares the same handle
+    success, error_msg, document = open_protected_document(file_path)
     if not success:
         return False, error_msg, None, None, None
 
+    with document:
+        # Local work: metadata, DaVinci certificate and attachment locations
+        success, error_msg, context = prepare_access(document)
+        if not success:
+            return False, error_msg, None, None, None
+
+        # Process request to Efemeral to generate encryption key
+        success, error_msg, key_str = request_crypto_key(user_data, context.metadata)
+        if not success:
+            return False, error_msg, None, None, None
+
+        success, error_msg, save_to_filename = decrypt_attachments(document, context, key_str)
+        if not success:
+            return False, error_msg, None, None, None
+
+    return True, None, context.davinci_certificate, context.davinci_certificate_image, save_to_filename
+
+
+@dataclass
+class AccessContext:
+    """ Everything read locally from a PDO that is needed to request its key and decrypt it """
+    metadata: dict
+    davinci_certificate: dict
+    davinci_certificate_image: Optional[np.ndarray]
+    attachments: List[AttachmentStream]
+
+
+def prepare_access(document: ProtectedDocument) -> Tuple[bool, Optional[str], Optional[AccessContext]]:
+    """ First (local) stage of accessing a PDO: metadata, DaVinci certificate and attachment locations
+
+        Args:
+            document: ProtectedDocument -- open PDO
+
+        Returns:
+            success: bool -- False (an error was encountered) or True (no error encountered)
+            error_msg: str | None -- error message or pass None if no error encountered
+            context: AccessContext -- input of request_crypto_key and decrypt_attachments
+    """
+
+    davinci_certificate: dict = {}
+
+    # Extract the metadata from the PDO to process request
+    success, error_msg, metadata = document.get_metadata()
+    if not success:
+        return False, error_msg, None
+
     # Get the Davinci Cert from file
-    success, davinci_certificate_image = extract_image_from_pdf(file_path)
+    success, davinci_certificate_image = document.get_certificate_image()
 
     if not success:
         # davinci_certificate stored as string in metadata
         davinci_certificate_str = metadata["davinci_certificate"]
+        if davinci_certificate_str is not None:
+            davinci_certificate = decode_base64_into_dict(davinci_certificate_str)
 
     else:
-        # Process davinci_certificate_image to extract certificate
-        certificate = extract_certificate(davinci_certificate_image)
-        davinci_certificate_str = extract_cert_payload(certificate)
-
-    if davinci_certificate_str is not None:
-        davinci_certificate = decode_base64_into_dict(davinci_certificate_str)
+        # Process davinci_certificate_image to extract certificate (tagged or binary payload)
+        davinci_certificate = read_certificate(davinci_certificate_image)
 
-    # Process request to Efemeral to generate encryption key
-    success, error_msg, receive_json = request_key(user_data, metadata)
-    print(f"[DEBUG access_pdo] Success:{success}    Error Message: {error_msg}\nReceive JSON: {receive_json}")
+    success, error_msg, attachments = document.get_attachments()
     if not success:
-        return False, error_msg, None, None, None
-    else:
-        # Validate that an encryption key was returned, else, return an error
-        key_str = getattr(receive_json['data'], 'crypto_key', None)
-        if not key_str:
-            return False, ERROR_NO_CRYPTO_KEY, None, None, None
+        return False, error_msg, None
 
-    success, error_msg, temp_filenames = extract_attachments_from_pdo(file_path)
-    if not success:
-        return False, error_msg, None, None, None
+    return True, None, AccessContext(metadata=metadata,
+                                     davinci_certificate=davinci_certificate,
+                                     davinci_certificate_image=davinci_certificate_image,
+                                     attachments=attachments)
 
-    # Decrypt each extracted file
-    for temp_file in temp_filenames:
-        # Create a new non-colliding output filename
-        save_to_filename: Path = append_filename_for_no_overwrite(file_path)
 
-        # Perform decryption
-        success, output_path, decrypt_error = decrypt_file_aes256gcm(key_str, temp_file, save_to_filename)
-        if not success:
-            return False, f"Decryption failed: {decrypt_error}", None, None, None
+def request_crypto_key(user_data, metadata: dict) -> Tuple[bool, Optional[str], Optional[str]]:
+    """ Second (network) stage of accessing a PDO: request the crypto key from Efemeral
 
-        # === Clean up the encrypted temporary file ===
-        cleanup_temp_file(Path(temp_file))
+        Args:
+            user_data: class -- system and user data
+            metadata: dict -- metadata stored in the PDO document
 
-    return True, None, davinci_certificate, davinci_certificate_image, save_to_filename
+        Returns:
+            success: bool -- False (an error was encountered) or True (no error encountered)
+            error_msg: str | None -- error message or pass None if no error encountered
+            key_str: str -- crypto key
+    """
+    success, error_msg, receive_json = request_key(user_data, metadata)
+    if not success:
+        return False, error_msg, None
 
+    # Validate that an encryption key was returned, else, return an error
+    key_str = getattr(receive_json['data'], 'crypto_key', None)
+    if not key_str:
+        return False, ERROR_NO_CRYPTO_KEY, None
+
+    return True, None, key_str
 
-def get_pdo_metadata(file_path: str) -> tuple[bool, Optional[str], Optional[dict]]:
-    """ Get the metadata embed into the PDO and put into a dictionary
+
+def decrypt_attachments(document: ProtectedDocument, context: AccessContext, key_str: str) -> \
+        Tuple[bool, Optional[str], Optional[Path]]:
+    """ Last (local) stage of accessing a PDO: decrypt the embedded files next to the PDO
 
         Args:
-            file_path: str -- location of filename, directory
+            document: ProtectedDocument -- open PDO
+            context: AccessContext -- result of prepare_access
+            key_str: str -- crypto key
 
         Returns:
             success: bool -- False (an error was encountered) or True (no error encountered)
             error_msg: str | None -- error message or pass None if no error encountered
-            metadata: dict -- metadata stored in the PDO document
+            save_to_filename: Path -- path to the decrypted file
     """
+    metadata = context.metadata
+    save_to_filename: Optional[Path] = None
+
+    # One key derivation for every embedded file, zeroed when the session closes
+    with CryptoSession(key_str) as session:
+        # Decrypt each embedded file straight from its stream in the PDO (no intermediate ciphertext file)
+        for attachment in context.attachments:
+            # Create a new non-colliding output filename
+            save_to_filename = append_filename_for_no_overwrite(document.file_path)
+
+            # Perform decryption (PDOs without a payload format predate the segmented format)
+            payload_format = metadata.get("payload_format", PAYLOAD_FORMAT_LEGACY)
+            if payload_format == PAYLOAD_FORMAT_SEGMENTED:
+                compression = metadata.get("compression", COMPRESSION_NONE)
+                success, output_path, decrypt_error = decrypt_stream_aes256gcm_segmented(session,
+                                                                                         document.file,
+                                                                                         attachment.offset,
+                                                                                         attachment.length,
+                                                                                         save_to_filename,
+                                                                                         compression=compression)
+            elif payload_format == PAYLOAD_FORMAT_LEGACY:
+                success, output_path, decrypt_error = decrypt_stream_aes256gcm(session,
+                                                                               document.file,
+                                                                               attachment.offset,
+                                                                               attachment.length,
+                                                                               save_to_filename)
+            else:
+                return False, ERROR_PAYLOAD_FORMAT, None
 
-    filename = Path(f"{file_path}")
+            if not success:
+                return False, f"Decryption failed: {decrypt_error}", None
 
-    # Open the Protected Data Object
-    try:
-        reader = PdfReader(filename)
+    return True, None, save_to_filename
 
-    except FileNotFoundError:
-        return False, ERROR_FILE_NOT_FOUND, None
-    except PermissionError:
-        return False, ERROR_PERMISSION, None
-    except OSError:
-        return False, ERROR_OS_ACCESS_DENIED, None
-    except Exception(BaseException):
-        return False, ERROR_UNEXPECTED, None
 
-    metadata_reader = reader.metadata
-    metadata: dict[str, str] = {}
+def open_document_reader(user_data, file_path: str) -> \
+        Tuple[bool, Optional[str], Optional[SegmentedPayloadReader]]:
+    """ Open a seekable plaintext view of the protected file without decrypting it to disk
+        Only the segments covering the bytes that are read are decrypted, straight from the PDO file.
 
-    if metadata_reader:  # Ensure metadata_reader is not None
+        Args:
+            user_data: class -- system and user data
+            file_path: str -- file path + filename of the PDO
 
-        for key, value in metadata_reader.items():
-            clean_key = key[1:].lower() if key.startswith('/') else key.lower()
-            metadata.update({clean_key: str(value)})  # Ensure value is a string
+        Returns:
+            success: bool -- False (an error was encountered) or True (no error encountered)
+            error_msg: str | None -- error message or pass None if no error encountered
+            reader: SegmentedPayloadReader -- file-like reader of the plaintext, the caller must close it
+    """
 
-        return True, None, metadata
+    success, error_msg = validate_file_exists(file_path)
+    if not success:
+        return False, error_msg, None
 
-    else:
-        return False, ERROR_PROTECTED_DOCUMENT, None
+    success, error_msg, document = open_protected_document(file_path)
+    if not success:
+        return False, error_msg, None
 
+    with document:
+        success, error_msg, metadata = document.get_metadata()
+        if not success:
+            return False, error_msg, None
 
+        if metadata.get("payload_format", PAYLOAD_FORMAT_LEGACY) != PAYLOAD_FORMAT_SEGMENTED:
+            return False, ERROR_NO_RANDOM_ACCESS, None
 
-def extract_image_from_pdf(pdf_path: str) -> Tuple[bool, Optional[np.ndarray]]:
-    """
-    Extracts the first embedded image from a PDF using pypdf.
+        success, error_msg, attachments = document.get_attachments()
+        if not success:
+            return False, error_msg, None
+        if not attachments:
+            return False, ERROR_NO_ATTACHMENT, None
 
-    Args:
-        pdf_path (str): Path to the PDF file.
+        compression = metadata.get("compression", COMPRESSION_NONE)
 
-    Returns:
-        Tuple[bool, Optional[np.ndarray]]: Success flag and image array.
-    """
-    try:
-        reader = PdfReader(pdf_path)
-        page = reader.pages[0]
-
-        xobjects = page.get("/Resources", {}).get("/XObject", {})
-        for name, obj_ref in xobjects.items():
-            xobj = obj_ref.get_object()
-            if xobj.get("/Subtype") != "/Image":
-                continue
-
-            width = xobj["/Width"]
-            height = xobj["/Height"]
-            color_space = xobj["/ColorSpace"]
-            bits_per_component = xobj.get("/BitsPerComponent", 8)
-
-            data = xobj.get_data()  # Decompressed binary stream
-
-            # Handle grayscale or RGB
-            if color_space == "/DeviceRGB":
-                mode = "RGB"
-                img = Image.frombytes(mode, (width, height), data)
-            elif color_space == "/DeviceGray":
-                mode = "L"
-                img = Image.frombytes(mode, (width, height), data)
-            else:
-                print(f"[WARN] Unsupported color space: {color_space}")
-                continue
+    # Process request to Efemeral to generate encryption key
+    success, error_msg, receive_json = request_key(user_data, metadata)
+    if not success:
+        return False, error_msg, None
 
-            return True, np.array(img)
+    key_str = getattr(receive_json['data'], 'crypto_key', None)
+    if not key_str:
+        return False, ERROR_NO_CRYPTO_KEY, None
 
-        print("[DEBUG] No valid image extracted.")
-        return False, None
+    attachment = attachments[0]
+    pdo_file = None
+    try:
+        pdo_file = open(file_path, "rb")
+        reader = SegmentedPayloadReader(key_str, pdo_file, attachment.offset, attachment.length,
+                                        close_fileobj=True, compression=compression)
+    except ValueError:
+        if pdo_file is not None:
+            pdo_file.close()
+        return False, ERROR_PAYLOAD_FORMAT, None
+    except OSError:
+        if pdo_file is not None:
+            pdo_file.close()
+        return False, ERROR_OS_ACCESS_DENIED, None
 
-    except Exception as e:
-        print(f"[ERROR] extract_image_from_pdf: {e}")
-        return False, None
+    return True, None, reader
 
 
-def extract_cert_payload(certificate: str) -> str:
-    """
-    Extracts the base64-encoded certificate payload from the string between <CERT> and </CERT>.
+def get_pdo_metadata(file_path: str) -> tuple[bool, Optional[str], Optional[dict]]:
+    """ Get the metadata embed into the PDO and put into a dictionary
 
-    Args:
-        certificate: str -- full certificate string with <CERT> block
+        Args:
+            file_path: str -- location of filename, directory
 
-    Returns:
-        str -- extracted certificate payload or empty string if not found
+        Returns:
+            success: bool -- False (an error was encountered) or True (no error encountered)
+            error_msg: str | None -- error message or pass None if no error encountered
+            metadata: dict -- metadata stored in the PDO document
     """
-    start_tag = "<CERT>"
-    end_tag = "</CERT>"
-
-    start_index = certificate.find(start_tag)
-    end_index = certificate.find(end_tag)
 
-    if start_index == -1 or end_index == -1 or end_index <= start_index:
-        return ""
-
-    # Move past the <CERT> tag
-    start_index += len(start_tag)
+    success, error_msg, document = open_protected_document(file_path)
+    if not success:
+        return False, error_msg, None
 
-    return certificate[start_index:end_index].strip()
+    with document:
+        return document.get_metadata()
 
 
-def cleanup_temp_file(temp_path: Path) -> None:
+def extract_image_from_pdf(pdf_path: str) -> Tuple[bool, Optional[np.ndarray]]:
     """
-    Safely delete a temporary file if it exists.
+    Extracts the first embedded image from a PDF using pypdf.
 
     Args:
-        temp_path: Path to the temporary file to remove
+        pdf_path (str): Path to the PDF file.
+
+    Returns:
+        Tuple[bool, Optional[np.ndarray]]: Success flag and image array.
     """
-    try:
-        if temp_path.exists():
-            temp_path.unlink()
-    except Exception:
-        pass
\ No newline at end of file
+    success, error_msg, document = open_protected_document(pdf_path)
+    if not success:
+        print(f"[ERROR] extract_image_from_pdf: {error_msg}")
+        return False, None
+
+    with document:
+        return document.get_certificate_image()
+
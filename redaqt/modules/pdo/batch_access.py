@@ -0,0 +1,234 @@
+"""
+File: /redaqt/modules/pdo/batch_access.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Batch access engine, overlaps the key request of one PDO with the local work of the next
+"""
+
+import time
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from redaqt.modules.lib.file_check import validate_file_exists
+from redaqt.modules.pdo.protected_document import ProtectedDocument, open_protected_document
+from redaqt.modules.pdo.access_pdo import (AccessContext, prepare_access, request_crypto_key,
+                                           decrypt_attachments)
+
+ERROR_UNEXPECTED = "Unexpected error was encountered"
+
+LOCAL_WORKERS = 2
+KEY_REQUEST_WORKERS = 4
+
+STAGE_PREPARE = "prepare"
+STAGE_KEY = "key"
+STAGE_DECRYPT = "decrypt"
+
+
+@dataclass
+class AccessResult:
+    """ Outcome of accessing one PDO """
+    file_path: str
+    success: bool
+    error_msg: Optional[str] = None
+    davinci_certificate: Optional[dict] = None
+    davinci_certificate_image: Optional[np.ndarray] = None
+    output_path: Optional[Path] = None
+    payload_bytes: int = 0          # encrypted bytes read from the PDO
+    key_request_time: float = 0.0   # seconds spent waiting on the key service
+    elapsed: float = 0.0            # seconds from the start of the first stage to the end of the last
+
+
+@dataclass
+class BatchAccessSummary:
+    """ Running totals of a batch, updated as each result arrives """
+    total: int
+    completed: int = 0
+    failed: int = 0
+    payload_bytes: int = 0
+    elapsed: float = 0.0
+    failures: List[AccessResult] = field(default_factory=list)
+
+    @property
+    def files_per_second(self) -> float:
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.payload_bytes / (1024 * 1024) / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class _AccessJob:
+    """ One PDO moving through the pipeline, its document stays open from the first stage to the last """
+    file_path: str
+    started: float
+    document: Optional[ProtectedDocument] = None
+    context: Optional[AccessContext] = None
+    key_requested: float = 0.0
+    key_request_time: float = 0.0
+
+    def close(self) -> None:
+        if self.document is not None:
+            self.document.close()
+            self.document = None
+
+
+def _prepare_job(job: _AccessJob):
+    """ Local stage: open the PDO once and read its metadata, certificate and attachment locations """
+    success, error_msg = validate_file_exists(job.file_path)
+    if not success:
+        return False, error_msg, None
+
+    success, error_msg, document = open_protected_document(job.file_path)
+    if not success:
+        return False, error_msg, None
+    job.document = document
+
+    success, error_msg, context = prepare_access(document)
+    if not success:
+        return False, error_msg, None
+    job.context = context
+    return True, None, context
+
+
+class BatchAccessEngine:
+    """
+    Accesses many PDOs with the key requests overlapped with local work.
+
+    Every PDO goes through three stages: prepare (metadata, DaVinci certificate and attachment
+    locations), key (request to the key service) and decrypt.  The local stages run on a small
+    thread pool and the key requests on another, so while the key of one file is in flight the next
+    files are already being prepared and earlier ones decrypted.  At most max_in_flight PDOs are open
+    at any time.  Results are yielded in completion order.
+
+    Usage:
+        engine = BatchAccessEngine()
+        summary = engine.run(user_data, paths, on_result=...)
+        print(summary.files_per_second, summary.megabytes_per_second)
+    """
+
+    def __init__(self, max_workers: int = LOCAL_WORKERS, max_key_requests: int = KEY_REQUEST_WORKERS,
+                 max_in_flight: Optional[int] = None):
+        self.max_workers = max(1, max_workers)
+        self.max_key_requests = max(1, max_key_requests)
+        self.max_in_flight = max_in_flight or self.max_workers + self.max_key_requests
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        """ Stop yielding results; files that have not started are skipped """
+        self._cancelled = True
+
+    def iter_results(self, user_data, paths: List[str]) -> Iterator[AccessResult]:
+        """ Access the PDOs and yield each AccessResult as soon as its last stage completes
+
+            Args:
+                user_data: class -- system and user data
+                paths: list -- full paths of the PDOs to access
+        """
+        self._cancelled = False
+        pending = iter(paths)
+        futures = {}        # future -> (stage, job)
+        jobs = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as local, \
+                ThreadPoolExecutor(max_workers=self.max_key_requests) as network:
+
+            def start_next() -> None:
+                for file_path in pending:
+                    job = _AccessJob(file_path=str(file_path), started=time.perf_counter())
+                    jobs.append(job)
+                    futures[local.submit(_prepare_job, job)] = (STAGE_PREPARE, job)
+                    return
+
+            def finish(job: _AccessJob, success: bool, error_msg: Optional[str],
+                       output_path: Optional[Path] = None) -> AccessResult:
+                job.close()
+                jobs.remove(job)
+                context = job.context
+                result = AccessResult(file_path=job.file_path, success=success, error_msg=error_msg,
+                                      key_request_time=job.key_request_time,
+                                      elapsed=time.perf_counter() - job.started)
+                if success:
+                    result.davinci_certificate = context.davinci_certificate
+                    result.davinci_certificate_image = context.davinci_certificate_image
+                    result.output_path = output_path
+                    result.payload_bytes = sum(attachment.length for attachment in context.attachments)
+                start_next()
+                return result
+
+            for _ in range(self.max_in_flight):
+                start_next()
+
+            try:
+                while futures and not self._cancelled:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        stage, job = futures.pop(future)
+                        try:
+                            success, error_msg, value = future.result()
+                        except Exception:
+                            success, error_msg, value = False, ERROR_UNEXPECTED, None
+
+                        if not success:
+                            yield finish(job, False, error_msg or ERROR_UNEXPECTED)
+
+                        elif stage == STAGE_PREPARE:
+                            job.key_requested = time.perf_counter()
+                            futures[network.submit(request_crypto_key, user_data, job.context.metadata)] = \
+                                (STAGE_KEY, job)
+
+                        elif stage == STAGE_KEY:
+                            job.key_request_time = time.perf_counter() - job.key_requested
+                            futures[local.submit(decrypt_attachments, job.document, job.context, value)] = \
+                                (STAGE_DECRYPT, job)
+
+                        else:
+                            yield finish(job, True, None, value)
+
+                        if self._cancelled:
+                            break
+            finally:
+                for future in futures:
+                    future.cancel()
+                # Wait for the stages already running before closing the documents they use
+                local.shutdown(wait=True)
+                network.shutdown(wait=True)
+                for job in jobs:
+                    job.close()
+
+    def run(self, user_data, paths: List[str], on_result=None) -> BatchAccessSummary:
+        """ Access the PDOs, calling on_result(result, summary) for each one
+
+            Args:
+                user_data: class -- system and user data
+                paths: list -- full paths of the PDOs to access
+                on_result: callable -- optional callback receiving each result and the running totals
+
+            Returns:
+                summary: BatchAccessSummary -- final totals, aggregate throughput and the failed results
+        """
+        summary = BatchAccessSummary(total=len(paths))
+        started = time.perf_counter()
+
+        for result in self.iter_results(user_data, paths):
+            summary.completed += 1
+            summary.payload_bytes += result.payload_bytes
+            summary.elapsed = time.perf_counter() - started
+            if not result.success:
+                summary.failed += 1
+                summary.failures.append(result)
+            if on_result is not None:
+                on_result(result, summary)
+
+        summary.elapsed = time.perf_counter() - started
+        return summary
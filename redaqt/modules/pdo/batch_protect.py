@@ -0,0 +1,208 @@
+"""
+File: /redaqt/modules/pdo/batch_protect.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Batch protection engine, distributes per-file PDO jobs across a process pool
+"""
+
+import os
+import copy
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Optional
+
+from redaqt.models.account import UserData
+from redaqt.modules.api_request.call_for_encrypt import request_key
+from redaqt.modules.pdo.make_pdo import protected_document_maker
+
+ERROR_UNEXPECTED = "Unexpected error was encountered"
+
+
+@dataclass
+class ProtectionJob:
+    """
+    Picklable description of one file to protect.
+
+    Everything a worker needs is carried explicitly, the worker never reaches for the
+    QApplication settings (there is no QApplication in a worker process).
+    """
+    file_data: dict                 # key, filename, filename_extension, file_path, date_protected
+    smart_policy_block: dict        # unencrypted smart policy block, owned by this job
+    user_data: dict                 # UserData.model_dump()
+    certificate_image_path: str
+    add_certificate: bool
+    certificate_format: str = "tagged"     # DaVinci certificate payload, "tagged" or "binary"
+
+
+@dataclass
+class ProtectionResult:
+    """ Outcome of one ProtectionJob """
+    file_data: dict
+    success: bool
+    error_msg: Optional[str] = None
+    pdo_path: Optional[str] = None
+
+
+@dataclass
+class BatchProgress:
+    """ Running totals of a batch, updated as each result arrives """
+    total: int
+    completed: int = 0
+    failed: int = 0
+    failures: List[ProtectionResult] = field(default_factory=list)
+
+
+def build_protection_jobs(paths: List[str], smart_policy_block: dict, user_data: UserData,
+                          certificate_image_path: str, add_certificate: bool,
+                          date_protected: str, certificate_format: str = "tagged") -> List[ProtectionJob]:
+    """ Build one ProtectionJob per file path
+
+        Args:
+            paths: list -- full paths of the files to protect
+            smart_policy_block: dict -- unencrypted smart policy block (copied for every job)
+            user_data: class -- system and user data
+            certificate_image_path: str -- certificate carrier image
+            add_certificate: bool -- request a DaVinci certificate from the service
+            date_protected: str -- protection timestamp shown in the recent files list
+            certificate_format: str -- DaVinci certificate payload embedded in the image, "tagged" or "binary"
+
+        Returns:
+            jobs: list -- ProtectionJob for every path
+    """
+    user_data_dict = user_data.model_dump()
+    jobs: List[ProtectionJob] = []
+
+    for full in paths:
+        dirpath, fname = os.path.split(full)
+        base, ext = os.path.splitext(fname)
+
+        file_data = {
+            "key": full,
+            "filename": base,
+            "filename_extension": ext.lstrip("."),
+            "file_path": dirpath + os.sep,
+            "date_protected": date_protected
+        }
+
+        jobs.append(ProtectionJob(file_data=file_data,
+                                  smart_policy_block=copy.deepcopy(smart_policy_block),
+                                  user_data=user_data_dict,
+                                  certificate_image_path=certificate_image_path,
+                                  add_certificate=add_certificate,
+                                  certificate_format=certificate_format))
+
+    return jobs
+
+
+def protect_file(job: ProtectionJob, encryption_workers: Optional[int] = None) -> ProtectionResult:
+    """ Request a crypto key and build the PDO for a single file (runs inside a worker process)
+
+        Args:
+            job: ProtectionJob -- file and settings to protect it with
+            encryption_workers: int -- encryption threads of this file (defaults to the CPU count)
+
+        Returns:
+            result: ProtectionResult -- success flag, error message and PDO path
+    """
+    try:
+        user_data = UserData(**job.user_data)
+
+        is_error, msg, incoming_encrypt = request_key(user_data, job.add_certificate)
+        if is_error or incoming_encrypt is None:
+            return ProtectionResult(file_data=job.file_data, success=False,
+                                    error_msg=msg or ERROR_UNEXPECTED)
+
+        success, error_msg = protected_document_maker(job.smart_policy_block,
+                                                      incoming_encrypt,
+                                                      job.file_data,
+                                                      user_data,
+                                                      job.certificate_image_path,
+                                                      certificate_format=job.certificate_format,
+                                                      max_workers=encryption_workers)
+        if not success:
+            return ProtectionResult(file_data=job.file_data, success=False, error_msg=error_msg)
+
+        pdo_path = f"{job.file_data['key']}.{user_data.product.extension}"
+        return ProtectionResult(file_data=job.file_data, success=True, pdo_path=pdo_path)
+
+    except Exception:
+        return ProtectionResult(file_data=job.file_data, success=False, error_msg=ERROR_UNEXPECTED)
+
+
+class BatchProtectionEngine:
+    """
+    Protects many files in parallel.
+
+    Jobs are distributed across a ProcessPoolExecutor and results are yielded in completion order,
+    so the caller can stream them to the UI.  A single job (or max_workers=1) runs in the calling
+    thread, avoiding the cost of starting worker processes.  Every process encrypts its file on
+    cpu_count // workers threads, so the pool never runs more encryption threads than there are CPUs.
+
+    Usage:
+        engine = BatchProtectionEngine()
+        for result in engine.iter_results(jobs):
+            ...
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        """ Stop yielding results; jobs that have not started are cancelled """
+        self._cancelled = True
+
+    def iter_results(self, jobs: List[ProtectionJob]) -> Iterator[ProtectionResult]:
+        """ Run the jobs and yield each ProtectionResult as soon as it completes """
+        self._cancelled = False
+        workers = min(self.max_workers, len(jobs))
+
+        if workers <= 1:
+            for job in jobs:
+                if self._cancelled:
+                    return
+                yield protect_file(job)
+            return
+
+        encryption_workers = max(1, (os.cpu_count() or 1) // workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(protect_file, job, encryption_workers): job for job in jobs}
+            try:
+                for future in as_completed(futures):
+                    if self._cancelled:
+                        break
+                    try:
+                        yield future.result()
+                    except Exception:
+                        yield ProtectionResult(file_data=futures[future].file_data, success=False,
+                                               error_msg=ERROR_UNEXPECTED)
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def run(self, jobs: List[ProtectionJob], on_result=None) -> BatchProgress:
+        """ Run the jobs to completion, calling on_result(result, progress) for each one
+
+            Args:
+                jobs: list -- ProtectionJob to run
+                on_result: callable -- optional callback receiving each result and the running totals
+
+            Returns:
+                progress: BatchProgress -- final totals and the failed results
+        """
+        progress = BatchProgress(total=len(jobs))
+
+        for result in self.iter_results(jobs):
+            progress.completed += 1
+            if not result.success:
+                progress.failed += 1
+                progress.failures.append(result)
+            if on_result is not None:
+                on_result(result, progress)
+
+        return progress
@@ -10,16 +10,32 @@ Date: July 2025
 Description: Extract the encrypted file data from the PDO file and saves to a system temporary directory
 """
 
+import re
+from dataclasses import dataclass
 from typing import Optional, Tuple, List
 from pathlib import Path
 from tempfile import gettempdir
 from pypdf import PdfReader
+from pypdf.generic import IndirectObject
 
 ERROR_FILE_NOT_FOUND = "File does not exist"
 ERROR_FILE_NO_DATA = "File does not contain protected file information"
 ERROR_PERMISSION = "Permission denied"
 ERROR_OS_ACCESS_DENIED = f"OS error writing file to system"
 ERROR_UNEXPECTED = "Unexpected error was encountered"
+ERROR_STREAM_NOT_RAW = "Protected file information is not stored as a raw stream"
+
+STREAM_HEADER_READ_SIZE = 4096
+STREAM_KEYWORD = re.compile(rb"\bstream(\r\n|\n)")
+STREAM_LENGTH = re.compile(rb"/Length\s+(\d+)(?:\s+(\d+)\s+R)?")
+
+
+@dataclass
+class AttachmentStream:
+    """ Location of an embedded file's raw data inside the PDO file """
+    name: str
+    offset: int     # file offset of the first data byte
+    length: int     # number of data bytes
 
 
 def extract_attachments_from_pdo(pdo_path: str) -> Tuple[bool, Optional[str], Optional[List[Path]]]:
@@ -108,3 +124,87 @@ def extract_attachments_from_pdo(pdo_path: str) -> Tuple[bool, Optional[str], Op
         return False, ERROR_UNEXPECTED, None
 
     return True, None, saved_files
+
+
+
+def locate_attachment_streams(pdo_path: str) -> Tuple[bool, Optional[str], Optional[List[AttachmentStream]]]:
+    """ Find the file offset and length of every embedded file's data without reading the data
+
+    The data of an unfiltered embedded-file stream is the encrypted payload byte for byte, so it can be
+    read (or randomly accessed) straight from the PDO file.
+
+    Args:
+        pdo_path: str -- filename of the protected data object (PDO)
+
+    Returns:
+        success: bool -- False if the attachments could not be located
+        error_msg: str -- If an error was encountered, error message
+        attachments: Array of [AttachmentStream] -- name, offset and length of every embedded file
+    """
+    pdo_file = Path(pdo_path)
+
+    if not pdo_file.exists():
+        return False, ERROR_FILE_NOT_FOUND, None
+
+    try:
+        with open(pdo_file, "rb") as file:
+            return read_attachment_streams(PdfReader(file), file)
+
+    except Exception:
+        return False, ERROR_UNEXPECTED, None
+
+
+def read_attachment_streams(reader: PdfReader, file) -> \
+        Tuple[bool, Optional[str], Optional[List[AttachmentStream]]]:
+    """ Locate the embedded file streams of an already parsed PDO (see locate_attachment_streams)
+
+    Args:
+        reader: PdfReader -- parsed PDO
+        file: binary file object the reader was opened on
+
+    Returns:
+        success: bool -- False if the attachments could not be located
+        error_msg: str -- If an error was encountered, error message
+        attachments: Array of [AttachmentStream] -- name, offset and length of every embedded file
+    """
+    attachments: List[AttachmentStream] = []
+
+    names = reader.trailer["/Root"].get("/Names")
+    embedded_files = names.get("/EmbeddedFiles") if names else None
+    names_array = embedded_files.get_object().get("/Names") if embedded_files else None
+    if not names_array:
+        return False, ERROR_FILE_NO_DATA, None
+
+    for i in range(0, len(names_array), 2):
+        ef_dict = names_array[i + 1].get_object()["/EF"]
+        stream_ref = ef_dict.raw_get("/F") if "/F" in ef_dict else ef_dict.raw_get("/UF")
+
+        # Only top-level objects have a file offset (not objects inside object streams)
+        if not isinstance(stream_ref, IndirectObject):
+            return False, ERROR_STREAM_NOT_RAW, None
+        object_offset = reader.xref.get(stream_ref.generation, {}).get(stream_ref.idnum)
+        if object_offset is None:
+            return False, ERROR_STREAM_NOT_RAW, None
+
+        # Parse the stream dictionary by hand; resolving the stream with pypdf would read its data
+        file.seek(object_offset)
+        stream_header = file.read(STREAM_HEADER_READ_SIZE)
+        keyword = STREAM_KEYWORD.search(stream_header)
+        if keyword is None or b"/Filter" in stream_header[:keyword.start()]:
+            return False, ERROR_STREAM_NOT_RAW, None
+
+        length = STREAM_LENGTH.search(stream_header, 0, keyword.start())
+        if length is None:
+            return False, ERROR_STREAM_NOT_RAW, None
+        if length.group(2) is None:
+            data_length = int(length.group(1))
+        else:
+            data_length = int(reader.get_object(IndirectObject(int(length.group(1)),
+                                                               int(length.group(2)),
+                                                               reader)))
+
+        attachments.append(AttachmentStream(name=str(names_array[i]),
+                                            offset=object_offset + keyword.end(),
+                                            length=data_length))
+
+    return True, None, attachments
@@ -14,36 +14,35 @@ import os
 import uuid
 import hashlib
 from typing import Optional, Tuple
-from pathlib import Path
-import io
 
 from redaqt.modules.lib.file_check import validate_file_exists
 from redaqt.modules.lib.generate_iv import generate_iv
-from redaqt.modules.lib.hash_sha_library import hash_sha512, hash_file_sha512
-from redaqt.modules.lib.encrypt_aes256gcm import encrypt_object_aes256gcm, encrypt_file_aes256gcm
+from redaqt.modules.lib.hash_sha_library import hash_sha512
+from redaqt.modules.lib.crypto_session import CryptoSession
+from redaqt.modules.lib.encrypt_aes256gcm import encrypt_object_aes256gcm
+from redaqt.modules.lib.aes256gcm_segmented import (encrypt_file_aes256gcm_segmented, payload_attachment_name,
+                                                     PAYLOAD_FORMAT_SEGMENTED)
+from redaqt.modules.lib.compression import select_compression, COMPRESSION_ZLIB
 from redaqt.modules.lib.b64_encoder_decoder import encode_dict_to_base64
-from redaqt.modules.certs.encoder_image import encoder_image
+from redaqt.modules.certs.encoder_image import encoder_image, CERTIFICATE_FORMAT_TAGGED, CERTIFICATE_FORMAT_BINARY
+from redaqt.modules.pdo.pdo_builder import PDOBuilder
 
 from PySide6.QtWidgets import QApplication
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-from pypdf import PdfReader, PdfWriter
-from PIL import Image
-import numpy as np
 
 ERROR_FILE_NOT_FOUND = "File does not exist"
 ERROR_PERMISSION = "Permission denied"
 ERROR_OS_ACCESS_DENIED = f"OS error writing file to system"
 ERROR_UNEXPECTED = "Unexpected error was encountered"
 
-CERTIFICATE = "certificate.png"
-
 
 def protected_document_maker(unencrypted_smart_policy_block: dict,
                              incoming_encrypt,
                              file_data: dict,
-                             user_data) -> tuple[bool, Optional[str]]:
+                             user_data,
+                             certificate_image_path: Optional[str] = None,
+                             compression: str = COMPRESSION_ZLIB,
+                             certificate_format: Optional[str] = None,
+                             max_workers: Optional[int] = None) -> tuple[bool, Optional[str]]:
 
     """ Set up the PDO generator
         *** Note; The Protected Document Object utilizes a PDF format.
@@ -53,6 +52,12 @@ def protected_document_maker(unencrypted_smart_policy_block: dict,
             incoming_encrypt: class -- incoming Efemeral metadata and crypto key
             file_data: dict -- file and data for protection
             user_data: class -- system and user data
+            certificate_image_path: str -- certificate carrier image, defaults to the application settings
+            compression: str -- compression applied before encryption ("none" to disable), skipped for files
+                                that are already compressed
+            certificate_format: str -- DaVinci certificate payload embedded in the image ("tagged" or
+                                       "binary"), defaults to the application settings
+            max_workers: int -- encryption threads (defaults to the CPU count)
 
         Returns:
             success: bool -- False (an error was encountered) or True (no error encountered)
@@ -68,12 +73,15 @@ def protected_document_maker(unencrypted_smart_policy_block: dict,
     if not success:
         return False, error_msg
 
-    # Create base Protected Data Object (PDO)
-    success, pdo_filename, error_msg = create_pdo_base(file_data, user_data)
+    # Build the Protected Data Object (PDO) filename
+    success, pdo_filename, error_msg = get_pdo_filename(file_data, user_data)
 
     if not success:
         return False, error_msg
 
+    # The PDO is assembled by the builder and written to disk once, after all parts are ready
+    pdo_builder = PDOBuilder(f"Protected by {user_data.product.name} {user_data.product.version}")
+
     # Generate initialization vector
     cipher = (f"{user_data.crypto_config.encryption_algorithm}"
               f"{user_data.crypto_config.encryption_key_length}"
@@ -82,10 +90,18 @@ def protected_document_maker(unencrypted_smart_policy_block: dict,
 
     certificate_encoded = encode_dict_to_base64(incoming_encrypt.data.certificate)
 
-    certificate_image_path = QApplication.instance().settings_model.certificate.location
+    if certificate_image_path is None:
+        certificate_image_path = QApplication.instance().settings_model.certificate.location
 
+    if certificate_format is None:
+        certificate_format = getattr(QApplication.instance().settings_model.certificate, "format",
+                                     CERTIFICATE_FORMAT_TAGGED)
 
-    success, davinci_certificate_image = encoder_image(certificate_encoded, certificate_image_path)
+    if certificate_format == CERTIFICATE_FORMAT_BINARY:
+        success, davinci_certificate_image = encoder_image(incoming_encrypt.data.certificate,
+                                                           certificate_image_path, CERTIFICATE_FORMAT_BINARY)
+    else:
+        success, davinci_certificate_image = encoder_image(certificate_encoded, certificate_image_path)
     if not success:
         unencrypted_smart_policy_block['certificate_fingerprint'] = hash_sha512(certificate_encoded)
     else:
@@ -99,60 +115,76 @@ def protected_document_maker(unencrypted_smart_policy_block: dict,
         'datetime': file_data['date_protected']
     }
 
-    # Encrypt the audit data to protect it from malicious modification
-    success, audit_cipher_text, error_msg = encrypt_object_aes256gcm(iv_bytes,
-                                                                     incoming_encrypt.data.crypto_key,
-                                                                     audit_data)
-    if not success:
-        return False, error_msg
-
-    # Update Audit Fingerprint in unencrypted smart policy block
-    unencrypted_smart_policy_block['audit_fingerprint'] = hash_sha512(audit_cipher_text)
-
-    # Encrypt the file/information and save it as a temporary file
-    success, encrypted_file_path, error_msg = encrypt_file_aes256gcm(iv_bytes,
-                                                                     incoming_encrypt.data.crypto_key,
-                                                                     file_data['key'])
-    if not success:
-        return False, error_msg
-
-    # Update PDO Fingerprint in unencrypted smart policy block
-    unencrypted_smart_policy_block['pdo_fingerprint'] = hash_file_sha512(encrypted_file_path)
-
-    # Encrypt the Smart Policy
-    success, encrypted_smart_policy, error_msg = encrypt_object_aes256gcm(iv_bytes,
-                                                                          incoming_encrypt.data.crypto_key,
-                                                                          unencrypted_smart_policy_block)
-    if not success:
-        return False, error_msg
+    # Derive the document key once for every object and file encrypted below; zeroed when the session closes
+    with CryptoSession(incoming_encrypt.data.crypto_key) as session:
+        # Encrypt the audit data to protect it from malicious modification
+        success, audit_cipher_text, error_msg = encrypt_object_aes256gcm(iv_bytes,
+                                                                         session,
+                                                                         audit_data)
+        if not success:
+            return False, error_msg
+
+        # Update Audit Fingerprint in unencrypted smart policy block
+        unencrypted_smart_policy_block['audit_fingerprint'] = hash_sha512(audit_cipher_text)
+
+        # Compress before encryption unless the file already looks compressed (JPEG, MP4, ZIP, ...)
+        try:
+            compression = select_compression(file_data['key'], compression)
+        except ValueError as e:
+            return False, str(e)
+
+        # Encrypt the file/information into the segmented payload format and save it as a temporary file,
+        # fingerprinting it as it is written
+        pdo_hasher = hashlib.sha512()
+        success, encrypted_file_path, error_msg = encrypt_file_aes256gcm_segmented(session,
+                                                                                   file_data['key'],
+                                                                                   pdo_hasher,
+                                                                                   max_workers=max_workers,
+                                                                                   compression=compression)
+        if not success:
+            return False, error_msg
+
+        # Update PDO Fingerprint in unencrypted smart policy block
+        unencrypted_smart_policy_block['pdo_fingerprint'] = pdo_hasher.hexdigest()
+
+        # Encrypt the Smart Policy
+        success, encrypted_smart_policy, error_msg = encrypt_object_aes256gcm(iv_bytes,
+                                                                              session,
+                                                                              unencrypted_smart_policy_block)
+        if not success:
+            return False, error_msg
 
    # Smart Policy fingerprint
     smart_policy_id_signature = hash_sha512(unencrypted_smart_policy_block['id'])
 
-    embed_davinci_certificate(pdo_filename, davinci_certificate_image)
-
-    # Write the metadata to the PDO
-    success, error_msg = write_metadata(pdo_filename,
-                             iv_b64,
-                             encrypted_smart_policy,
-                             smart_policy_id_signature,
-                             user_data,
-                             incoming_encrypt,
-                             certificate_encoded)
-
-    if not success:
-        return False, error_msg
-
+    # Collect the certificate overlay, metadata and encrypted data, then write the PDO
+    pdo_builder.set_certificate_image(davinci_certificate_image)
+    pdo_builder.set_metadata(build_metadata(iv_b64,
+                                            encrypted_smart_policy,
+                                            smart_policy_id_signature,
+                                            user_data,
+                                            incoming_encrypt,
+                                            certificate_encoded,
+                                            PAYLOAD_FORMAT_SEGMENTED,
+                                            compression,
+                                            file_data['date_protected'],
+                                            unencrypted_smart_policy_block['pdo_fingerprint'],
+                                            unencrypted_smart_policy_block['certificate_fingerprint']))
+    pdo_builder.set_attachment(encrypted_file_path, payload_attachment_name(file_data['key']))
+
+    success, error_msg = pdo_builder.build(pdo_filename)
 
-
-    # Complete the PDO and save the encrypted file data into the PDO
-    success, error_msg = complete_pdo(pdo_filename, encrypted_file_path)
+    # Clean up temp file (optional)
+    try:
+        os.remove(encrypted_file_path)
+    except Exception:
+        pass
 
     return success, error_msg
 
 
-def create_pdo_base(file_data, user_data) -> Tuple[bool, Optional[str], Optional[str]]:
-    """ Create the base Protected Data Object
+def get_pdo_filename(file_data, user_data) -> Tuple[bool, Optional[str], Optional[str]]:
+    """ Build the Protected Data Object filename and validate its directory can be written to
 
         Args:
             file_data: dict -- file and data for protection
@@ -160,90 +192,53 @@ def create_pdo_base(file_data, user_data) -> Tuple[bool, Optional[str], Optional
 
         Returns:
             success: bool -- False (an error was encountered) or True (no error encountered)
-            filename: str -- base PDO file name
+            filename: str -- PDO file name
             error_msg: str -- error message
 
     """
 
-    try:
-        product_string = f"Protected by {user_data.product.name} {user_data.product.version}"
-
-        # Build full filename path
-        output_dir = file_data['file_path']
-        if not os.path.isdir(output_dir):
-            return False, None, f"Directory does not exist: {output_dir}"
-        if not os.access(output_dir, os.W_OK):
-            return False, None, f"Directory is not writable: {output_dir}"
-
-        filename = os.path.join(
-            output_dir,
-            file_data['filename'] + '.' +
-            file_data['filename_extension'] + '.' +
-            user_data.product.extension
-        )
-
-        # Create PDF canvas
-        c = canvas.Canvas(str(filename), pagesize=letter)
-
-        font_name = "Helvetica"
-        font_size = 12
-        c.setFont(font_name, font_size)
-
-        width, height = letter
-        text_width = c.stringWidth(product_string, font_name, font_size)
-        text_height = font_size
+    # Build full filename path
+    output_dir = file_data['file_path']
+    if not os.path.isdir(output_dir):
+        return False, None, f"Directory does not exist: {output_dir}"
+    if not os.access(output_dir, os.W_OK):
+        return False, None, f"Directory is not writable: {output_dir}"
 
-        x_position = (width - text_width) / 2
-        y_position = (height - text_height) / 2
+    filename = os.path.join(
+        output_dir,
+        file_data['filename'] + '.' +
+        file_data['filename_extension'] + '.' +
+        user_data.product.extension
+    )
 
-        c.drawString(x_position, y_position, product_string)
+    return True, str(filename), None
 
-        c.save()
-        return True, str(filename), None
 
-    except PermissionError:
-        return False, None, ERROR_PERMISSION
-    except OSError:
-        return False, None, ERROR_OS_ACCESS_DENIED
-    except Exception(BaseException):
-        return False, None, ERROR_UNEXPECTED
-
-
-def write_metadata(filename: str, init_vector: str, encrypted_sp: str,
+def build_metadata(init_vector: str, encrypted_sp: str,
                    smart_policy_id_hash: str, user_data, incoming_encrypt,
-                   davinci_cert) -> Tuple[bool, Optional[str]]:
-    """ Build the metadata and embed into the PDO
+                   davinci_cert, payload_format: str, compression: str, date_protected: str,
+                   pdo_fingerprint: str, certificate_fingerprint: str) -> dict:
+    """ Build the metadata embedded into the PDO
 
         Args:
-            filename: str -- contents of request (filename, directory)
             init_vector: str -- initialization vector
             encrypted_sp: bytes -- encrypted smart policy
             smart_policy_id_hash: str -- SHA512 of the smart policy block id
             user_data: class -- user data settings
             incoming_encrypt: dict -- incoming encrypted data
             davinci_cert: str -- DaVinci certificate
+            payload_format: str -- version of the encrypted payload format
+            compression: str -- compression applied to the file before encryption
+            date_protected: str -- protection timestamp (YYYY-MM-DD HH:MM)
+            pdo_fingerprint: str -- SHA512 of the encrypted payload (embedded file), unkeyed
+            certificate_fingerprint: str -- SHA512 of the DaVinci certificate image (or certificate string), unkeyed
 
         Returns:
-            success: bool -- False (an error was encountered) or True (no error encountered)
-            error_msg: str -- error message
+            metadata: dict -- PDO /Info dictionary entries
 
     """
 
-    # Open the original PDF
-    try:
-        reader = PdfReader(filename)
-    except Exception(BaseException):
-        #handle_error(e, filename, 53, "Failed to read PDO")
-        return False, ERROR_PERMISSION
-
-    writer = PdfWriter()
-
-    # Add all pages to the writer
-    for page in reader.pages:
-        writer.add_page(page)
-
-    # Prepare metadata
-    metadata = {
+    return {
             "/Producer": "pypdf",
             "/Author": user_data.metadata.author,
             "/Copyright": user_data.metadata.copyright,
@@ -253,6 +248,11 @@ def write_metadata(filename: str, init_vector: str, encrypted_sp: str,
             "/Encryption_Key_Length": user_data.crypto_config.encryption_key_length,
             "/Encryption_Mode": user_data.crypto_config.encryption_mode,
             "/Hash_Algorithm": user_data.crypto_config.hash_algorithm,
+            "/Payload_Format": payload_format,
+            "/Compression": compression,
+            "/Date_Protected": date_protected,
+            "/PDO_Fingerprint": pdo_fingerprint,
+            "/Certificate_Fingerprint": certificate_fingerprint,
             "/MOS_Version": incoming_encrypt.data.mos_version,
             "/Protocol": incoming_encrypt.data.protocol,
             "/Protocol_Version": incoming_encrypt.data.protocol_version,
@@ -271,132 +271,6 @@ def write_metadata(filename: str, init_vector: str, encrypted_sp: str,
             "/Encrypted_data": "not_used"
     }
 
-    try:
-        # Add metadata and save the PDO
-        writer.add_metadata(metadata)
-        with open(filename, "wb") as file:
-            writer.write(file)
-
-    except FileNotFoundError:
-        return False, ERROR_FILE_NOT_FOUND
-    except PermissionError:
-        return False, ERROR_PERMISSION
-    except Exception(BaseException):
-        return False, ERROR_UNEXPECTED
-
-    return True, None
-
-def embed_davinci_certificate(pdo_filename: str, image: np.ndarray):
-    """
-    Embeds a numpy image array into an existing PDF without overwriting existing content or metadata.
-
-    The image is centered horizontally and positioned below the existing text.
-
-    Args:
-        pdo_filename: str -- path to the existing PDO PDF
-        image: np.ndarray -- image array to embed
-    """
-
-    # Convert numpy array to PIL Image
-    pil_image = Image.fromarray(image)
-    img_buffer = io.BytesIO()
-    pil_image.save(img_buffer, format="PNG")
-    img_buffer.seek(0)
-
-    # Create a temporary overlay PDF with the image
-    overlay_pdf = io.BytesIO()
-    width, height = letter
-    c = canvas.Canvas(overlay_pdf, pagesize=letter)
-
-    # === Calculate placement ===
-    image_width = 200
-    image_height = 200
-    x_image = (width - image_width) / 2
-    y_text = height / 2  # same as in create_pdo_base
-    y_image = y_text - image_height - 30  # 30 units padding below the text
-
-    # Draw the image
-    img_reader = ImageReader(img_buffer)
-    c.drawImage(img_reader, x=x_image, y=y_image, width=image_width, height=image_height)
-    c.save()
-
-    overlay_pdf.seek(0)
-
-    # Read the existing PDO
-    original_reader = PdfReader(pdo_filename)
-    overlay_reader = PdfReader(overlay_pdf)
-    writer = PdfWriter()
-
-    # Overlay only the first page
-    base_page = original_reader.pages[0]
-    overlay_page = overlay_reader.pages[0]
-    base_page.merge_page(overlay_page)
-    writer.add_page(base_page)
-
-    # Add any remaining pages
-    for page in original_reader.pages[1:]:
-        writer.add_page(page)
-
-    # Preserve metadata
-    if original_reader.metadata:
-        writer.add_metadata(original_reader.metadata)
-
-    # Write back to file
-    with open(pdo_filename, "wb") as f_out:
-        writer.write(f_out)
-
-
-def complete_pdo(pdo_filename: str, enc_data_filename: str) -> Tuple[bool, Optional[str]]:
-    """ Embed encrypted data into the PDO
-
-        Args:
-            pdo_filename: str -- (filename, directory) of the PDO file
-            enc_data_filename: list -- (filename, directory) of the encrypted original data file
-
-        Returns:
-            success: bool -- False (an error was encountered) or True (no error encountered)
-            error_msg: str -- error message
-
-    """
-
-    """Embed encrypted data into the PDO."""
-    try:
-        reader = PdfReader(pdo_filename)
-    except FileNotFoundError:
-        return False, ERROR_FILE_NOT_FOUND
-    except (PermissionError, Exception):
-        return False, ERROR_PERMISSION
-
-    writer = PdfWriter()
-
-    # Add pages and metadata
-    writer.append_pages_from_reader(reader)
-    if reader.metadata:
-        writer.add_metadata(reader.metadata)
-
-    # Add encrypted file as attachment (IMPORTANT: use only filename)
-    try:
-        with open(enc_data_filename, "rb") as sp_file:
-            file_bytes = sp_file.read()
-            filename_only = Path(enc_data_filename).name
-            writer.add_attachment(filename_only, file_bytes)
-
-        with open(pdo_filename, "wb") as output_file:
-            writer.write(output_file)
-
-    except FileNotFoundError:
-        return False, ERROR_FILE_NOT_FOUND
-    except (PermissionError, Exception):
-        return False, ERROR_UNEXPECTED
-
-    # Clean up temp file (optional)
-    try:
-        os.remove(enc_data_filename)
-    except Exception:
-        pass
-
-    return True, None
-
 
 def hash_sha512_bytes(data: bytes | str) -> str:
     if isinstance(data, str):
@@ -416,6 +290,11 @@ Notes: METADATA FIELDS FOR PDO
     "/Encryption_Key_Length": sys_config.crypto.encryption_key_length       # Encryptor
     "/Encryption_Mode": sys_config.crypto.encryption_mode                   # Encryptor
     "/Hash_Algorithm": sys_config.crypto.hash_algorithm                     # Encryptor
+    "/Payload_Format": 2                                                    # Encryptor (absent = 1, single GCM stream)
+    "/Compression": zlib                                                    # Encryptor (none | zlib | lzma, absent = none)
+    "/Date_Protected": 2025-08-11 20:31                                     # Encryptor
+    "/PDO_Fingerprint": sha512(encrypted payload)                           # Encryptor (unkeyed, consistency check by verify_pdo)
+    "/Certificate_Fingerprint": sha512(certificate image)                   # Encryptor (unkeyed, consistency check by verify_pdo)
     "/MID": <<table>>                                                       # MOS [key_protocol][mid]
     "/FID": <<table>>                                                       # MOS [key_protocol][fid]
     "/PQ_Type": Sphere                                                      # MOS [key_protocol][pqc][pq_type]
@@ -0,0 +1,252 @@
+"""
+File: /redaqt/modules/pdo/pdo_builder.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Collects the parts of a PDO and serializes the .epf file in a single pass
+"""
+
+import io
+import os
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import (ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject,
+                           PdfObject, StreamObject, create_string_object)
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+ERROR_FILE_NOT_FOUND = "File does not exist"
+ERROR_PERMISSION = "Permission denied"
+ERROR_OS_ACCESS_DENIED = f"OS error writing file to system"
+ERROR_UNEXPECTED = "Unexpected error was encountered"
+
+TEMP_FILE_EXTENSION = '.tmp'
+ATTACHMENT_CHUNK_SIZE = 1024 * 1024
+
+FONT_NAME = "Helvetica"
+FONT_SIZE = 12
+CERTIFICATE_IMAGE_WIDTH = 200
+CERTIFICATE_IMAGE_HEIGHT = 200
+CERTIFICATE_IMAGE_PADDING = 30
+
+
+class PDOBuilder:
+    """
+    Builder for the Protected Document Object (PDO).
+
+    The cover page, DaVinci certificate overlay, /Info metadata and encrypted attachment are
+    collected first and then written to the .epf file exactly once.  The document is written to a
+    temporary file in the destination directory and atomically renamed into place, so a partially
+    written PDO is never left behind under the final filename.
+
+    Usage:
+        builder = PDOBuilder(product_string)
+        builder.set_certificate_image(davinci_certificate_image)
+        builder.set_metadata(metadata)
+        builder.set_attachment(encrypted_file_path)
+        success, error_msg = builder.build(pdo_filename)
+    """
+
+    def __init__(self, product_string: str):
+        self.product_string = product_string
+        self.certificate_image: Optional[np.ndarray] = None
+        self.metadata: dict = {}
+        self.attachment_path: Optional[Path] = None
+        self.attachment_name: Optional[str] = None
+
+    def set_certificate_image(self, image: Optional[np.ndarray]) -> None:
+        """ Set the DaVinci certificate image drawn below the product string (None to omit it) """
+        self.certificate_image = image
+
+    def set_metadata(self, metadata: dict) -> None:
+        """ Set the /Info dictionary entries of the PDO """
+        self.metadata = dict(metadata)
+
+    def set_attachment(self, enc_data_filename: str, attachment_name: Optional[str] = None) -> None:
+        """ Set the encrypted data file embedded into the PDO (embedded under attachment_name, by default
+            its filename only) """
+        self.attachment_path = Path(enc_data_filename)
+        self.attachment_name = attachment_name
+
+    def build(self, pdo_filename: str) -> Tuple[bool, Optional[str]]:
+        """ Serialize the PDO to pdo_filename
+
+            Args:
+                pdo_filename: str -- (filename, directory) of the PDO file
+
+            Returns:
+                success: bool -- False (an error was encountered) or True (no error encountered)
+                error_msg: str -- error message
+        """
+
+        pdo_path = Path(pdo_filename)
+        tmp_file = None
+
+        try:
+            writer = PdfWriter()
+            writer.append_pages_from_reader(PdfReader(self._render_cover_page()))
+
+            writer.add_metadata(self.metadata)
+
+            if self.attachment_path is not None:
+                add_streamed_attachment(writer, self.attachment_name or self.attachment_path.name,
+                                        self.attachment_path)
+
+            tmp_file = NamedTemporaryFile(dir=pdo_path.parent, prefix=pdo_path.name,
+                                          suffix=TEMP_FILE_EXTENSION, delete=False)
+            with tmp_file as fout:
+                writer.write(fout)
+
+            os.replace(tmp_file.name, pdo_path)
+
+        except FileNotFoundError:
+            self._discard(tmp_file)
+            return False, ERROR_FILE_NOT_FOUND
+        except PermissionError:
+            self._discard(tmp_file)
+            return False, ERROR_PERMISSION
+        except OSError:
+            self._discard(tmp_file)
+            return False, ERROR_OS_ACCESS_DENIED
+        except Exception:
+            self._discard(tmp_file)
+            return False, ERROR_UNEXPECTED
+
+        return True, None
+
+    def _render_cover_page(self) -> io.BytesIO:
+        """ Render the cover page (product string and optional certificate image) in memory """
+
+        cover_pdf = io.BytesIO()
+        width, height = letter
+        c = canvas.Canvas(cover_pdf, pagesize=letter)
+
+        # === Product string, centered on the page ===
+        c.setFont(FONT_NAME, FONT_SIZE)
+        text_width = c.stringWidth(self.product_string, FONT_NAME, FONT_SIZE)
+        x_text = (width - text_width) / 2
+        y_text = (height - FONT_SIZE) / 2
+        c.drawString(x_text, y_text, self.product_string)
+
+        # === DaVinci certificate, centered horizontally below the text ===
+        if self.certificate_image is not None:
+            img_buffer = io.BytesIO()
+            Image.fromarray(self.certificate_image).save(img_buffer, format="PNG")
+            img_buffer.seek(0)
+
+            x_image = (width - CERTIFICATE_IMAGE_WIDTH) / 2
+            y_image = height / 2 - CERTIFICATE_IMAGE_HEIGHT - CERTIFICATE_IMAGE_PADDING
+            c.drawImage(ImageReader(img_buffer), x=x_image, y=y_image,
+                        width=CERTIFICATE_IMAGE_WIDTH, height=CERTIFICATE_IMAGE_HEIGHT)
+
+        c.save()
+        cover_pdf.seek(0)
+        return cover_pdf
+
+    @staticmethod
+    def _discard(tmp_file) -> None:
+        """ Remove a partially written temporary PDO """
+        if tmp_file is None:
+            return
+        try:
+            Path(tmp_file.name).unlink()
+        except Exception:
+            pass
+
+
+class _StreamLength(PdfObject):
+    """ Indirect /Length object of an embedded-file stream, filled in once the stream is written """
+
+    def __init__(self):
+        self.value: int = 0
+
+    def write_to_stream(self, stream, encryption_key=None) -> None:
+        NumberObject(self.value).write_to_stream(stream)
+
+
+class _EmbeddedFileStream(StreamObject):
+    """
+    Embedded-file stream whose data is copied from disk while the PDF is being written.
+
+    The data is never held in memory: it is copied into the output in ATTACHMENT_CHUNK_SIZE chunks
+    and the number of bytes written is stored in the indirect /Length object, which is written
+    after this stream.
+    """
+
+    def __init__(self, source_path: Path, length: _StreamLength, chunk_size: int = ATTACHMENT_CHUNK_SIZE):
+        super().__init__()
+        self.source_path = Path(source_path)
+        self.length = length
+        self.chunk_size = chunk_size
+
+    def write_to_stream(self, stream, encryption_key=None) -> None:
+        DictionaryObject.write_to_stream(self, stream)
+        stream.write(b"\nstream\n")
+
+        bytes_written = 0
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+        with self.source_path.open("rb") as source:
+            while bytes_read := source.readinto(buffer):
+                stream.write(view[:bytes_read])
+                bytes_written += bytes_read
+
+        stream.write(b"\nendstream")
+        self.length.value = bytes_written
+
+
+def _add_indirect_object(writer: PdfWriter, obj) -> IndirectObject:
+    """ Register obj as an indirect object of writer and return its reference
+
+        pypdf (pinned in requirements.txt) has no public equivalent of PdfWriter._add_object yet; all
+        uses go through here so a release that adds one (or renames it) is a one-line change.
+    """
+    add_object = getattr(writer, "add_object", None) or writer._add_object
+    return add_object(obj)
+
+
+def add_streamed_attachment(writer: PdfWriter, filename: str, source_path: Path,
+                            chunk_size: int = ATTACHMENT_CHUNK_SIZE) -> None:
+    """ Embed a file into the PDF without reading it into memory
+
+        The attachment is written as an uncompressed /EmbeddedFile stream that is copied from
+        source_path in bounded chunks when the writer serializes the document.
+
+        Args:
+            writer: PdfWriter -- document being built (must not have any other attachment)
+            filename: str -- name of the attachment inside the PDF
+            source_path: Path -- file holding the attachment data
+            chunk_size: int -- number of bytes copied at a time
+    """
+
+    length = _StreamLength()
+    file_entry = _EmbeddedFileStream(source_path, length, chunk_size)
+    file_entry_reference = _add_indirect_object(writer, file_entry)
+    file_entry.update({
+        NameObject("/Type"): NameObject("/EmbeddedFile"),
+        NameObject("/Length"): _add_indirect_object(writer, length),
+    })
+
+    name_object = create_string_object(filename)
+    filespec = DictionaryObject({
+        NameObject("/Type"): NameObject("/Filespec"),
+        NameObject("/F"): name_object,
+        NameObject("/EF"): DictionaryObject({NameObject("/F"): file_entry_reference}),
+    })
+
+    embedded_files = DictionaryObject({
+        NameObject("/Names"): ArrayObject([name_object, _add_indirect_object(writer, filespec)])
+    })
+    writer.root_object[NameObject("/Names")] = _add_indirect_object(writer,
+        DictionaryObject({NameObject("/EmbeddedFiles"): embedded_files})
+    )
@@ -0,0 +1,284 @@
+"""
+File: /redaqt/modules/pdo/pdo_metadata.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Fast PDO metadata reader, resolves only the /Info dictionary from the trailer
+"""
+
+import io
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from pypdf.generic import DictionaryObject, IndirectObject, create_string_object, read_object
+
+from redaqt.modules.pdo.protected_document import open_protected_document, normalize_pdo_metadata
+
+ERROR_FILE_NOT_FOUND = "File does not exist"
+ERROR_PERMISSION = "Permission denied"
+ERROR_OS_ACCESS_DENIED = f"OS error writing file to system"
+ERROR_PROTECTED_DOCUMENT = f"Could not read data from protected document"
+
+TRAILER_READ_SIZE = 1024
+OBJECT_READ_SIZE = 64 * 1024
+MAX_OBJECT_SIZE = 16 * 1024 * 1024
+MAX_XREF_SECTIONS = 32
+
+STARTXREF = re.compile(rb"startxref\s+(\d+)")
+XREF_SUBSECTION = re.compile(rb"(\d+)\s+(\d+)\s*$")
+XREF_ENTRY = re.compile(rb"(\d{10})\s+(\d{5})\s+([nf])")
+OBJECT_HEADER = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj\b")
+
+# /Info dictionaries written by pypdf hold string values only (add_metadata stores every value as a
+# text string), so those are parsed here directly; anything else is handed to pypdf's object parser.
+WHITESPACE = rb"[\x00\t\n\x0c\r ]*"
+INFO_START = re.compile(WHITESPACE + rb"<<")
+INFO_KEY = re.compile(WHITESPACE + rb"(/[^\x00\t\n\x0c\r ()<>\[\]{}/%#]+)" + WHITESPACE + rb"([(<])")
+INFO_END = re.compile(WHITESPACE + rb">>")
+LITERAL_TOKEN = re.compile(rb"[()\\]")
+LITERAL_ESCAPE = re.compile(rb"\\([0-7]{1,3}|\r\n|[\s\S])")
+HEX_STRING = re.compile(rb"([0-9A-Fa-f\x00\t\n\x0c\r ]*)>")
+LITERAL_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f",
+                   b"\r\n": b"", b"\r": b"", b"\n": b""}
+PLAIN_TEXT = re.compile(rb"[\t\n\r\x20-\x7e]*")
+
+
+class _UnsupportedLayout(Exception):
+    """ The file needs the full reader (cross-reference stream, indirect values, ...) """
+
+
+class _ParseContext:
+    """ Stands in for the PdfReader while parsing: indirect references are recorded, never resolved """
+    strict = True
+
+
+_PARSE_CONTEXT = _ParseContext()
+
+
+def read_pdo_metadata(file_path: str) -> Tuple[bool, Optional[str], Optional[dict]]:
+    """ Read the metadata of a PDO without building a full PdfReader
+
+        Only the end of the file (startxref, the cross-reference table and the trailer) and the /Info
+        object are read; pages and attachments are never touched.  Files this reader cannot handle
+        (cross-reference streams, indirect /Info values) fall back to the full reader.
+
+        Args:
+            file_path: str -- location of filename, directory
+
+        Returns:
+            success: bool -- False (an error was encountered) or True (no error encountered)
+            error_msg: str | None -- error message or pass None if no error encountered
+            metadata: dict -- metadata stored in the PDO document, same keys as get_pdo_metadata
+    """
+    try:
+        with open(Path(file_path), "rb") as fin:
+            info = _read_info_dictionary(fin)
+
+    except FileNotFoundError:
+        return False, ERROR_FILE_NOT_FOUND, None
+    except PermissionError:
+        return False, ERROR_PERMISSION, None
+    except _UnsupportedLayout:
+        return _read_pdo_metadata_full(file_path)
+    except OSError:
+        return False, ERROR_OS_ACCESS_DENIED, None
+    except Exception:
+        return _read_pdo_metadata_full(file_path)
+
+    if not info:
+        return False, ERROR_PROTECTED_DOCUMENT, None
+
+    return True, None, normalize_pdo_metadata(info)
+
+
+def _read_pdo_metadata_full(file_path: str) -> Tuple[bool, Optional[str], Optional[dict]]:
+    """ Read the metadata with the full reader """
+    success, error_msg, document = open_protected_document(file_path)
+    if not success:
+        return False, error_msg, None
+
+    with document:
+        return document.get_metadata()
+
+
+def _read_info_dictionary(fin) -> Optional[dict]:
+    """ Locate and parse the /Info dictionary of the newest revision of the file """
+    file_size = os.fstat(fin.fileno()).st_size
+    fin.seek(max(0, file_size - TRAILER_READ_SIZE))
+    tail = fin.read()
+
+    matches = list(STARTXREF.finditer(tail))
+    if not matches:
+        raise _UnsupportedLayout
+    xref_offset = int(matches[-1].group(1))
+
+    # Walk the revisions newest first; the first /Info found wins, newer xref entries take precedence
+    offsets: Dict[Tuple[int, int], int] = {}
+    info_reference: Optional[IndirectObject] = None
+    visited = set()
+
+    while xref_offset is not None:
+        if xref_offset in visited or len(visited) >= MAX_XREF_SECTIONS:
+            raise _UnsupportedLayout
+        visited.add(xref_offset)
+
+        trailer = _read_xref_section(fin, xref_offset, offsets)
+        if info_reference is None and "/Info" in trailer:
+            info_reference = trailer.raw_get("/Info")
+
+        previous = trailer.get("/Prev")
+        xref_offset = int(previous) if previous is not None else None
+
+    if info_reference is None:
+        return None
+    if not isinstance(info_reference, IndirectObject):
+        raise _UnsupportedLayout
+
+    object_offset = offsets.get((info_reference.idnum, info_reference.generation))
+    if object_offset is None:
+        raise _UnsupportedLayout
+
+    info = _read_indirect_object(fin, object_offset, info_reference)
+    if not isinstance(info, dict):
+        raise _UnsupportedLayout
+    if any(isinstance(value, IndirectObject) for value in info.values()):
+        raise _UnsupportedLayout
+
+    return info
+
+
+def _read_xref_section(fin, xref_offset: int, offsets: Dict[Tuple[int, int], int]) -> DictionaryObject:
+    """ Parse a classic cross-reference table and return the trailer that follows it """
+    fin.seek(xref_offset)
+    if fin.readline().strip() != b"xref":
+        raise _UnsupportedLayout     # cross-reference stream
+
+    while True:
+        line = fin.readline()
+        if not line:
+            raise _UnsupportedLayout
+        if line.strip().startswith(b"trailer"):
+            fin.seek(fin.tell() - len(line) + line.index(b"trailer") + len(b"trailer"))
+            break
+
+        subsection = XREF_SUBSECTION.match(line.strip())
+        if subsection is None:
+            raise _UnsupportedLayout
+        first, count = int(subsection.group(1)), int(subsection.group(2))
+
+        for idnum in range(first, first + count):
+            entry = XREF_ENTRY.match(fin.readline().strip())
+            if entry is None:
+                raise _UnsupportedLayout
+            if entry.group(3) == b"n":
+                offsets.setdefault((idnum, int(entry.group(2))), int(entry.group(1)))
+
+    trailer = read_object(io.BytesIO(fin.read(TRAILER_READ_SIZE).lstrip()), _PARSE_CONTEXT)
+    if not isinstance(trailer, DictionaryObject):
+        raise _UnsupportedLayout
+    return trailer
+
+
+def _read_indirect_object(fin, object_offset: int, reference: IndirectObject):
+    """ Parse the indirect object starting at object_offset (reading only as far as its endobj) """
+    fin.seek(object_offset)
+    data = fin.read(OBJECT_READ_SIZE)
+    while b"endobj" not in data:
+        if len(data) >= MAX_OBJECT_SIZE:
+            raise _UnsupportedLayout
+        more = fin.read(len(data))
+        if not more:
+            raise _UnsupportedLayout
+        data += more
+
+    header = OBJECT_HEADER.match(data)
+    if header is None or (int(header.group(1)), int(header.group(2))) != (reference.idnum, reference.generation):
+        raise _UnsupportedLayout
+
+    body = data[header.end():]
+    info = _parse_string_dictionary(body)
+    if info is None:
+        info = read_object(io.BytesIO(body.lstrip()), _PARSE_CONTEXT)
+    return info
+
+
+def _parse_string_dictionary(data: bytes) -> Optional[Dict[str, str]]:
+    """ Parse a dictionary whose values are all strings, or return None if it is anything else """
+    start = INFO_START.match(data)
+    if start is None:
+        return None
+
+    info: Dict[str, str] = {}
+    position = start.end()
+
+    while True:
+        end = INFO_END.match(data, position)
+        if end is not None:
+            return info
+
+        entry = INFO_KEY.match(data, position)
+        if entry is None:
+            return None
+
+        if entry.group(2) == b"(":
+            value, position = _parse_literal_string(data, entry.end())
+        else:
+            value, position = _parse_hex_string(data, entry.end())
+        if value is None:
+            return None
+
+        key = entry.group(1).decode("ascii")
+        if key in info:
+            return None
+        info[key] = _decode_text_string(value)
+
+
+def _parse_literal_string(data: bytes, position: int) -> Tuple[Optional[bytes], int]:
+    """ Parse a (literal string) whose opening parenthesis ends just before position """
+    depth = 1
+    start = position
+
+    while depth:
+        token = LITERAL_TOKEN.search(data, position)
+        if token is None:
+            return None, position
+        position = token.end()
+        if token.group() == b"\\":
+            position += 1                       # skip the escaped character
+        elif token.group() == b"(":
+            depth += 1
+        else:
+            depth -= 1
+
+    return LITERAL_ESCAPE.sub(_unescape, data[start:position - 1]), position
+
+
+def _unescape(match) -> bytes:
+    escaped = match.group(1)
+    if escaped[:1].isdigit() and escaped[:1] not in b"89":
+        return bytes([int(escaped, 8) & 0xFF])
+    return LITERAL_ESCAPES.get(escaped, escaped)
+
+
+def _parse_hex_string(data: bytes, position: int) -> Tuple[Optional[bytes], int]:
+    """ Parse a <hex string> whose opening bracket ends just before position """
+    match = HEX_STRING.match(data, position)
+    if match is None:
+        return None, position
+    digits = re.sub(rb"[\x00\t\n\x0c\r ]", b"", match.group(1))
+    if len(digits) % 2:
+        digits += b"0"
+    return bytes.fromhex(digits.decode("ascii")), match.end()
+
+
+def _decode_text_string(value: bytes) -> str:
+    """ Decode a PDF text string exactly as pypdf does (plain ASCII is decoded directly) """
+    if PLAIN_TEXT.fullmatch(value):
+        return value.decode("ascii")
+    return str(create_string_object(value))
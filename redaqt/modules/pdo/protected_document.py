@@ -0,0 +1,233 @@
+"""
+File: /redaqt/modules/pdo/protected_document.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Parse-once handle on a PDO, shared by the access path and batch tools
+"""
+
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+from pypdf import PdfReader
+
+from redaqt.modules.pdo.extract_pd_attachment import AttachmentStream, read_attachment_streams
+
+ERROR_FILE_NOT_FOUND = "File does not exist"
+ERROR_PERMISSION = "Permission denied"
+ERROR_OS_ACCESS_DENIED = f"OS error writing file to system"
+ERROR_UNEXPECTED = "Unexpected error was encountered"
+ERROR_PROTECTED_DOCUMENT = f"Could not read data from protected document"
+
+ATTACHMENT_CHUNK_SIZE = 1024 * 1024
+
+
+def open_protected_document(file_path: str) -> Tuple[bool, Optional[str], Optional["ProtectedDocument"]]:
+    """ Open and parse a PDO once
+
+        Args:
+            file_path: str -- file path + filename of the PDO
+
+        Returns:
+            success: bool -- False (an error was encountered) or True (no error encountered)
+            error_msg: str | None -- error message or pass None if no error encountered
+            document: ProtectedDocument -- open handle, the caller must close it
+    """
+    file = None
+    try:
+        file = open(Path(file_path), "rb")
+        return True, None, ProtectedDocument(file_path, file, PdfReader(file))
+
+    except FileNotFoundError:
+        return False, ERROR_FILE_NOT_FOUND, None
+    except PermissionError:
+        return False, ERROR_PERMISSION, None
+    except OSError:
+        return False, ERROR_OS_ACCESS_DENIED, None
+    except Exception:
+        if file is not None:
+            file.close()
+        return False, ERROR_PROTECTED_DOCUMENT, None
+
+
+def normalize_pdo_metadata(info) -> dict:
+    """ PDO /Info entries keyed lower case without the leading '/', every value as a string """
+    metadata: dict[str, str] = {}
+    for key, value in info.items():
+        clean_key = key[1:].lower() if key.startswith('/') else key.lower()
+        metadata.update({clean_key: str(value)})  # Ensure value is a string
+    return metadata
+
+
+class ProtectedDocument:
+    """
+    Handle on an open Protected Document Object (PDO).
+
+    The PDF is parsed once (xref table and trailer) when the handle is opened.  The normalized
+    metadata, the DaVinci certificate image and the attachment locations are resolved on first
+    use and cached, so every step of the access path shares the same parse.
+
+    Usage:
+        success, error_msg, document = open_protected_document(file_path)
+        with document:
+            success, error_msg, metadata = document.get_metadata()
+            success, image = document.get_certificate_image()
+            success, error_msg, attachments = document.get_attachments()
+            for chunk in document.iter_attachment_data(attachments[0]):
+                ...
+    """
+
+    def __init__(self, file_path: str, file, reader: PdfReader):
+        self.file_path = Path(file_path)
+        self._file = file
+        self._reader = reader
+        self._metadata: Optional[Tuple[bool, Optional[str], Optional[dict]]] = None
+        self._certificate_image: Optional[Tuple[bool, Optional[np.ndarray]]] = None
+        self._attachments: Optional[Tuple[bool, Optional[str], Optional[List[AttachmentStream]]]] = None
+
+    def __enter__(self) -> "ProtectedDocument":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """ Close the underlying PDO file """
+        self._file.close()
+
+    @property
+    def reader(self) -> PdfReader:
+        """ Parsed PDF """
+        return self._reader
+
+    @property
+    def file(self):
+        """ Open binary PDO file, shared with the reader (seek before every read) """
+        return self._file
+
+    def get_metadata(self) -> Tuple[bool, Optional[str], Optional[dict]]:
+        """ Metadata embedded into the PDO, keys lower case without the leading '/'
+
+            Returns:
+                success: bool -- False (an error was encountered) or True (no error encountered)
+                error_msg: str | None -- error message or pass None if no error encountered
+                metadata: dict -- metadata stored in the PDO document
+        """
+        if self._metadata is None:
+            self._metadata = self._read_metadata()
+        return self._metadata
+
+    def get_certificate_image(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """ First image drawn on the cover page (the DaVinci certificate)
+
+            Returns:
+                success: bool -- False if the cover page has no supported image
+                image: array -- certificate image
+        """
+        if self._certificate_image is None:
+            self._certificate_image = self._read_certificate_image()
+        return self._certificate_image
+
+    def get_attachments(self) -> Tuple[bool, Optional[str], Optional[List[AttachmentStream]]]:
+        """ Name, file offset and length of every embedded file
+
+            Returns:
+                success: bool -- False if the attachments could not be located
+                error_msg: str | None -- error message or pass None if no error encountered
+                attachments: Array of [AttachmentStream] -- embedded files
+        """
+        if self._attachments is None:
+            try:
+                self._attachments = read_attachment_streams(self._reader, self._file)
+            except Exception:
+                self._attachments = (False, ERROR_UNEXPECTED, None)
+        return self._attachments
+
+    def iter_attachment_data(self, attachment: AttachmentStream,
+                             chunk_size: int = ATTACHMENT_CHUNK_SIZE) -> Iterator[bytes]:
+        """ Yield the raw (encrypted) data of an embedded file in bounded chunks """
+        position = attachment.offset
+        remaining = attachment.length
+
+        while remaining > 0:
+            # Re-seek every chunk, the reader shares the file object
+            self._file.seek(position)
+            data = self._file.read(min(chunk_size, remaining))
+            if not data:
+                raise EOFError(ERROR_PROTECTED_DOCUMENT)
+            position += len(data)
+            remaining -= len(data)
+            yield data
+
+    def extract_attachment(self, attachment: AttachmentStream, output_path: Path) -> Tuple[bool, Optional[str]]:
+        """ Copy the raw data of an embedded file to output_path
+
+            Returns:
+                success: bool -- False (an error was encountered) or True (no error encountered)
+                error_msg: str | None -- error message or pass None if no error encountered
+        """
+        try:
+            with open(output_path, "wb") as fout:
+                for data in self.iter_attachment_data(attachment):
+                    fout.write(data)
+            return True, None
+
+        except PermissionError:
+            return False, ERROR_PERMISSION
+        except EOFError:
+            return False, ERROR_PROTECTED_DOCUMENT
+        except OSError:
+            return False, ERROR_OS_ACCESS_DENIED
+        except Exception:
+            return False, ERROR_UNEXPECTED
+
+    def _read_metadata(self) -> Tuple[bool, Optional[str], Optional[dict]]:
+        try:
+            metadata_reader = self._reader.metadata
+        except Exception:
+            return False, ERROR_PROTECTED_DOCUMENT, None
+
+        if not metadata_reader:
+            return False, ERROR_PROTECTED_DOCUMENT, None
+
+        return True, None, normalize_pdo_metadata(metadata_reader)
+
+    def _read_certificate_image(self) -> Tuple[bool, Optional[np.ndarray]]:
+        try:
+            page = self._reader.pages[0]
+
+            xobjects = page.get("/Resources", {}).get("/XObject", {})
+            for name, obj_ref in xobjects.items():
+                xobj = obj_ref.get_object()
+                if xobj.get("/Subtype") != "/Image":
+                    continue
+
+                width = xobj["/Width"]
+                height = xobj["/Height"]
+                color_space = xobj["/ColorSpace"]
+
+                data = xobj.get_data()  # Decompressed binary stream
+
+                # Handle grayscale or RGB
+                if color_space == "/DeviceRGB":
+                    img = Image.frombytes("RGB", (width, height), data)
+                elif color_space == "/DeviceGray":
+                    img = Image.frombytes("L", (width, height), data)
+                else:
+                    print(f"[WARN] Unsupported color space: {color_space}")
+                    continue
+
+                return True, np.array(img)
+
+            print("[DEBUG] No valid image extracted.")
+            return False, None
+
+        except Exception as e:
+            print(f"[ERROR] extract_image_from_pdf: {e}")
+            return False, None
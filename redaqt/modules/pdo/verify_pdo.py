@@ -0,0 +1,384 @@
+"""
+File: /redaqt/modules/pdo/verify_pdo.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Offline consistency verification of PDOs (no key request, no decryption)
+
+Consistency, not tamper evidence: the checks find accidental damage (bit rot, truncated copies, broken
+structure).  /PDO_Fingerprint and /Certificate_Fingerprint are plain, unkeyed SHA-512 digests stored in
+the clear next to what they cover, so whoever edits a payload or certificate can recompute them and the
+PDO still passes.  A clean report is not evidence that an archive was not tampered with; modified
+payloads are only detected when the document is accessed with its key (AES-GCM authentication).
+
+With a FingerprintCache (--cache) the payload of a PDO whose size and mtime did not change is not hashed
+again until its cached hash is older than the cache's max_age (--cache-max-age), so corruption that keeps
+size and mtime (bit rot) is only found once the cached hash expires.
+
+Usage:
+    python -m redaqt.modules.pdo.verify_pdo /archive --report verify_report.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from redaqt.modules.lib.aes256gcm_segmented import (read_segment_layout, PAYLOAD_FORMAT_LEGACY,
+                                                    PAYLOAD_FORMAT_SEGMENTED)
+from redaqt.modules.lib.compression import COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_LZMA
+from redaqt.modules.lib.b64_encoder_decoder import decode_base64_into_dict
+from redaqt.modules.lib.fingerprint_cache import FingerprintCache, KIND_PDO_PAYLOAD
+from redaqt.modules.certs.encoder_image import read_certificate
+from redaqt.modules.pdo.protected_document import ProtectedDocument, open_protected_document
+
+PROTECTED_FILE_EXTENSION = ".epf"
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+TAIL_READ_SIZE = 1024
+ENDSTREAM = b"endstream"
+EOF_MARKER = b"%%EOF"
+LEGACY_MIN_PAYLOAD_SIZE = 12 + 16       # IV + tag
+CACHE_MAX_AGE_DAYS = 7.0                # --cache: payloads are re-read at least this often
+
+REQUIRED_METADATA = ("product", "product_version", "encryption_algorithm", "encryption_key_length",
+                     "encryption_mode", "mid", "fid", "iv", "signature", "smart_policy")
+
+CHECK_STRUCTURE = "structure"
+CHECK_METADATA = "metadata"
+CHECK_ATTACHMENT = "attachment"
+CHECK_PAYLOAD = "payload"
+CHECK_PDO_FINGERPRINT = "pdo_fingerprint"
+CHECK_CERTIFICATE = "certificate"
+CHECK_CERTIFICATE_FINGERPRINT = "certificate_fingerprint"
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"          # the information needed for the check is not stored in the clear
+
+REPORT_VERSION = 1
+REPORT_SCOPE = "consistency"
+REPORT_NOTE = "Accidental corruption only, not evidence against tampering (the fingerprints are unkeyed)"
+
+
+@dataclass
+class VerificationResult:
+    """ Outcome of verifying one PDO, every check is ok, failed or skipped """
+    file_path: str
+    ok: bool = True
+    size: int = 0
+    payload_bytes: int = 0
+    elapsed: float = 0.0
+    checks: Dict[str, str] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    def passed(self, check: str) -> None:
+        self.checks[check] = STATUS_OK
+
+    def failed(self, check: str, error_msg: str) -> None:
+        self.checks[check] = STATUS_FAILED
+        self.errors.append(f"{check}: {error_msg}")
+        self.ok = False
+
+    def skipped(self, check: str) -> None:
+        self.checks[check] = STATUS_SKIPPED
+
+
+@dataclass
+class VerificationSummary:
+    """ Totals of a verification run """
+    root: str
+    total: int = 0
+    passed: int = 0
+    failed: int = 0
+    payload_bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.payload_bytes / (1024 * 1024) / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def verify_pdo(file_path: str, check_fingerprints: bool = True,
+               fingerprints: Optional[FingerprintCache] = None) -> VerificationResult:
+    """ Check the consistency of a PDO without the crypto key
+
+        Checks the PDF structure, the required metadata, that the embedded file is present and ends
+        where its stream says it does, the encrypted payload layout, the DaVinci certificate and the
+        SHA-512 fingerprints stored in the clear (/PDO_Fingerprint, /Certificate_Fingerprint).  PDOs
+        written before the fingerprints were stored in the clear report those checks as skipped.
+
+        Args:
+            file_path: str -- file path + filename of the PDO
+            check_fingerprints: bool -- hash the payload and certificate (reads the whole file)
+            fingerprints: FingerprintCache -- optional cache of payload hashes (see the module docstring)
+
+        Returns:
+            result: VerificationResult -- status of every check and the errors found
+    """
+    started = time.perf_counter()
+    result = VerificationResult(file_path=str(file_path))
+
+    try:
+        result.size = os.path.getsize(file_path)
+        _verify_trailer(file_path, result)
+
+        success, error_msg, document = open_protected_document(file_path)
+        if not success:
+            result.failed(CHECK_STRUCTURE, error_msg)
+            return result
+
+        with document:
+            _verify_document(document, result, check_fingerprints, fingerprints)
+
+    except OSError as e:
+        result.failed(CHECK_STRUCTURE, e.strerror or str(e))
+    except Exception as e:
+        result.failed(CHECK_STRUCTURE, f"Unexpected error was encountered: {e}")
+    finally:
+        result.elapsed = time.perf_counter() - started
+
+    return result
+
+
+def _verify_trailer(file_path: str, result: VerificationResult) -> None:
+    """ A truncated PDO loses its %%EOF marker (pypdf recovers such files, the verifier must not) """
+    with open(file_path, "rb") as fin:
+        fin.seek(max(0, result.size - TAIL_READ_SIZE))
+        tail = fin.read()
+
+    if EOF_MARKER not in tail:
+        result.failed(CHECK_STRUCTURE, "missing %%EOF marker (truncated file)")
+    else:
+        result.passed(CHECK_STRUCTURE)
+
+
+def _verify_document(document: ProtectedDocument, result: VerificationResult, check_fingerprints: bool,
+                     fingerprints: Optional[FingerprintCache]) -> None:
+    success, error_msg, metadata = document.get_metadata()
+    if not success:
+        result.failed(CHECK_METADATA, error_msg)
+        return
+
+    missing = [key for key in REQUIRED_METADATA if not metadata.get(key)]
+    payload_format = metadata.get("payload_format", PAYLOAD_FORMAT_LEGACY)
+    compression = metadata.get("compression", COMPRESSION_NONE)
+    if missing:
+        result.failed(CHECK_METADATA, f"missing {', '.join(missing)}")
+    elif payload_format not in (PAYLOAD_FORMAT_LEGACY, PAYLOAD_FORMAT_SEGMENTED):
+        result.failed(CHECK_METADATA, f"unknown payload format {payload_format}")
+    elif compression not in (COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_LZMA):
+        result.failed(CHECK_METADATA, f"unknown compression {compression}")
+    else:
+        result.passed(CHECK_METADATA)
+
+    _verify_attachments(document, metadata, payload_format, result, check_fingerprints, fingerprints)
+    _verify_certificate(document, metadata, result, check_fingerprints)
+
+
+def _verify_attachments(document: ProtectedDocument, metadata: dict, payload_format: str,
+                        result: VerificationResult, check_fingerprints: bool,
+                        fingerprints: Optional[FingerprintCache]) -> None:
+    success, error_msg, attachments = document.get_attachments()
+    if not success or not attachments:
+        result.failed(CHECK_ATTACHMENT, error_msg or "no embedded file")
+        return
+
+    fin = document.file
+    for attachment in attachments:
+        # The stream data must end right where the stream dictionary says it does
+        end = attachment.offset + attachment.length
+        fin.seek(end)
+        if end > result.size or not fin.read(len(ENDSTREAM) + 2).lstrip(b"\r\n").startswith(ENDSTREAM):
+            result.failed(CHECK_ATTACHMENT, f"{attachment.name}: stream length does not match its data")
+            return
+        result.payload_bytes += attachment.length
+    result.passed(CHECK_ATTACHMENT)
+
+    # Payload layout (header, segment sizes) of the first embedded file, the one access_document decrypts
+    payload = attachments[0]
+    if payload_format == PAYLOAD_FORMAT_SEGMENTED:
+        fin.seek(payload.offset)
+        layout = read_segment_layout(fin, payload.length)
+        # Header version 3 (segments compressed on their own) goes with a /Compression, version 2 without
+        valid = layout is not None and layout.matches(metadata.get("compression", COMPRESSION_NONE))
+    else:
+        valid = payload.length >= LEGACY_MIN_PAYLOAD_SIZE
+    if valid:
+        result.passed(CHECK_PAYLOAD)
+    else:
+        result.failed(CHECK_PAYLOAD, "invalid encrypted payload layout")
+
+    expected = metadata.get("pdo_fingerprint")
+    if not check_fingerprints or not expected:
+        result.skipped(CHECK_PDO_FINGERPRINT)
+        return
+
+    def payload_sha512() -> str:
+        hasher = hashlib.sha512()
+        for data in document.iter_attachment_data(payload, HASH_CHUNK_SIZE):
+            hasher.update(data)
+        return hasher.hexdigest()
+
+    if fingerprints is not None:
+        digest = fingerprints.fingerprint(result.file_path, KIND_PDO_PAYLOAD, payload_sha512)
+    else:
+        digest = payload_sha512()
+    if digest == expected:
+        result.passed(CHECK_PDO_FINGERPRINT)
+    else:
+        result.failed(CHECK_PDO_FINGERPRINT, "encrypted payload does not match its fingerprint")
+
+
+def _verify_certificate(document: ProtectedDocument, metadata: dict, result: VerificationResult,
+                        check_fingerprints: bool) -> None:
+    success, image = document.get_certificate_image()
+    try:
+        if success:
+            fingerprinted = image.tobytes()
+            decoded = bool(read_certificate(image))
+        else:
+            certificate_str = metadata.get("davinci_certificate")
+            fingerprinted = (certificate_str or "").encode()
+            decoded = bool(certificate_str) and bool(decode_base64_into_dict(certificate_str))
+    except Exception:
+        decoded = False
+    if decoded:
+        result.passed(CHECK_CERTIFICATE)
+    else:
+        result.failed(CHECK_CERTIFICATE, "DaVinci certificate could not be decoded")
+
+    expected = metadata.get("certificate_fingerprint")
+    if not check_fingerprints or not expected:
+        result.skipped(CHECK_CERTIFICATE_FINGERPRINT)
+    elif hashlib.sha512(fingerprinted).hexdigest() == expected:
+        result.passed(CHECK_CERTIFICATE_FINGERPRINT)
+    else:
+        result.failed(CHECK_CERTIFICATE_FINGERPRINT, "certificate does not match its fingerprint")
+
+
+def iter_protected_files(root: str) -> Iterator[str]:
+    """ Yield the path of every .epf file under root, in a stable order """
+    for folder, subfolders, filenames in os.walk(root):
+        subfolders.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(PROTECTED_FILE_EXTENSION):
+                yield os.path.join(folder, filename)
+
+
+def verify_archive(root: str, report_path: Optional[str] = None, max_workers: Optional[int] = None,
+                   check_fingerprints: bool = True, on_result=None,
+                   fingerprints: Optional[FingerprintCache] = None) -> VerificationSummary:
+    """ Check the consistency of every PDO under root in parallel and write a JSON report
+
+        The report is written as the results arrive, so memory does not grow with the archive:
+            {"version": 1, "scope": "consistency", "note": ..., "root": ..., "started": ...,
+             "documents": [VerificationResult, ...], "summary": VerificationSummary}
+
+        Args:
+            root: str -- folder to verify (recursively)
+            report_path: str -- JSON report location, None to skip the report
+            max_workers: int -- verification threads (hashing releases the GIL)
+            check_fingerprints: bool -- hash the payloads and certificates
+            on_result: callable -- optional callback receiving each VerificationResult
+            fingerprints: FingerprintCache -- optional cache of payload hashes (see the module docstring)
+
+        Returns:
+            summary: VerificationSummary -- totals of the run
+    """
+    started = time.perf_counter()
+    summary = VerificationSummary(root=os.path.abspath(root))
+    workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+    report = open(report_path, "w", encoding="utf-8") if report_path else None
+
+    try:
+        if report is not None:
+            report.write(f'{{"version": {REPORT_VERSION}, "scope": "{REPORT_SCOPE}", '
+                         f'"note": {json.dumps(REPORT_NOTE)}, "root": {json.dumps(summary.root)}, '
+                         f'"started": "{datetime.now().isoformat(timespec="seconds")}", "documents": [\n')
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in _bounded_map(executor, workers * 4, check_fingerprints, fingerprints,
+                                       iter_protected_files(root)):
+                if report is not None:
+                    report.write(("" if summary.total == 0 else ",\n") + json.dumps(asdict(result)))
+
+                summary.total += 1
+                summary.payload_bytes += result.payload_bytes
+                if result.ok:
+                    summary.passed += 1
+                else:
+                    summary.failed += 1
+                if on_result is not None:
+                    on_result(result)
+
+        summary.elapsed = time.perf_counter() - started
+        if report is not None:
+            report.write(f'\n], "summary": {json.dumps(asdict(summary))}}}\n')
+
+    finally:
+        if report is not None:
+            report.close()
+
+    return summary
+
+
+def _bounded_map(executor: ThreadPoolExecutor, window: int, check_fingerprints: bool,
+                 fingerprints: Optional[FingerprintCache], paths: Iterator[str]) -> Iterator[VerificationResult]:
+    """ verify_pdo over paths in order, with at most window files queued (Executor.map queues them all) """
+    pending = deque()
+    for path in paths:
+        pending.append(executor.submit(verify_pdo, path, check_fingerprints, fingerprints))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check PDOs for accidental corruption without the crypto key "
+                                                 "(not evidence against tampering)")
+    parser.add_argument("root", help="folder of protected documents")
+    parser.add_argument("--report", default=None, help="JSON report location")
+    parser.add_argument("--workers", type=int, default=None, help="verification threads")
+    parser.add_argument("--no-fingerprints", action="store_true", help="structural checks only (fast)")
+    parser.add_argument("--cache", action="store_true",
+                        help="reuse the payload hashes of unmodified PDOs until --cache-max-age (data/fingerprints.db)")
+    parser.add_argument("--cache-max-age", type=float, default=CACHE_MAX_AGE_DAYS, metavar="DAYS",
+                        help=f"with --cache, re-read every payload whose hash is older than DAYS "
+                             f"(default {CACHE_MAX_AGE_DAYS:g})")
+    args = parser.parse_args()
+    if args.cache and args.no_fingerprints:
+        parser.error("--cache only applies to fingerprint checks, not to --no-fingerprints")
+    if args.cache_max_age <= 0:
+        parser.error("--cache-max-age must be positive")
+
+    def print_failure(result: VerificationResult) -> None:
+        if not result.ok:
+            print(f"FAILED {result.file_path}: {'; '.join(result.errors)}", file=sys.stderr)
+
+    fingerprints = FingerprintCache(max_age=args.cache_max_age * 86400) if args.cache else None
+    try:
+        summary = verify_archive(args.root, args.report, args.workers, not args.no_fingerprints, print_failure,
+                                 fingerprints)
+    finally:
+        if fingerprints is not None:
+            fingerprints.close()
+    print(f"{summary.total} PDOs checked for consistency (not tampering), {summary.failed} failed, "
+          f"{summary.payload_bytes / (1024 * 1024):.1f} MB in {summary.elapsed:.1f} s "
+          f"({summary.megabytes_per_second:.1f} MB/s)")
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
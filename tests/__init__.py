@@ -0,0 +1,6 @@
+"""
+File: /tests/__init__.py
+Author: Jonathan Carr
+Date: October 2026
+Description: tests init
+"""
@@ -0,0 +1,79 @@
+"""
+File: /tests/conftest.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Shared fixtures: account data, a key service response and PDOs protected with make_pdo
+"""
+
+import os
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from redaqt.models.account import CryptoConfig, Metadata, Product, UserData
+from redaqt.modules.pdo.make_pdo import protected_document_maker
+
+CRYPTO_KEY = "K" * 44
+CERTIFICATE = {
+    "child_certificate_id": "c1",
+    "certificate_type": "Gold",
+    "trace": "t" * 128,
+    "issuer": {"name": "tester"},
+    "authority": {"issuer_name": "RedaQt"},
+}
+
+
+@pytest.fixture
+def user_data() -> UserData:
+    return UserData(account_id="a1", user_fname="Test", user_lname="User", user_alias="tester",
+                    user_email="tester@example.com", user_id="u1", account_type="pro", davinci_enabled=True,
+                    metadata=Metadata(author="Tester", copyright="Arcane Cyber"),
+                    product=Product(name="RedaQt", major_version=2, minor_version=1, patch_version=0,
+                                    extension="epf"),
+                    crypto_config=CryptoConfig(encryption_algorithm="aes", encryption_key_length=256,
+                                               encryption_mode="gcm", hash_algorithm="sha512"))
+
+
+def key_response(crypto_key: str = CRYPTO_KEY) -> SimpleNamespace:
+    """ Key service response to an encrypt request (call_for_encrypt.request_key) """
+    point = SimpleNamespace(i=1.0, j=2.0, k=3.0, radius=4.0)
+    return SimpleNamespace(data=SimpleNamespace(
+        certificate=CERTIFICATE, crypto_key=crypto_key, mos_version="2.1.0", protocol="efemeral",
+        protocol_version="1.0.0", pqc=SimpleNamespace(mid="m1", fid="f1", pq_type="Sphere", point=point)))
+
+
+@pytest.fixture
+def carrier_path(tmp_path):
+    path = tmp_path / "carrier.png"
+    cv2.imwrite(str(path), np.random.default_rng(7).integers(0, 256, (600, 800, 3), dtype=np.uint8))
+    return path
+
+
+def file_data_for(path) -> dict:
+    folder, name = os.path.split(str(path))
+    base, extension = os.path.splitext(name)
+    return {"key": str(path), "filename": base, "filename_extension": extension.lstrip("."),
+            "file_path": folder + os.sep, "date_protected": "2026-10-17 10:00"}
+
+
+def smart_policy_block() -> dict:
+    return {"id": "p" * 256, "certificate_fingerprint": None, "pdo_fingerprint": None, "audit_fingerprint": None}
+
+
+@pytest.fixture
+def protect(user_data, carrier_path):
+    """ protect(path, **kwargs) builds path.epf with protected_document_maker and returns its path """
+    def protect_file(path, **kwargs) -> str:
+        kwargs.setdefault("certificate_format", "tagged")
+        success, error_msg = protected_document_maker(smart_policy_block(), key_response(), file_data_for(path),
+                                                      user_data, str(carrier_path), **kwargs)
+        assert success, error_msg
+        return f"{path}.{user_data.product.extension}"
+    return protect_file
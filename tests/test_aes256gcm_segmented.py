@@ -0,0 +1,178 @@
+"""
+File: /tests/test_aes256gcm_segmented.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Round trip, range reads and tamper rejection of the segmented AES256GCM payload format
+"""
+
+import hashlib
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+from redaqt.modules.lib.aes256gcm_segmented import (ERROR_AUTHENTICATION, ERROR_INVALID_PAYLOAD,
+                                                    SEGMENT_HEADER_SIZE, TAG_SIZE,
+                                                    decrypt_file_aes256gcm_segmented,
+                                                    decrypt_range_aes256gcm_segmented,
+                                                    encrypt_file_aes256gcm_segmented, is_segmented_payload)
+from redaqt.modules.lib.compression import COMPRESSION_LZMA, COMPRESSION_NONE, COMPRESSION_ZLIB
+
+KEY = "K" * 44
+SEGMENT = 4096
+SIZES = [0, 1, SEGMENT - 1, SEGMENT, 3 * SEGMENT, 3 * SEGMENT + 17]
+COMPRESSIONS = [COMPRESSION_NONE, COMPRESSION_ZLIB, COMPRESSION_LZMA]
+
+
+def _plaintext(size: int) -> bytes:
+    """ Compressible but not constant data """
+    return b"".join(b"2026-10-17 line %d status=ok\n" % i for i in range(size // 20 + 1))[:size]
+
+
+def _encrypt(tmp_path: Path, data: bytes, compression: str = COMPRESSION_NONE) -> Path:
+    source = tmp_path / "plain.bin"
+    source.write_bytes(data)
+    success, encrypted_path, error_msg = encrypt_file_aes256gcm_segmented(KEY, source, segment_size=SEGMENT,
+                                                                          max_workers=2, compression=compression)
+    assert success, error_msg
+    encrypted = tmp_path / "payload.enc"
+    os.replace(encrypted_path, encrypted)
+    return encrypted
+
+
+def _decrypt(tmp_path: Path, encrypted: Path, compression: str = COMPRESSION_NONE):
+    return decrypt_file_aes256gcm_segmented(KEY, str(encrypted), tmp_path / "plain.out", max_workers=2,
+                                            compression=compression)
+
+
+def _records(encrypted: Path) -> bytes:
+    """ Ciphertext records of an uncompressed payload (no segment index) """
+    return encrypted.read_bytes()[SEGMENT_HEADER_SIZE:]
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+@pytest.mark.parametrize("size", SIZES)
+def test_round_trip(tmp_path, size, compression):
+    data = _plaintext(size)
+    encrypted = _encrypt(tmp_path, data, compression)
+    assert is_segmented_payload(str(encrypted))
+
+    success, output_path, error_msg = _decrypt(tmp_path, encrypted, compression)
+    assert success, error_msg
+    assert Path(output_path).read_bytes() == data
+
+
+def test_hasher_sees_every_written_byte(tmp_path):
+    source = tmp_path / "plain.bin"
+    source.write_bytes(_plaintext(3 * SEGMENT + 5))
+    hasher = hashlib.sha512()
+    success, encrypted_path, error_msg = encrypt_file_aes256gcm_segmented(KEY, source, hasher, segment_size=SEGMENT)
+    assert success, error_msg
+    assert hasher.digest() == hashlib.sha512(Path(encrypted_path).read_bytes()).digest()
+    os.remove(encrypted_path)
+
+
+def test_temporary_files_do_not_collide(tmp_path):
+    source = tmp_path / "report.bin"
+    source.write_bytes(_plaintext(100))
+    first = encrypt_file_aes256gcm_segmented(KEY, source)[1]
+    second = encrypt_file_aes256gcm_segmented(KEY, source)[1]
+    assert first != second
+    os.remove(first)
+    os.remove(second)
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_range_reads(tmp_path, compression):
+    data = _plaintext(5 * SEGMENT + 123)
+    encrypted = _encrypt(tmp_path, data, compression)
+    rnd = random.Random(5)
+
+    ranges = [(0, 0), (0, 1), (SEGMENT - 1, 2), (SEGMENT, SEGMENT), (len(data) - 3, 10), (len(data) + 5, 10)]
+    ranges += [(rnd.randrange(len(data)), rnd.randrange(3 * SEGMENT)) for _ in range(25)]
+    for offset, length in ranges:
+        success, plaintext, error_msg = decrypt_range_aes256gcm_segmented(KEY, str(encrypted), offset, length,
+                                                                          compression=compression)
+        assert success, error_msg
+        assert plaintext == data[offset:offset + length]
+
+
+def test_compressed_payload_needs_its_algorithm(tmp_path):
+    encrypted = _encrypt(tmp_path, _plaintext(2 * SEGMENT), COMPRESSION_ZLIB)
+    assert _decrypt(tmp_path, encrypted) == (False, None, ERROR_INVALID_PAYLOAD)
+    assert not decrypt_range_aes256gcm_segmented(KEY, str(encrypted), 0, 10)[0]
+
+
+def test_wrong_key_is_rejected(tmp_path):
+    encrypted = _encrypt(tmp_path, _plaintext(2 * SEGMENT))
+    success, _, error_msg = decrypt_file_aes256gcm_segmented("L" * 44, str(encrypted), tmp_path / "plain.out")
+    assert (success, error_msg) == (False, ERROR_AUTHENTICATION)
+    assert not (tmp_path / "plain.out").exists()
+
+
+def test_flipped_byte_is_rejected(tmp_path):
+    data = _plaintext(3 * SEGMENT)
+    encrypted = _encrypt(tmp_path, data)
+    payload = bytearray(encrypted.read_bytes())
+    payload[SEGMENT_HEADER_SIZE + SEGMENT + TAG_SIZE + 10] ^= 0x01     # inside the second record
+    encrypted.write_bytes(payload)
+
+    assert _decrypt(tmp_path, encrypted) == (False, None, ERROR_AUTHENTICATION)
+    assert not (tmp_path / "plain.out").exists()
+
+    # Only the ranges covering the damaged segment fail
+    assert decrypt_range_aes256gcm_segmented(KEY, str(encrypted), 0, SEGMENT) == (True, data[:SEGMENT], None)
+    assert decrypt_range_aes256gcm_segmented(KEY, str(encrypted), SEGMENT, 1) == (False, None, ERROR_AUTHENTICATION)
+
+
+def test_flipped_header_is_rejected(tmp_path):
+    encrypted = _encrypt(tmp_path, _plaintext(SEGMENT + 1))
+    payload = bytearray(encrypted.read_bytes())
+    payload[SEGMENT_HEADER_SIZE - 1] ^= 0x01    # nonce prefix, authenticated as associated data
+    encrypted.write_bytes(payload)
+    assert not _decrypt(tmp_path, encrypted)[0]
+
+
+def test_reordered_segments_are_rejected(tmp_path):
+    encrypted = _encrypt(tmp_path, _plaintext(3 * SEGMENT + 17))
+    header = encrypted.read_bytes()[:SEGMENT_HEADER_SIZE]
+    records = _records(encrypted)
+    record = SEGMENT + TAG_SIZE
+    first, second, rest = records[:record], records[record:2 * record], records[2 * record:]
+    encrypted.write_bytes(header + second + first + rest)
+
+    assert _decrypt(tmp_path, encrypted) == (False, None, ERROR_AUTHENTICATION)
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_truncated_payload_is_rejected(tmp_path, compression):
+    encrypted = _encrypt(tmp_path, _plaintext(3 * SEGMENT), compression)
+    payload = encrypted.read_bytes()
+
+    for cut in (1, TAG_SIZE, SEGMENT + TAG_SIZE):
+        encrypted.write_bytes(payload[:-cut])
+        assert not _decrypt(tmp_path, encrypted, compression)[0]
+        assert not (tmp_path / "plain.out").exists()
+
+
+def test_dropped_final_segment_is_rejected(tmp_path):
+    # Segment boundaries line up, only the last-segment flag in the nonce catches the truncation
+    encrypted = _encrypt(tmp_path, _plaintext(3 * SEGMENT))
+    payload = encrypted.read_bytes()
+    encrypted.write_bytes(payload[:-(SEGMENT + TAG_SIZE)])
+
+    assert _decrypt(tmp_path, encrypted) == (False, None, ERROR_AUTHENTICATION)
+
+
+def test_uncompressed_payload_with_compression_is_rejected(tmp_path):
+    # Header version 2 is only ever written without compression
+    encrypted = _encrypt(tmp_path, _plaintext(2 * SEGMENT))
+    assert _decrypt(tmp_path, encrypted, COMPRESSION_ZLIB) == (False, None, ERROR_INVALID_PAYLOAD)
+    assert decrypt_range_aes256gcm_segmented(KEY, str(encrypted), 0, 10, compression=COMPRESSION_ZLIB) == \
+        (False, None, ERROR_INVALID_PAYLOAD)
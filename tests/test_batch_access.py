@@ -0,0 +1,153 @@
+"""
+File: /tests/test_batch_access.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Batch access with the key service replaced: completion order, failures, in-flight bound, totals
+"""
+
+import threading
+import time
+
+import pytest
+
+from redaqt.modules.pdo import batch_access
+from redaqt.modules.pdo.access_pdo import get_pdo_metadata
+from redaqt.modules.pdo.batch_access import ERROR_UNEXPECTED, BatchAccessEngine
+from redaqt.modules.pdo.protected_document import open_protected_document
+from tests.conftest import CRYPTO_KEY
+
+
+class KeyService:
+    """ Stands in for request_crypto_key: answers per file after an optional delay, or fails """
+
+    def __init__(self, names_by_fingerprint, delays=None, errors=None):
+        self.names_by_fingerprint = names_by_fingerprint
+        self.delays = delays or {}
+        self.errors = errors or {}
+
+    def __call__(self, user_data, metadata):
+        name = self.names_by_fingerprint[metadata["pdo_fingerprint"]]
+        time.sleep(self.delays.get(name, 0))
+        error = self.errors.get(name)
+        if isinstance(error, Exception):
+            raise error
+        if error is not None:
+            return False, error, None
+        return True, None, CRYPTO_KEY
+
+
+@pytest.fixture
+def documents(tmp_path, protect):
+    """ {name: (pdo path, plaintext)} of four protected files """
+    documents = {}
+    for index, name in enumerate("abcd"):
+        source = tmp_path / f"{name}.txt"
+        plaintext = f"document {name}\n".encode() * (2000 * (index + 1))
+        source.write_bytes(plaintext)
+        documents[name] = (protect(source), plaintext)
+    return documents
+
+
+def _key_service(monkeypatch, documents, **kwargs) -> KeyService:
+    names = {get_pdo_metadata(pdo_path)[2]["pdo_fingerprint"]: name for name, (pdo_path, _) in documents.items()}
+    service = KeyService(names, **kwargs)
+    monkeypatch.setattr(batch_access, "request_crypto_key", service)
+    return service
+
+
+def _name(documents, result) -> str:
+    return next(name for name, (pdo_path, _) in documents.items() if pdo_path == result.file_path)
+
+
+def test_results_arrive_in_completion_order(documents, monkeypatch):
+    _key_service(monkeypatch, documents, delays={"a": 0.5})
+    paths = [pdo_path for pdo_path, _ in documents.values()]
+
+    results = list(BatchAccessEngine(max_workers=2, max_key_requests=4).iter_results(None, paths))
+    assert [_name(documents, result) for result in results][-1] == "a"
+    assert all(result.success for result in results)
+    for result in results:
+        assert result.output_path.read_bytes() == documents[_name(documents, result)][1]
+        assert result.davinci_certificate is not None
+    assert max(results, key=lambda result: result.key_request_time) is results[-1]
+
+
+@pytest.mark.parametrize("error", ["Access denied", RuntimeError("connection reset")])
+def test_failing_key_request_does_not_block_the_others(documents, monkeypatch, error):
+    _key_service(monkeypatch, documents, delays={"b": 0.2}, errors={"b": error})
+    paths = [pdo_path for pdo_path, _ in documents.values()]
+
+    summary = BatchAccessEngine(max_workers=2, max_key_requests=2).run(None, paths)
+    assert (summary.completed, summary.failed) == (4, 1)
+    failure = summary.failures[0]
+    assert _name(documents, failure) == "b"
+    assert failure.error_msg == (error if isinstance(error, str) else ERROR_UNEXPECTED)
+    assert failure.output_path is None
+
+
+def test_missing_file_fails_in_the_prepare_stage(documents, monkeypatch, tmp_path):
+    _key_service(monkeypatch, documents)
+    paths = [documents["a"][0], str(tmp_path / "missing.txt.epf")]
+    summary = BatchAccessEngine().run(None, paths)
+    assert (summary.completed, summary.failed) == (2, 1)
+    assert summary.failures[0].file_path == paths[1]
+
+
+def test_open_documents_stay_within_max_in_flight(documents, monkeypatch):
+    _key_service(monkeypatch, documents, delays={name: 0.05 for name in documents})
+    lock = threading.Lock()
+    open_documents = []
+    most_open = []
+
+    def counting_open(file_path):
+        success, error_msg, document = open_protected_document(file_path)
+        close = document.close
+
+        def counted_close():
+            with lock:
+                if document in open_documents:
+                    open_documents.remove(document)
+            close()
+
+        document.close = counted_close
+        with lock:
+            open_documents.append(document)
+            most_open.append(len(open_documents))
+        return success, error_msg, document
+
+    monkeypatch.setattr(batch_access, "open_protected_document", counting_open)
+    paths = [pdo_path for pdo_path, _ in documents.values()] * 3
+
+    summary = BatchAccessEngine(max_workers=2, max_key_requests=4, max_in_flight=2).run(None, paths)
+    assert (summary.completed, summary.failed) == (12, 0)
+    assert max(most_open) == 2
+    assert open_documents == []
+
+
+def test_summary_totals_and_throughput(documents, monkeypatch):
+    _key_service(monkeypatch, documents)
+    paths = [pdo_path for pdo_path, _ in documents.values()]
+    running = []
+
+    summary = BatchAccessEngine().run(None, paths, on_result=lambda result, totals: running.append(totals.completed))
+    assert running == [1, 2, 3, 4]
+
+    payload_bytes = 0
+    for pdo_path in paths:
+        success, error_msg, document = open_protected_document(pdo_path)
+        with document:
+            payload_bytes += sum(attachment.length for attachment in document.get_attachments()[2])
+    assert summary.payload_bytes == payload_bytes
+    assert summary.files_per_second == pytest.approx(4 / summary.elapsed)
+    assert summary.megabytes_per_second == pytest.approx(payload_bytes / (1024 * 1024) / summary.elapsed)
+
+
+def test_summary_throughput_of_an_empty_batch():
+    summary = BatchAccessEngine().run(None, [])
+    assert (summary.total, summary.completed, summary.payload_bytes) == (0, 0, 0)
+    assert (summary.files_per_second, summary.megabytes_per_second) == (0.0, 0.0)
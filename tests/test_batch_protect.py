@@ -0,0 +1,122 @@
+"""
+File: /tests/test_batch_protect.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Batch protection with the key service replaced: PDOs that decrypt, failures, encryption threads
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from redaqt.modules.pdo import batch_protect
+from redaqt.modules.pdo.access_pdo import decrypt_attachments, prepare_access
+from redaqt.modules.pdo.batch_protect import BatchProtectionEngine, build_protection_jobs
+from redaqt.modules.pdo.protected_document import open_protected_document
+from tests.conftest import CRYPTO_KEY, key_response, smart_policy_block
+
+
+@pytest.fixture
+def key_service(monkeypatch):
+    """ request_key of call_for_encrypt answering every request with key_response() """
+    monkeypatch.setattr(batch_protect, "request_key", lambda user_data, add_certificate: (False, None, key_response()))
+
+
+@pytest.fixture
+def sources(tmp_path):
+    sources = {}
+    for name in ("a.txt", "b.csv"):
+        path = tmp_path / name
+        path.write_bytes(f"{name},value\n".encode() * 5000)
+        sources[str(path)] = path.read_bytes()
+    return sources
+
+
+def _jobs(paths, user_data, carrier_path):
+    return build_protection_jobs(list(paths), smart_policy_block(), user_data, str(carrier_path), False,
+                                 "2026-10-17 10:00")
+
+
+def _decrypt(pdo_path) -> bytes:
+    success, error_msg, document = open_protected_document(pdo_path)
+    assert success, error_msg
+    with document:
+        success, error_msg, context = prepare_access(document)
+        assert success, error_msg
+        success, error_msg, output_path = decrypt_attachments(document, context, CRYPTO_KEY)
+        assert success, error_msg
+    return output_path.read_bytes()
+
+
+def test_batch_of_two_files_decrypts(sources, user_data, carrier_path, key_service):
+    progress = BatchProtectionEngine(max_workers=1).run(_jobs(sources, user_data, carrier_path))
+    assert (progress.completed, progress.failed) == (2, 0)
+    for path, plaintext in sources.items():
+        assert _decrypt(f"{path}.epf") == plaintext
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="worker processes only inherit the replaced key service when forked")
+def test_batch_of_two_files_decrypts_in_worker_processes(sources, user_data, carrier_path, key_service):
+    results = list(BatchProtectionEngine(max_workers=2).iter_results(_jobs(sources, user_data, carrier_path)))
+    assert sorted(result.pdo_path for result in results) == sorted(f"{path}.epf" for path in sources)
+    for path, plaintext in sources.items():
+        assert _decrypt(f"{path}.epf") == plaintext
+
+
+def test_failing_job_reports_its_failure(sources, user_data, carrier_path, key_service, tmp_path):
+    missing = str(tmp_path / "missing.txt")
+    paths = [*sources, missing]
+
+    progress = BatchProtectionEngine(max_workers=1).run(_jobs(paths, user_data, carrier_path))
+    assert (progress.completed, progress.failed) == (3, 1)
+    failure = progress.failures[0]
+    assert failure.file_data["key"] == missing
+    assert not failure.success and failure.error_msg and failure.pdo_path is None
+    assert not os.path.exists(f"{missing}.epf")
+
+
+def test_key_service_error_is_reported(sources, user_data, carrier_path, monkeypatch):
+    monkeypatch.setattr(batch_protect, "request_key",
+                        lambda user_data, add_certificate: (True, "Key service unavailable", None))
+    progress = BatchProtectionEngine(max_workers=1).run(_jobs(sources, user_data, carrier_path))
+    assert progress.failed == 2
+    assert {failure.error_msg for failure in progress.failures} == {"Key service unavailable"}
+
+
+def test_cancel_stops_the_batch(sources, user_data, carrier_path, key_service):
+    engine = BatchProtectionEngine(max_workers=1)
+    progress = engine.run(_jobs(sources, user_data, carrier_path), on_result=lambda result, totals: engine.cancel())
+    assert (progress.total, progress.completed) == (2, 1)
+
+
+def test_worker_processes_share_the_cpus(sources, user_data, carrier_path, key_service, monkeypatch):
+    encryption_workers = []
+    lock = threading.Lock()
+    protected_document_maker = batch_protect.protected_document_maker
+
+    def recording_maker(*args, max_workers=None, **kwargs):
+        with lock:
+            encryption_workers.append(max_workers)
+        return protected_document_maker(*args, max_workers=max_workers, **kwargs)
+
+    # Threads stand in for the worker processes so the calls can be observed
+    monkeypatch.setattr(batch_protect, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(batch_protect, "protected_document_maker", recording_maker)
+    monkeypatch.setattr(batch_protect.os, "cpu_count", lambda: 8)
+
+    progress = BatchProtectionEngine(max_workers=2).run(_jobs(sources, user_data, carrier_path))
+    assert progress.failed == 0
+    assert encryption_workers == [4, 4]
+
+    encryption_workers.clear()
+    BatchProtectionEngine(max_workers=1).run(_jobs(sources, user_data, carrier_path))
+    assert encryption_workers == [None, None]
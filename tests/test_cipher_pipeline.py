@@ -0,0 +1,145 @@
+"""
+File: /tests/test_cipher_pipeline.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: The pipelined and single-threaded cipher loops agree at chunk boundaries and surface errors
+"""
+
+import io
+import os
+import threading
+
+import pytest
+
+from redaqt.modules.lib.cipher_pipeline import run_cipher_pipeline, stream_cipher
+from redaqt.modules.lib.crypto_session import CryptoSession
+
+KEY = "K" * 44
+IV = bytes(range(12))
+CHUNK_SIZE = 4096
+TIMEOUT = 10
+
+
+def _encrypt(session, data: bytes, pipelined: bool, length=None):
+    output = bytearray()
+    encryptor = session.gcm_encryptor(IV)
+    processed = stream_cipher(io.BytesIO(data), output.extend, encryptor.update_into, length=length,
+                              chunk_size=CHUNK_SIZE, pipelined=pipelined)
+    output.extend(encryptor.finalize())
+    return processed, bytes(output), encryptor.tag
+
+
+def _decrypt(session, ciphertext: bytes, tag: bytes, pipelined: bool) -> bytes:
+    output = bytearray()
+    decryptor = session.gcm_decryptor(IV, tag)
+    stream_cipher(io.BytesIO(ciphertext), output.extend, decryptor.update_into, chunk_size=CHUNK_SIZE,
+                  pipelined=pipelined)
+    output.extend(decryptor.finalize())
+    return bytes(output)
+
+
+def _run(function, *args, **kwargs):
+    """ Call function on a thread and fail instead of hanging if it does not return within TIMEOUT """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = function(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(TIMEOUT)
+    assert not thread.is_alive(), f"{function.__name__} did not return"
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+@pytest.mark.parametrize("pipelined", [True, False])
+@pytest.mark.parametrize("size", [0, 1, CHUNK_SIZE, CHUNK_SIZE + 1, 10 * CHUNK_SIZE - 1])
+def test_round_trip(size, pipelined):
+    data = os.urandom(size)
+    with CryptoSession(KEY) as session:
+        processed, ciphertext, tag = _run(_encrypt, session, data, pipelined)
+        assert processed == size
+        assert _run(_decrypt, session, ciphertext, tag, pipelined) == data
+
+
+@pytest.mark.parametrize("size", [0, CHUNK_SIZE, CHUNK_SIZE + 1, 5 * CHUNK_SIZE + 7])
+def test_pipelined_and_single_threaded_agree(size):
+    data = os.urandom(size)
+    with CryptoSession(KEY) as session:
+        assert _run(_encrypt, session, data, True) == _run(_encrypt, session, data, False)
+
+
+@pytest.mark.parametrize("pipelined", [True, False])
+def test_length_stops_before_the_end(pipelined):
+    data = os.urandom(3 * CHUNK_SIZE)
+    with CryptoSession(KEY) as session:
+        processed, ciphertext, tag = _run(_encrypt, session, data, pipelined, CHUNK_SIZE + 1)
+        assert processed == CHUNK_SIZE + 1
+        assert _run(_decrypt, session, ciphertext, tag, pipelined) == data[:CHUNK_SIZE + 1]
+
+
+@pytest.mark.parametrize("pipelined", [True, False])
+def test_short_input_raises(pipelined):
+    with CryptoSession(KEY) as session:
+        with pytest.raises(EOFError):
+            _run(_encrypt, session, bytes(CHUNK_SIZE), pipelined, 2 * CHUNK_SIZE)
+
+
+class FailingReader(io.BytesIO):
+    """ Raises on the nth readinto """
+
+    def __init__(self, data: bytes, fail_at: int):
+        super().__init__(data)
+        self.calls = 0
+        self.fail_at = fail_at
+
+    def readinto(self, buffer):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise OSError("read failed")
+        return super().readinto(buffer)
+
+
+@pytest.mark.parametrize("fail_at", [1, 3])
+def test_reader_error_propagates(fail_at):
+    with CryptoSession(KEY) as session:
+        encryptor = session.gcm_encryptor(IV)
+        with pytest.raises(OSError, match="read failed"):
+            _run(run_cipher_pipeline, FailingReader(bytes(20 * CHUNK_SIZE), fail_at), lambda data: None,
+                 encryptor.update_into, chunk_size=CHUNK_SIZE, buffers=2)
+
+
+@pytest.mark.parametrize("fail_at", [1, 3])
+def test_writer_error_propagates(fail_at):
+    written = []
+
+    def write(data):
+        if len(written) + 1 == fail_at:
+            raise OSError("disk full")
+        written.append(bytes(data))
+
+    with CryptoSession(KEY) as session:
+        encryptor = session.gcm_encryptor(IV)
+        with pytest.raises(OSError, match="disk full"):
+            _run(run_cipher_pipeline, io.BytesIO(bytes(20 * CHUNK_SIZE)), write, encryptor.update_into,
+                 chunk_size=CHUNK_SIZE, buffers=2)
+    assert len(written) == fail_at - 1
+
+
+def test_cipher_error_propagates():
+    def update_into(data, buffer):
+        raise ValueError("cipher failed")
+
+    with pytest.raises(ValueError, match="cipher failed"):
+        _run(run_cipher_pipeline, io.BytesIO(bytes(20 * CHUNK_SIZE)), lambda data: None, update_into,
+             chunk_size=CHUNK_SIZE, buffers=2)
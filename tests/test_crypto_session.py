@@ -0,0 +1,113 @@
+"""
+File: /tests/test_crypto_session.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: A CryptoSession encrypts and decrypts exactly like its key string, and refuses to once closed
+"""
+
+import json
+import os
+
+import pytest
+
+from redaqt.modules.lib.aes256gcm_segmented import (decrypt_file_aes256gcm_segmented,
+                                                    encrypt_file_aes256gcm_segmented)
+from redaqt.modules.lib.crypto_session import ERROR_SESSION_CLOSED, CryptoSession, use_session
+from redaqt.modules.lib.decrypt_aes256gcm import decrypt_file_aes256gcm, decrypt_object_aes256gcm
+from redaqt.modules.lib.encrypt_aes256gcm import encrypt_file_aes256gcm, encrypt_object_aes256gcm
+
+KEY = "K" * 44
+IV = bytes(range(12))
+OBJECT = {"id": "p1", "policy": [{"type": "none"}], "note": "Müller"}
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_bytes(os.urandom(100_000))
+    return path
+
+
+def test_use_session_opens_and_closes_a_session_for_a_key_string():
+    with use_session(KEY) as session:
+        assert isinstance(session, CryptoSession) and not session.closed
+    assert session.closed
+
+
+def test_use_session_keeps_the_callers_session_open():
+    with CryptoSession(KEY) as session:
+        with use_session(session) as used:
+            assert used is session
+        assert not session.closed
+
+
+def test_object_matches_key_string():
+    success, from_key, error_msg = encrypt_object_aes256gcm(IV, KEY, OBJECT)
+    assert success, error_msg
+    with CryptoSession(KEY) as session:
+        assert encrypt_object_aes256gcm(IV, session, OBJECT) == (True, from_key, None)
+        plaintext = decrypt_object_aes256gcm(session, from_key)
+    assert plaintext == decrypt_object_aes256gcm(KEY, from_key)
+    assert plaintext[0] and json.loads(plaintext[1]) == OBJECT
+
+
+def test_file_matches_key_string(source, tmp_path):
+    success, from_key_path, error_msg = encrypt_file_aes256gcm(IV, KEY, source)
+    assert success, error_msg
+    with CryptoSession(KEY) as session:
+        success, from_session_path, error_msg = encrypt_file_aes256gcm(IV, session, source)
+        assert success, error_msg
+        assert open(from_session_path, "rb").read() == open(from_key_path, "rb").read()
+
+        success, output_path, error_msg = decrypt_file_aes256gcm(session, from_key_path, tmp_path / "session.txt")
+        assert success, error_msg
+    success, key_output_path, error_msg = decrypt_file_aes256gcm(KEY, from_session_path, tmp_path / "key.txt")
+    assert success, error_msg
+    assert open(output_path, "rb").read() == open(key_output_path, "rb").read() == source.read_bytes()
+    for path in (from_key_path, from_session_path):
+        os.remove(path)
+
+
+def test_segmented_file_decrypts_with_either(source, tmp_path):
+    # Segment nonces are random, so the ciphertexts differ; each one decrypts with the other key form
+    with CryptoSession(KEY) as session:
+        success, from_session_path, error_msg = encrypt_file_aes256gcm_segmented(session, source, segment_size=4096)
+        assert success, error_msg
+    success, from_key_path, error_msg = encrypt_file_aes256gcm_segmented(KEY, source, segment_size=4096)
+    assert success, error_msg
+
+    with CryptoSession(KEY) as session:
+        success, output_path, error_msg = decrypt_file_aes256gcm_segmented(session, from_key_path,
+                                                                           tmp_path / "session.txt")
+        assert success, error_msg
+        assert open(output_path, "rb").read() == source.read_bytes()
+    success, output_path, error_msg = decrypt_file_aes256gcm_segmented(KEY, from_session_path, tmp_path / "key.txt")
+    assert success, error_msg
+    assert open(output_path, "rb").read() == source.read_bytes()
+    for path in (from_key_path, from_session_path):
+        os.remove(path)
+
+
+def test_closed_session_raises():
+    session = CryptoSession(KEY)
+    session.close()
+    assert session.closed
+    for build in (session.aesgcm, lambda: session.gcm_encryptor(IV), lambda: session.gcm_decryptor(IV, bytes(16))):
+        with pytest.raises(ValueError, match=ERROR_SESSION_CLOSED):
+            build()
+
+
+def test_closed_session_fails_the_lib_functions(source, tmp_path):
+    with CryptoSession(KEY) as session:
+        success, ciphertext, error_msg = encrypt_object_aes256gcm(IV, session, OBJECT)
+    assert session.closed
+
+    assert encrypt_object_aes256gcm(IV, session, OBJECT)[0] is False
+    assert decrypt_object_aes256gcm(session, ciphertext)[0] is False
+    assert encrypt_file_aes256gcm(IV, session, source)[:2] == (False, None)
+    assert encrypt_file_aes256gcm_segmented(session, source)[:2] == (False, None)
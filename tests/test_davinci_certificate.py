@@ -0,0 +1,91 @@
+"""
+File: /tests/test_davinci_certificate.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Embedding DaVinci certificates (tagged and binary) and reading them back with read_certificate
+"""
+
+import importlib
+
+import cv2
+import numpy as np
+import pytest
+
+from redaqt.modules.certs.carrier_cache import CarrierCache
+from redaqt.modules.certs.encoder_image import (BINARY_HEADER, CARRIER_CACHE_DIR_ENV, CERTIFICATE_FORMAT_BINARY,
+                                                CERTIFICATE_FORMAT_TAGGED, build_certificate_binary, encoder_image,
+                                                parse_certificate_binary, read_certificate, shared_carrier_cache)
+from redaqt.modules.lib.b64_encoder_decoder import encode_dict_to_base64
+
+CERTIFICATE = {
+    "child_certificate_id": "c1",
+    "certificate_type": "Gold",
+    "trace": "t" * 128,
+    "issuer": {"name": "tester"},
+    "authority": {"issuer_name": "RedaQt"},
+}
+
+
+@pytest.fixture
+def carrier_path(tmp_path):
+    path = tmp_path / "carrier.png"
+    cv2.imwrite(str(path), np.random.default_rng(7).integers(0, 256, (600, 800, 3), dtype=np.uint8))
+    return path
+
+
+def _embed(carrier_path, certificate_format: str) -> np.ndarray:
+    certificate = CERTIFICATE if certificate_format == CERTIFICATE_FORMAT_BINARY else encode_dict_to_base64(CERTIFICATE)
+    success, image = encoder_image(certificate, carrier_path, certificate_format, carrier_cache=CarrierCache(None))
+    assert success
+    return image
+
+
+def _flip_bit(image: np.ndarray, bit_index: int) -> None:
+    """ Flip one embedded certificate bit (blue channel LSB, row by row) """
+    row, column = divmod(bit_index, image.shape[1])
+    image[row, column, 2] ^= 1
+
+
+@pytest.mark.parametrize("certificate_format", [CERTIFICATE_FORMAT_TAGGED, CERTIFICATE_FORMAT_BINARY])
+def test_embed_and_read(carrier_path, certificate_format):
+    image = _embed(carrier_path, certificate_format)
+    assert read_certificate(image) == CERTIFICATE
+
+
+@pytest.mark.parametrize("byte_index", [BINARY_HEADER.size + 3, -1], ids=["body", "crc"])
+def test_binary_crc_mismatch_is_rejected(carrier_path, byte_index):
+    image = _embed(carrier_path, CERTIFICATE_FORMAT_BINARY)
+    byte_index %= len(build_certificate_binary(CERTIFICATE))
+    _flip_bit(image, byte_index * 8 + 7)
+    assert read_certificate(image) == {}
+
+
+def test_binary_payload_crc():
+    payload = bytearray(build_certificate_binary(CERTIFICATE))
+    assert parse_certificate_binary(bytes(payload)) == CERTIFICATE
+
+    payload[-1] ^= 0x01
+    assert parse_certificate_binary(bytes(payload)) is None
+    assert parse_certificate_binary(bytes(payload[:BINARY_HEADER.size])) is None
+
+
+def test_image_without_certificate(carrier_path):
+    image = cv2.imread(str(carrier_path)) & 0xFE
+    assert read_certificate(image) == {}
+
+
+def test_shared_carrier_cache_is_in_memory_by_default(tmp_path, monkeypatch):
+    # The certs package exports the encoder_image function under the module's name
+    encoder_module = importlib.import_module("redaqt.modules.certs.encoder_image")
+    monkeypatch.delenv(CARRIER_CACHE_DIR_ENV, raising=False)
+    monkeypatch.setattr(encoder_module, "_shared_carrier_cache", None)
+    assert shared_carrier_cache().cache_dir is None
+
+    monkeypatch.setenv(CARRIER_CACHE_DIR_ENV, str(tmp_path / "carriers"))
+    monkeypatch.setattr(encoder_module, "_shared_carrier_cache", None)
+    assert shared_carrier_cache().cache_dir == tmp_path / "carriers"
@@ -0,0 +1,65 @@
+"""
+File: /tests/test_decrypt_aes256cbc.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Parallel AES256CBC file decryption matches the serial decryption
+"""
+
+import os
+
+import pytest
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.padding import PKCS7
+
+from redaqt.modules.lib.decrypt_aes256cbc import (BLOCK_SIZE, decrypt_file_aes256cbc,
+                                                  decrypt_file_aes256cbc_parallel)
+
+KEY = "k" * 32
+IV = "i" * 16
+
+
+def _encrypt(tmp_path, data: bytes):
+    """ Write data as <name>.enc the way the legacy CBC files were produced """
+    padder = PKCS7(128).padder()
+    encryptor = Cipher(algorithms.AES(KEY.encode()), modes.CBC(IV.encode())).encryptor()
+    encrypted = tmp_path / "doc.bin.enc"
+    encrypted.write_bytes(encryptor.update(padder.update(data) + padder.finalize()) + encryptor.finalize())
+    return encrypted
+
+
+@pytest.mark.parametrize("size", [0, 1, BLOCK_SIZE - 1, BLOCK_SIZE, 5 * BLOCK_SIZE + 3, 1000, 4099])
+@pytest.mark.parametrize("range_size", [BLOCK_SIZE, 3 * BLOCK_SIZE, 50, 1024])
+def test_parallel_matches_serial(tmp_path, size, range_size):
+    data = os.urandom(size)
+    encrypted = _encrypt(tmp_path, data)
+    (tmp_path / "serial").mkdir()
+    (tmp_path / "parallel").mkdir()
+
+    assert decrypt_file_aes256cbc(IV, KEY, str(encrypted), tmp_path / "serial", parallel=False)
+    assert decrypt_file_aes256cbc_parallel(IV, KEY, str(encrypted), tmp_path / "parallel",
+                                           range_size=range_size, max_workers=3)
+
+    serial = (tmp_path / "serial" / "doc.bin").read_bytes()
+    assert serial == data
+    assert (tmp_path / "parallel" / "doc.bin").read_bytes() == serial
+
+
+def test_bad_padding_removes_output(tmp_path):
+    encrypted = _encrypt(tmp_path, bytes(range(250)) * 4)
+    ciphertext = bytearray(encrypted.read_bytes())
+    ciphertext[-1] ^= 0xFF      # the last block no longer decrypts to valid PKCS7 padding
+    encrypted.write_bytes(ciphertext)
+
+    assert not decrypt_file_aes256cbc_parallel(IV, KEY, str(encrypted), tmp_path, range_size=64)
+    assert not (tmp_path / "doc.bin").exists()
+
+
+def test_unaligned_ciphertext_is_rejected(tmp_path):
+    encrypted = _encrypt(tmp_path, os.urandom(100))
+    encrypted.write_bytes(encrypted.read_bytes()[:-1])
+    assert not decrypt_file_aes256cbc_parallel(IV, KEY, str(encrypted), tmp_path, range_size=64)
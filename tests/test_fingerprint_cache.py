@@ -0,0 +1,159 @@
+"""
+File: /tests/test_fingerprint_cache.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Hits, misses, expiry and pruning of the SHA-512 fingerprint cache
+"""
+
+import itertools
+import os
+
+import pytest
+
+from redaqt.modules.lib import fingerprint_cache
+from redaqt.modules.lib.fingerprint_cache import KIND_PDO_PAYLOAD, LOOKUP_BATCH, FingerprintCache
+from redaqt.modules.lib.hash_sha_library import hash_file_sha512
+
+
+class Compute:
+    """ compute callable counting its calls """
+
+    def __init__(self, digest: str = "d" * 128):
+        self.digest = digest
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        return self.digest
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "fingerprints.db"
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "doc.epf"
+    path.write_bytes(b"protected document")
+    return path
+
+
+def test_hit_skips_compute(db_path, document):
+    compute = Compute()
+    with FingerprintCache(db_path) as cache:
+        assert cache.fingerprint(document, KIND_PDO_PAYLOAD, compute) == compute.digest
+        assert cache.fingerprint(document, KIND_PDO_PAYLOAD, compute) == compute.digest
+    assert compute.calls == 1
+
+    # Another process finds it in SQLite
+    with FingerprintCache(db_path) as cache:
+        assert cache.fingerprint(document, KIND_PDO_PAYLOAD, compute) == compute.digest
+        assert cache.lookup(document) is None       # other kind
+    assert compute.calls == 1
+
+
+def test_default_compute_hashes_the_file(db_path, document):
+    with FingerprintCache(db_path) as cache:
+        assert cache.fingerprint(document) == hash_file_sha512(document)
+
+
+def test_changed_size_misses(db_path, document):
+    with FingerprintCache(db_path) as cache:
+        cache.fingerprint(document, KIND_PDO_PAYLOAD, Compute())
+        with open(document, "ab") as fout:
+            fout.write(b"!")
+        assert cache.lookup(document, KIND_PDO_PAYLOAD) is None
+
+
+def test_changed_mtime_misses(db_path, document):
+    with FingerprintCache(db_path) as cache:
+        cache.fingerprint(document, KIND_PDO_PAYLOAD, Compute())
+        stat = os.stat(document)
+        os.utime(document, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert cache.lookup(document, KIND_PDO_PAYLOAD) is None
+
+
+def test_expired_entry_misses(db_path, document, monkeypatch):
+    now = fingerprint_cache.time.time_ns()
+    monkeypatch.setattr(fingerprint_cache.time, "time_ns", lambda: now)
+    with FingerprintCache(db_path, max_age=60) as cache:
+        cache.fingerprint(document, KIND_PDO_PAYLOAD, Compute())
+        assert cache.lookup(document, KIND_PDO_PAYLOAD) is not None
+
+        monkeypatch.setattr(fingerprint_cache.time, "time_ns", lambda: now + 61 * 10 ** 9)
+        compute = Compute()
+        assert cache.lookup(document, KIND_PDO_PAYLOAD) is None
+        cache.fingerprint(document, KIND_PDO_PAYLOAD, compute)
+        assert compute.calls == 1
+
+    # Expiry also applies to the SQLite copy
+    monkeypatch.setattr(fingerprint_cache.time, "time_ns", lambda: now + 200 * 10 ** 9)
+    with FingerprintCache(db_path, max_age=60) as cache:
+        assert cache.lookup(document, KIND_PDO_PAYLOAD) is None
+
+
+def test_fingerprint_many_batches(db_path, tmp_path, monkeypatch):
+    paths = []
+    for index in range(LOOKUP_BATCH + 50):
+        path = tmp_path / f"file{index}.bin"
+        path.write_bytes(b"content %d" % index)
+        paths.append(path)
+    expected = {str(path): hash_file_sha512(path) for path in paths}
+
+    with FingerprintCache(db_path) as cache:
+        assert cache.fingerprint_many(paths) == expected
+
+    def unexpected_hash(*args):
+        raise AssertionError("a cached file was hashed again")
+    monkeypatch.setattr(fingerprint_cache, "hash_file_sha512", unexpected_hash)
+
+    with FingerprintCache(db_path) as cache:
+        assert cache.fingerprint_many(paths) == expected
+        assert cache.lookup_many(paths) == expected
+
+
+def test_file_changed_while_hashing_is_not_stored(db_path, document):
+    def compute_while_written():
+        with open(document, "ab") as fout:
+            fout.write(b"appended while hashing")
+        return "d" * 128
+
+    with FingerprintCache(db_path) as cache:
+        assert cache.fingerprint(document, KIND_PDO_PAYLOAD, compute_while_written) == "d" * 128
+        assert cache.lookup(document, KIND_PDO_PAYLOAD) is None
+
+
+def test_missing_file(db_path, tmp_path):
+    compute = Compute()
+    with FingerprintCache(db_path) as cache:
+        assert cache.fingerprint(tmp_path / "missing.epf", KIND_PDO_PAYLOAD, compute) is None
+        assert cache.fingerprint_many([tmp_path / "missing.epf"]) == {str(tmp_path / "missing.epf"): None}
+    assert compute.calls == 0
+
+
+def test_prune_keeps_most_recently_used(db_path, tmp_path, monkeypatch):
+    clock = itertools.count(1_000_000)
+    monkeypatch.setattr(fingerprint_cache.time, "time_ns", lambda: next(clock))
+
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.epf"
+        path.write_bytes(name.encode())
+        paths.append(path)
+
+    # No LRU, so every lookup goes to SQLite and refreshes last_used
+    with FingerprintCache(db_path, lru_size=0) as cache:
+        for path in paths:
+            cache.fingerprint(path, KIND_PDO_PAYLOAD, Compute())
+        cache.lookup(paths[0], KIND_PDO_PAYLOAD)
+
+        assert cache.prune(2) == 1
+        assert cache.lookup(paths[0], KIND_PDO_PAYLOAD) is not None
+        assert cache.lookup(paths[1], KIND_PDO_PAYLOAD) is None
+        assert cache.lookup(paths[2], KIND_PDO_PAYLOAD) is not None
@@ -0,0 +1,156 @@
+"""
+File: /tests/test_legacy_payload.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: PDOs written before the segmented payload format still decrypt through the access path
+"""
+
+import io
+import os
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from redaqt.modules.lib.aes256gcm_segmented import (PAYLOAD_FORMAT_SEGMENTED, encrypt_file_aes256gcm_segmented,
+                                                    payload_attachment_name)
+from redaqt.modules.lib.b64_encoder_decoder import encode_dict_to_base64
+from redaqt.modules.lib.compression import COMPRESSION_ZLIB
+from redaqt.modules.certs.encoder_image import encoder_image
+from redaqt.modules.lib.encrypt_aes256gcm import encrypt_file_aes256gcm
+from redaqt.modules.pdo.access_pdo import decrypt_attachments, prepare_access
+from redaqt.modules.pdo.pdo_builder import PDOBuilder
+from redaqt.modules.pdo.protected_document import open_protected_document
+
+KEY = "K" * 44
+CERTIFICATE = {"child_certificate_id": "c1", "certificate_type": "Gold", "issuer": {"name": "tester"}}
+
+
+def _build_pdo(tmp_path: Path, data: bytes, metadata: dict, encrypt) -> Path:
+    """ Encrypt data with encrypt(source) and embed it into tmp_path/doc.txt.epf; the source is removed """
+    source = tmp_path / "doc.txt"
+    source.write_bytes(data)
+    success, encrypted_path, error_msg = encrypt(source)
+    assert success, error_msg
+
+    builder = PDOBuilder("Protected by RedaQt")
+    builder.set_metadata({"/Product": "RedaQt", "/DaVinci_Certificate": encode_dict_to_base64(CERTIFICATE),
+                          **metadata})
+    builder.set_attachment(encrypted_path, payload_attachment_name(source))
+    pdo_path = tmp_path / "doc.txt.epf"
+    assert builder.build(str(pdo_path)) == (True, None)
+
+    os.remove(encrypted_path)
+    source.unlink()
+    return pdo_path
+
+
+def _build_baseline_pdo(tmp_path: Path, data: bytes, carrier_path: Path) -> Path:
+    """ Write tmp_path/doc.txt.epf the way PDOs were written before PDOBuilder: a reportlab page, the /Info
+        metadata, the DaVinci certificate drawn over the page and the ciphertext added with add_attachment """
+    source = tmp_path / "doc.txt"
+    source.write_bytes(data)
+    success, encrypted_path, error_msg = encrypt_file_aes256gcm(os.urandom(12), KEY, source)
+    assert success, error_msg
+    pdo_path = tmp_path / "doc.txt.epf"
+
+    page = canvas.Canvas(str(pdo_path), pagesize=letter)
+    page.setFont("Helvetica", 12)
+    page.drawString(200, letter[1] / 2, "Protected by RedaQt 2.0.0")
+    page.save()
+
+    writer = PdfWriter()
+    for reader_page in PdfReader(str(pdo_path)).pages:
+        writer.add_page(reader_page)
+    writer.add_metadata({"/Producer": "pypdf", "/Product": "RedaQt", "/Product_Version": "2.0.0",
+                         "/DaVinci_Certificate": "", "/Encrypted_filename": "not_used"})
+    with open(pdo_path, "wb") as fout:
+        writer.write(fout)
+
+    success, image = encoder_image(encode_dict_to_base64(CERTIFICATE), str(carrier_path))
+    assert success
+    image_buffer = io.BytesIO()
+    Image.fromarray(image).save(image_buffer, format="PNG")
+    image_buffer.seek(0)
+    overlay = io.BytesIO()
+    overlay_page = canvas.Canvas(overlay, pagesize=letter)
+    overlay_page.drawImage(ImageReader(image_buffer), x=(letter[0] - 200) / 2, y=letter[1] / 2 - 230,
+                           width=200, height=200)
+    overlay_page.save()
+    overlay.seek(0)
+
+    original = PdfReader(str(pdo_path))
+    writer = PdfWriter()
+    writer.add_page(original.pages[0]).merge_page(PdfReader(overlay).pages[0])
+    writer.add_metadata(original.metadata)
+    with open(encrypted_path, "rb") as fin:
+        writer.add_attachment(Path(encrypted_path).name, fin.read())
+    with open(pdo_path, "wb") as fout:
+        writer.write(fout)
+
+    os.remove(encrypted_path)
+    source.unlink()
+    return pdo_path
+
+
+def _access(pdo_path: Path, key_str: str = KEY):
+    success, error_msg, document = open_protected_document(str(pdo_path))
+    assert success, error_msg
+    with document:
+        success, error_msg, context = prepare_access(document)
+        assert success, error_msg
+        assert context.davinci_certificate == CERTIFICATE
+        return decrypt_attachments(document, context, key_str)
+
+
+@pytest.mark.parametrize("size", [0, 1, 100_001])
+def test_legacy_pdo_decrypts(tmp_path, size):
+    data = os.urandom(size)
+    # Format 1: [12-byte IV][ciphertext][16-byte tag], no /Payload_Format in the metadata
+    pdo_path = _build_pdo(tmp_path, data, {},
+                          lambda source: encrypt_file_aes256gcm(os.urandom(12), KEY, source, chunk_size=4096))
+
+    success, error_msg, output_path = _access(pdo_path)
+    assert success, error_msg
+    assert output_path == tmp_path / "doc.txt"
+    assert output_path.read_bytes() == data
+
+
+def test_baseline_written_pdo_decrypts(tmp_path, carrier_path):
+    data = os.urandom(300_000)
+    pdo_path = _build_baseline_pdo(tmp_path, data, carrier_path)
+
+    success, error_msg, output_path = _access(pdo_path)
+    assert success, error_msg
+    assert output_path.read_bytes() == data
+
+
+def test_legacy_pdo_with_wrong_key_fails(tmp_path):
+    pdo_path = _build_pdo(tmp_path, b"legacy payload", {},
+                          lambda source: encrypt_file_aes256gcm(os.urandom(12), KEY, source))
+
+    success, error_msg, output_path = _access(pdo_path, "L" * 44)
+    assert not success and output_path is None
+    assert "authentication tag mismatch" in error_msg
+    assert not (tmp_path / "doc.txt").exists()
+
+
+def test_segmented_pdo_decrypts(tmp_path):
+    data = b"".join(b"line %d\n" % i for i in range(20_000))
+    metadata = {"/Payload_Format": PAYLOAD_FORMAT_SEGMENTED, "/Compression": COMPRESSION_ZLIB}
+    pdo_path = _build_pdo(tmp_path, data, metadata,
+                          lambda source: encrypt_file_aes256gcm_segmented(KEY, source, segment_size=4096,
+                                                                          compression=COMPRESSION_ZLIB))
+
+    success, error_msg, output_path = _access(pdo_path)
+    assert success, error_msg
+    assert output_path.read_bytes() == data
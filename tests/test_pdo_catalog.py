@@ -0,0 +1,147 @@
+"""
+File: /tests/test_pdo_catalog.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Catalog rescans read the metadata of new and changed files only
+"""
+
+import os
+
+import pytest
+
+from redaqt.modules.catalog import pdo_catalog
+from redaqt.modules.catalog.pdo_catalog import PDOCatalog
+
+
+class MetadataReader:
+    """ Stands in for read_pdo_metadata and records which files were read """
+
+    def __init__(self):
+        self.read = []
+
+    def __call__(self, file_path):
+        self.read.append(file_path)
+        return True, None, {"mid": "m1", "fid": os.path.basename(file_path), "product_version": "2.1.0"}
+
+
+@pytest.fixture
+def reader(monkeypatch):
+    reader = MetadataReader()
+    monkeypatch.setattr(pdo_catalog, "read_pdo_metadata", reader)
+    return reader
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    with PDOCatalog(tmp_path / "catalog.db") as catalog:
+        yield catalog
+
+
+def _write(path, data=b"pdo"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+def _touch(path, mtime_ns):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_unchanged_file_is_not_read_again(tmp_path, catalog, reader):
+    path = _write(tmp_path / "docs" / "a.txt.epf")
+    _write(tmp_path / "docs" / "notes.txt")
+    catalog.add_root(str(tmp_path / "docs"))
+
+    result = catalog.scan()
+    assert (result.scanned, result.added) == (1, 1)
+    assert reader.read == [path]
+
+    result = catalog.scan()
+    assert (result.scanned, result.added, result.unchanged) == (1, 0, 1)
+    assert reader.read == [path]
+    assert catalog.recent()[0]["filename"] == "a"
+
+
+def test_changed_file_is_read_again(tmp_path, catalog, reader):
+    path = _write(tmp_path / "docs" / "a.txt.epf")
+    catalog.add_root(str(tmp_path / "docs"))
+    catalog.scan()
+
+    _touch(path, os.stat(path).st_mtime_ns + 1_000_000_000)
+    assert catalog.scan().updated == 1
+
+    _write(tmp_path / "docs" / "a.txt.epf", b"longer pdo")
+    assert catalog.scan().updated == 1
+    assert reader.read == [path] * 3
+
+
+def test_deleted_files_and_roots_are_swept(tmp_path, catalog, reader):
+    kept = _write(tmp_path / "docs" / "a.txt.epf")
+    deleted = _write(tmp_path / "docs" / "b.txt.epf")
+    other = _write(tmp_path / "other" / "c.txt.epf")
+    catalog.add_root(str(tmp_path / "docs"))
+    catalog.add_root(str(tmp_path / "other"))
+    assert catalog.scan().added == 3
+
+    os.remove(deleted)
+    assert catalog.scan().removed == 1
+    assert {entry["key"] for entry in catalog.recent()} == {kept, other}
+
+    catalog.remove_root(str(tmp_path / "other"))
+    assert [entry["key"] for entry in catalog.recent()] == [kept]
+
+
+def test_recorded_file_outside_the_roots_is_swept(tmp_path, catalog, reader):
+    path = _write(tmp_path / "elsewhere" / "a.txt.epf")
+    assert catalog.record_document(path, "2026-10-17 10:00")
+    assert catalog.count() == 1
+
+    os.remove(path)
+    assert catalog.scan().removed == 1
+    assert catalog.count() == 0
+
+
+def test_nested_roots_read_each_file_once(tmp_path, catalog, reader):
+    outer = _write(tmp_path / "docs" / "a.txt.epf")
+    inner = _write(tmp_path / "docs" / "project" / "b.txt.epf")
+    catalog.add_root(str(tmp_path / "docs" / "project"))
+    catalog.add_root(str(tmp_path / "docs"))
+
+    result = catalog.scan()
+    assert (result.scanned, result.added) == (2, 2)
+    assert sorted(reader.read) == sorted([outer, inner])
+
+    for _ in range(2):
+        result = catalog.scan()
+        assert (result.scanned, result.unchanged, result.removed) == (2, 2, 0)
+    assert len(reader.read) == 2
+    assert catalog.count() == 2
+
+
+def test_inner_root_scanned_before_outer_root_is_added(tmp_path, catalog, reader):
+    inner = _write(tmp_path / "docs" / "project" / "b.txt.epf")
+    catalog.add_root(str(tmp_path / "docs" / "project"))
+    catalog.scan()
+
+    catalog.add_root(str(tmp_path / "docs"))
+    result = catalog.scan()
+    assert (result.unchanged, result.removed) == (1, 0)
+    assert reader.read == [inner]
+
+    catalog.remove_root(str(tmp_path / "docs" / "project"))
+    assert catalog.scan().unchanged == 1
+    assert reader.read == [inner]
+
+
+def test_unreadable_pdo_counts_as_failed(tmp_path, catalog, monkeypatch):
+    monkeypatch.setattr(pdo_catalog, "read_pdo_metadata", lambda file_path: (False, "not a PDO", {}))
+    _write(tmp_path / "docs" / "a.txt.epf")
+    catalog.add_root(str(tmp_path / "docs"))
+    result = catalog.scan()
+    assert (result.scanned, result.failed) == (1, 1)
+    assert catalog.count() == 0
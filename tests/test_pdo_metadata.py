@@ -0,0 +1,107 @@
+"""
+File: /tests/test_pdo_metadata.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: The trailer-scanning metadata reader agrees with the full PdfReader
+"""
+
+import re
+
+import pytest
+from pypdf import PdfWriter
+
+from redaqt.modules.pdo import pdo_metadata
+from redaqt.modules.pdo.pdo_builder import PDOBuilder
+from redaqt.modules.pdo.pdo_metadata import ERROR_PROTECTED_DOCUMENT, read_pdo_metadata
+from redaqt.modules.pdo.protected_document import open_protected_document
+
+METADATA = {
+    "/Product": "RedaQt",
+    "/Product_Version": "2.1.0",
+    "/MID": "m1",
+    "/FID": "f1",
+    "/Author": "O'Brien (Legal) \\ Müller",
+    "/Date_Protected": "2026-10-17 10:00",
+}
+
+
+@pytest.fixture
+def no_fallback(monkeypatch):
+    """ Fail the test if the metadata is only read by falling back to the full reader """
+    def fallback(file_path):
+        raise AssertionError(f"{file_path} needed the full reader")
+    monkeypatch.setattr(pdo_metadata, "_read_pdo_metadata_full", fallback)
+
+
+def _full_reader_metadata(pdo_path) -> dict:
+    success, error_msg, document = open_protected_document(str(pdo_path))
+    assert success, error_msg
+    with document:
+        success, error_msg, metadata = document.get_metadata()
+    assert success, error_msg
+    return metadata
+
+
+def _build_pdo(tmp_path):
+    payload = tmp_path / "payload.bin"
+    payload.write_bytes(b"\x00" * 1000)
+    builder = PDOBuilder("Protected by RedaQt")
+    builder.set_metadata(METADATA)
+    builder.set_attachment(str(payload))
+    pdo_path = tmp_path / "doc.txt.epf"
+    assert builder.build(str(pdo_path)) == (True, None)
+    return pdo_path
+
+
+def test_matches_full_reader(tmp_path, no_fallback):
+    pdo_path = _build_pdo(tmp_path)
+    success, error_msg, metadata = read_pdo_metadata(str(pdo_path))
+    assert success, error_msg
+    assert metadata == _full_reader_metadata(pdo_path)
+    assert metadata["author"] == METADATA["/Author"]
+
+
+def test_incremental_update(tmp_path, no_fallback):
+    # An appended revision with its own xref table, chained to the original one with /Prev
+    pdo_path = _build_pdo(tmp_path)
+    original = pdo_path.read_bytes()
+    previous_xref = int(re.findall(rb"startxref\s+(\d+)", original)[-1])
+    root = re.search(rb"/Root\s+(\d+ \d+ R)", original).group(1)
+    size = int(re.search(rb"/Size\s+(\d+)", original).group(1))
+
+    info_offset = len(original)
+    revision = b"%d 0 obj\n<< /Producer (pypdf) /MID (m2) >>\nendobj\n" % size
+    xref_offset = info_offset + len(revision)
+    revision += (b"xref\n0 1\n0000000000 65535 f \n%d 1\n%010d 00000 n \n" % (size, info_offset) +
+                 b"trailer\n<< /Size %d /Root %s /Info %d 0 R /Prev %d >>\n" % (size + 1, root, size, previous_xref) +
+                 b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+    pdo_path.write_bytes(original + revision)
+
+    success, error_msg, metadata = read_pdo_metadata(str(pdo_path))
+    assert success, error_msg
+    assert metadata == {"producer": "pypdf", "mid": "m2"}
+    assert metadata == _full_reader_metadata(pdo_path)
+
+
+def test_cross_reference_stream_falls_back(tmp_path):
+    # pypdf writes incremental updates with a cross-reference stream, left to the full reader
+    writer = PdfWriter(str(_build_pdo(tmp_path)), incremental=True)
+    writer.add_metadata({"/MID": "m2"})
+    pdo_path = tmp_path / "updated.txt.epf"
+    writer.write(str(pdo_path))
+
+    success, error_msg, metadata = read_pdo_metadata(str(pdo_path))
+    assert success, error_msg
+    assert metadata["mid"] == "m2"
+    assert metadata == _full_reader_metadata(pdo_path)
+
+
+def test_not_a_pdo(tmp_path):
+    path = tmp_path / "doc.txt.epf"
+    path.write_bytes(b"not a pdf at all")
+    assert read_pdo_metadata(str(path)) == (False, ERROR_PROTECTED_DOCUMENT, None)
@@ -0,0 +1,160 @@
+"""
+File: /tests/test_verify_pdo.py
+Author: Jonathan Carr
+Arcane Cyber, LLC
+https://arcanecyber.net
+contact@arcanecyber.net
+Copyright 2025 - All rights reserved
+
+Date: October 2026
+Description: Offline PDO verification: a fresh PDO passes, each kind of damage fails its own check
+"""
+
+import json
+import re
+
+import pytest
+
+from redaqt.modules.pdo.pdo_builder import PDOBuilder
+from redaqt.modules.pdo.protected_document import open_protected_document
+from redaqt.modules.pdo.verify_pdo import (CHECK_ATTACHMENT, CHECK_CERTIFICATE_FINGERPRINT, CHECK_METADATA,
+                                           CHECK_PAYLOAD, CHECK_PDO_FINGERPRINT, CHECK_STRUCTURE, REPORT_SCOPE,
+                                           STATUS_FAILED, STATUS_OK, verify_archive, verify_pdo)
+
+
+@pytest.fixture
+def pdo_path(tmp_path, protect):
+    source = tmp_path / "report.txt"
+    source.write_bytes(b"".join(b"2026-10-17 line %d status=ok\n" % i for i in range(5000)))
+    return protect(source)
+
+
+def _attachment(pdo_path):
+    success, error_msg, document = open_protected_document(pdo_path)
+    assert success, error_msg
+    with document:
+        success, error_msg, attachments = document.get_attachments()
+    assert success, error_msg
+    return attachments[0]
+
+
+def _rebuild(pdo_path, output_path, metadata_changes=None, certificate_transform=None) -> str:
+    """ Write the PDO again with changed /Info entries or a changed certificate image, same payload """
+    payload_path = f"{output_path}.payload"
+    success, error_msg, document = open_protected_document(pdo_path)
+    assert success, error_msg
+    with document:
+        metadata = {"/" + key: value for key, value in document.get_metadata()[2].items()}
+        success, image = document.get_certificate_image()
+        assert success
+        attachment = document.get_attachments()[2][0]
+        assert document.extract_attachment(attachment, payload_path) == (True, None)
+
+    builder = PDOBuilder("Protected by RedaQt 2.1.0")
+    builder.set_metadata({**metadata, **(metadata_changes or {})})
+    builder.set_certificate_image(certificate_transform(image) if certificate_transform else image)
+    builder.set_attachment(payload_path, attachment.name)
+    assert builder.build(str(output_path)) == (True, None)
+    return str(output_path)
+
+
+def _failed_checks(result) -> set:
+    return {check for check, status in result.checks.items() if status == STATUS_FAILED}
+
+
+def test_fresh_pdo_passes(pdo_path):
+    result = verify_pdo(pdo_path)
+    assert result.ok, result.errors
+    assert set(result.checks.values()) == {STATUS_OK}
+    assert result.payload_bytes == _attachment(pdo_path).length
+
+
+def test_truncated_file_fails_structure(pdo_path, tmp_path):
+    data = open(pdo_path, "rb").read()
+    truncated = tmp_path / "truncated.txt.epf"
+    truncated.write_bytes(data[:data.rindex(b"%%EOF")])
+    assert CHECK_STRUCTURE in _failed_checks(verify_pdo(str(truncated)))
+
+
+def test_wrong_stream_length_fails_attachment(pdo_path, tmp_path):
+    data = open(pdo_path, "rb").read()
+    attachment = _attachment(pdo_path)
+    # The /Length of the embedded file is an indirect object written after the stream; keep its width
+    length = str(attachment.length).encode()
+    wrong = str(attachment.length - 1).rjust(len(length), "0").encode()
+    start = data.index(b"endstream", attachment.offset + attachment.length)
+    match = re.compile(rb"obj\s*" + length + rb"\s*endobj").search(data, start)
+    changed = tmp_path / "length.txt.epf"
+    changed.write_bytes(data[:match.start()] + match.group(0).replace(length, wrong) + data[match.end():])
+
+    assert _failed_checks(verify_pdo(str(changed))) == {CHECK_ATTACHMENT}
+
+
+def test_flipped_payload_byte_fails_pdo_fingerprint(pdo_path, tmp_path):
+    data = bytearray(open(pdo_path, "rb").read())
+    data[_attachment(pdo_path).offset + 100] ^= 0x01
+    changed = tmp_path / "flipped.txt.epf"
+    changed.write_bytes(data)
+
+    result = verify_pdo(str(changed))
+    assert _failed_checks(result) == {CHECK_PDO_FINGERPRINT}
+    assert verify_pdo(str(changed), check_fingerprints=False).ok
+
+
+def test_changed_certificate_pixel_fails_certificate_fingerprint(pdo_path, tmp_path):
+    def change_pixel(image):
+        image = image.copy()
+        image[-1, -1, 0] ^= 0x01
+        return image
+
+    changed = _rebuild(pdo_path, tmp_path / "pixel.txt.epf", certificate_transform=change_pixel)
+    assert _failed_checks(verify_pdo(changed)) == {CHECK_CERTIFICATE_FINGERPRINT}
+
+
+def test_unknown_payload_format_fails_metadata(pdo_path, tmp_path):
+    changed = _rebuild(pdo_path, tmp_path / "format.txt.epf", {"/Payload_Format": "9"})
+    result = verify_pdo(changed)
+    assert CHECK_METADATA in _failed_checks(result)
+    assert "unknown payload format 9" in "; ".join(result.errors)
+
+
+def test_rebuilt_pdo_passes(pdo_path, tmp_path):
+    # The rebuild itself keeps every check passing, so the failures above come from the change
+    assert verify_pdo(_rebuild(pdo_path, tmp_path / "same.txt.epf")).ok
+
+
+def test_uncompressed_layout_with_compression_fails_payload(tmp_path, protect):
+    source = tmp_path / "plain.txt"
+    source.write_bytes(b"plain text " * 1000)
+    pdo_path = protect(source, compression="none")
+    changed = _rebuild(pdo_path, tmp_path / "compression.txt.epf", {"/Compression": "zlib"})
+    assert _failed_checks(verify_pdo(changed)) == {CHECK_PAYLOAD}
+
+
+def test_archive_report_is_json(pdo_path, tmp_path):
+    archive = tmp_path / "archive"
+    (archive / "nested").mkdir(parents=True)
+    data = open(pdo_path, "rb").read()
+    (archive / "good.txt.epf").write_bytes(data)
+    (archive / "nested" / "bad.txt.epf").write_bytes(data[:len(data) // 2])
+    report_path = tmp_path / "report.json"
+
+    results = []
+    summary = verify_archive(str(archive), str(report_path), max_workers=2, on_result=results.append)
+    assert (summary.total, summary.passed, summary.failed) == (2, 1, 1)
+    assert len(results) == 2
+
+    with open(report_path, encoding="utf-8") as fin:
+        report = json.load(fin)
+    assert report["scope"] == REPORT_SCOPE
+    assert [document["ok"] for document in report["documents"]] == [True, False]
+    assert report["documents"][0]["file_path"].endswith("good.txt.epf")
+    assert report["summary"]["failed"] == 1
+
+
+def test_empty_archive_report_is_json(tmp_path):
+    report_path = tmp_path / "report.json"
+    summary = verify_archive(str(tmp_path), str(report_path))
+    assert summary.total == 0
+    with open(report_path, encoding="utf-8") as fin:
+        assert json.load(fin)["documents"] == []